@@ -0,0 +1,453 @@
+"""
+Corpus Index for Wheel of Fortune
+Keeps the puzzle corpus in memory, bucketed by word-length shape, so pattern
+lookups only touch puzzles that could possibly fit the board.
+
+Within each shape bucket a positional bitset is kept for every
+(position, letter) pair: bit ``i`` is set when the ``i``-th phrase of the
+bucket has that letter at that position. Filtering a showing pattern is then a
+handful of bitwise ANDs instead of a regex pass over every phrase.
+``DictionaryIndex`` applies the same postings to single dictionary words.
+"""
+
+import heapq
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    from corpus_snapshot import load_snapshot
+except Exception:
+    from src.PlayGame.corpus_snapshot import load_snapshot
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Corpus files, in the order they are scanned. The first occurrence of a
+# normalized puzzle wins so duplicates across files don't dilute scores.
+PUZZLE_FILES = ["valid.csv", "train.csv", "test.csv", "years_1_25.csv"]
+
+# Below this many matches a plain Python scoring pass beats building arrays
+_VECTOR_MIN_MATCHES = 256
+
+_CORPUS_INDEX: Optional['CorpusIndex'] = None
+
+
+def word_shape(text: str) -> Tuple[int, ...]:
+    """Return the tuple of word lengths, e.g. 'THE QUICK FOX' -> (3, 5, 3)."""
+    return tuple(len(word) for word in text.split(' '))
+
+
+def _bits_to_mask(bits: List[int], size: int) -> int:
+    """Pack ascending bit positions into an int without quadratic shifting."""
+    if size <= 256:
+        mask = 0
+        for bit in bits:
+            mask |= 1 << bit
+        return mask
+    packed = bytearray((size + 7) // 8)
+    for bit in bits:
+        packed[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(bytes(packed), 'little')
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of set bits in ascending order."""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        if not byte:
+            continue
+        base = byte_index << 3
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield base + bit
+
+
+class _ShapeBucket:
+    """Positional bitsets for every phrase sharing one word-length shape."""
+
+    def __init__(self, ids: List[int], phrases: List[str]):
+        self.ids = ids
+        size = len(ids)
+        self.all = (1 << size) - 1
+        length = len(phrases[0])
+        positions: List[Dict[str, List[int]]] = [{} for _ in range(length)]
+        for local, phrase in enumerate(phrases):
+            for column, ch in zip(positions, phrase):
+                bits = column.get(ch)
+                if bits is None:
+                    column[ch] = [local]
+                else:
+                    bits.append(local)
+        # columns[pos][ch] -> phrases with ``ch`` at ``pos``
+        self.columns: List[Dict[str, int]] = [
+            {ch: _bits_to_mask(bits, size) for ch, bits in column.items()}
+            for column in positions
+        ]
+        # letters[pos] -> phrases with any A-Z letter at ``pos`` (what a blank can hide)
+        self.letters: List[int] = []
+        for column in self.columns:
+            mask = 0
+            for ch, bits in column.items():
+                if 'A' <= ch <= 'Z':
+                    mask |= bits
+            self.letters.append(mask)
+
+
+def _exclude_letter(bucket: _ShapeBucket, mask: int, letter: str, blanks: List[int]) -> int:
+    """Clear phrases that have ``letter`` at any of the ``blanks`` positions."""
+    for pos in blanks:
+        hit = bucket.columns[pos].get(letter)
+        if hit:
+            mask &= ~hit
+    return mask
+
+
+class PatternIndex:
+    """
+    Shape-bucketed positional bitset index over a list of phrases.
+
+    Patterns use underscores for blanks, which match any A-Z letter, and
+    single spaces between words. ``query`` returns indices into ``phrases``
+    in their original order.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = list(phrases)
+        grouped: Dict[Tuple[int, ...], List[int]] = {}
+        for i, phrase in enumerate(self.phrases):
+            grouped.setdefault(word_shape(phrase), []).append(i)
+        self._buckets: Dict[Tuple[int, ...], _ShapeBucket] = {
+            shape: _ShapeBucket(ids, [self.phrases[i] for i in ids])
+            for shape, ids in grouped.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def shape_ids(self, shape: Tuple[int, ...]) -> List[int]:
+        """Return the indices of every phrase with the given shape."""
+        bucket = self._buckets.get(shape)
+        return list(bucket.ids) if bucket else []
+
+    def _match_mask(self, pattern: str, guessed: Iterable[str] = ()) -> Tuple[Optional[_ShapeBucket], int]:
+        """Return the shape bucket for ``pattern`` and the bitset of its matches."""
+        bucket = self._buckets.get(word_shape(pattern))
+        if bucket is None:
+            return None, 0
+
+        mask = bucket.all
+        blanks = []
+        for pos, ch in enumerate(pattern):
+            if ch == '_':
+                mask &= bucket.letters[pos]
+                blanks.append(pos)
+            elif ch != ' ':
+                mask &= bucket.columns[pos].get(ch, 0)
+            if not mask:
+                return bucket, 0
+
+        for letter in set(guessed):
+            mask = _exclude_letter(bucket, mask, letter, blanks)
+            if not mask:
+                break
+        return bucket, mask
+
+    def query(self, pattern: str, guessed: Iterable[str] = ()) -> List[int]:
+        """Return indices of phrases matching ``pattern``.
+
+        Letters in ``guessed`` cannot be hiding under a blank: either they were
+        revealed (so every occurrence is already showing) or they missed.
+        """
+        bucket, mask = self._match_mask(pattern, guessed)
+        if not mask:
+            return []
+        return [bucket.ids[local] for local in _iter_bits(mask)]
+
+    def match(self, pattern: str, guessed: Iterable[str] = ()) -> List[str]:
+        """Return the phrases matching ``pattern``."""
+        return [self.phrases[i] for i in self.query(pattern, guessed)]
+
+
+class DictionaryIndex:
+    """
+    Dictionary words bucketed by length, with per-position letter postings.
+
+    Buckets are built lazily the first time a pattern of that length is
+    queried, so a full system word list costs nothing until it is used.
+    Blanks match any A-Z letter; every other character must match exactly.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words: List[str] = list(words)
+        self._by_length: Dict[int, List[int]] = {}
+        for i, word in enumerate(self.words):
+            self._by_length.setdefault(len(word), []).append(i)
+        self._buckets: Dict[int, _ShapeBucket] = {}
+        self._code_matrices: Dict[int, 'np.ndarray'] = {}
+        self._unencodable_masks: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _bucket(self, length: int) -> Optional[_ShapeBucket]:
+        bucket = self._buckets.get(length)
+        if bucket is None:
+            ids = self._by_length.get(length)
+            if not ids:
+                return None
+            bucket = _ShapeBucket(ids, [self.words[i] for i in ids])
+            self._buckets[length] = bucket
+        return bucket
+
+    def prebuild(self):
+        """Build every length bucket now rather than on its first query."""
+        for length in self._by_length:
+            self._bucket(length)
+
+    def _match_mask(self, pattern: str) -> Tuple[Optional[_ShapeBucket], int]:
+        bucket = self._bucket(len(pattern))
+        if bucket is None:
+            return None, 0
+        mask = bucket.all
+        for pos, ch in enumerate(pattern):
+            if ch == '_':
+                mask &= bucket.letters[pos]
+            else:
+                mask &= bucket.columns[pos].get(ch, 0)
+            if not mask:
+                return bucket, 0
+        return bucket, mask
+
+    def match(self, pattern: str, guessed: Iterable[str] = ()) -> List[str]:
+        """Return the words matching ``pattern`` in their original order.
+
+        As with ``PatternIndex.query``, letters in ``guessed`` cannot be hiding
+        under a blank.
+        """
+        bucket, mask = self._match_mask(pattern)
+        if mask and guessed:
+            blanks = [pos for pos, ch in enumerate(pattern) if ch == '_']
+            for letter in set(guessed):
+                mask = _exclude_letter(bucket, mask, letter, blanks)
+                if not mask:
+                    break
+        if not mask:
+            return []
+        return [self.words[bucket.ids[local]] for local in _iter_bits(mask)]
+
+    def _codes(self, length: int, bucket: _ShapeBucket):
+        """Return the bucket's words as an ``(n, length)`` uint8 matrix, built once."""
+        codes = self._code_matrices.get(length)
+        if codes is None:
+            text = ''.join(self.words[i] for i in bucket.ids)
+            codes = np.frombuffer(text.encode('latin-1', 'replace'), dtype=np.uint8)
+            codes = codes.reshape(len(bucket.ids), length)
+            self._code_matrices[length] = codes
+        return codes
+
+    def _unencodable(self, length: int, bucket: _ShapeBucket) -> int:
+        """Return the bucket's words with characters outside Latin-1, as a bitset."""
+        if length not in self._unencodable_masks:
+            bits = [local for local, i in enumerate(bucket.ids) if not self.words[i].isascii()
+                    and max(self.words[i]) > '\xff']
+            self._unencodable_masks[length] = _bits_to_mask(bits, len(bucket.ids))
+        return self._unencodable_masks[length]
+
+    def top_k(
+        self,
+        pattern: str,
+        weights: Mapping[str, float],
+        k: int = 1,
+        bonus: Callable[[str], float] = None,
+        bonus_when: Iterable[str] = (),
+    ) -> List[str]:
+        """Return the ``k`` best-scoring words matching ``pattern``.
+
+        A word scores the sum of ``weights[ch]`` over its characters, plus
+        ``bonus(word)``, which must be zero unless the word contains one of the
+        ``bonus_when`` substrings. Ties go to the word that comes first in the
+        dictionary, the same as ``max`` over the matches would pick.
+
+        With NumPy available, large match sets are scored as one vectorized
+        lookup and only the near-best words are rescored exactly.
+        """
+        bucket, mask = self._match_mask(pattern)
+        if not mask or k <= 0:
+            return []
+        words = self.words
+        ids = bucket.ids
+        bonus_when = tuple(bonus_when)
+
+        def score(word: str) -> float:
+            total = sum(weights[c] for c in word)
+            if bonus and any(sub in word for sub in bonus_when):
+                total += bonus(word)
+            return total
+
+        if not NUMPY_AVAILABLE or bin(mask).count('1') <= _VECTOR_MIN_MATCHES:
+            best = heapq.nlargest(k, _iter_bits(mask), key=lambda local: score(words[ids[local]]))
+            return [words[ids[local]] for local in best]
+
+        size = len(ids)
+        packed = np.frombuffer(mask.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+        rows = np.flatnonzero(np.unpackbits(packed, bitorder='little')[:size])
+        lut = np.array([weights[chr(code)] for code in range(256)])
+        approx = lut[self._codes(len(pattern), bucket)[rows]].sum(axis=1)
+
+        # Words the lookup table can't price: bonus substrings and characters
+        # outside Latin-1 (encoded as '?'). Score those exactly.
+        special = mask & self._unencodable(len(pattern), bucket)
+        columns = bucket.columns
+        for sub in bonus_when:
+            for start in range(len(pattern) - len(sub) + 1):
+                hit = mask
+                for offset, ch in enumerate(sub):
+                    hit &= columns[start + offset].get(ch, 0)
+                    if not hit:
+                        break
+                special |= hit
+        if special:
+            exact = list(_iter_bits(special))
+            approx[np.searchsorted(rows, exact)] = [score(words[ids[local]]) for local in exact]
+
+        if len(approx) > k:
+            cutoff = np.partition(approx, len(approx) - k)[len(approx) - k]
+            near = rows[approx >= cutoff - 1e-6].tolist()
+        else:
+            near = rows.tolist()
+        best = heapq.nlargest(k, near, key=lambda local: score(words[ids[local]]))
+        return [words[ids[local]] for local in best]
+
+
+class CorpusIndex:
+    """
+    In-memory puzzle corpus backed by a ``PatternIndex``.
+
+    Lookups return the same ``(puzzle, puzzle_norm)`` tuples that a full scan
+    of the CSV files would produce, in file order.
+    """
+
+    def __init__(self, data_dir: Path = None, puzzle_files: List[str] = None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).resolve().parents[2] / "data" / "puzzles"
+        self.puzzle_files = puzzle_files or PUZZLE_FILES
+        self.entries: List[Tuple[str, str]] = []
+        self._load()
+        self.index = PatternIndex(puzzle_norm for _, puzzle_norm in self.entries)
+
+    def _load(self):
+        snapshot = load_snapshot(self.data_dir)
+        seen_norm = set()
+        for fname in self.puzzle_files:
+            rows = snapshot.source_rows(self.data_dir / fname)
+            if rows is None:
+                continue
+            for i in rows:
+                puzzle = snapshot.puzzle(i).strip().upper()
+                puzzle_norm = snapshot.puzzle_norm(i)
+                if puzzle_norm in seen_norm:
+                    continue
+                seen_norm.add(puzzle_norm)
+                self.entries.append((puzzle, puzzle_norm))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def shape_bucket(self, shape: Tuple[int, ...]) -> List[Tuple[str, str]]:
+        """Return every corpus entry with the given word-length shape."""
+        return [self.entries[i] for i in self.index.shape_ids(shape)]
+
+    def lookup(self, norm_showing: str, guessed: Iterable[str] = ()) -> List[Tuple[str, str]]:
+        """Return corpus entries matching a normalized showing pattern.
+
+        ``norm_showing`` uses underscores for blanks and single spaces between
+        words. Passing the letters already ``guessed`` also drops puzzles that
+        would have one of them under a blank.
+        """
+        return [self.entries[i] for i in self.index.query(norm_showing, guessed)]
+
+
+class CandidateSet:
+    """
+    Game-scoped set of corpus puzzles that still fit the board.
+
+    Created once when a puzzle starts and narrowed in place as letters are
+    revealed or miss, so each turn only touches the puzzles that survived the
+    previous one instead of re-deriving the matches from the whole corpus.
+    """
+
+    def __init__(self, showing: str, guessed: Iterable[str] = (), corpus: CorpusIndex = None):
+        self.corpus = corpus or get_corpus_index()
+        self.norm_showing = _normalize_showing(showing)
+        self.guessed = set(guessed)
+        self._bucket, self._mask = self.corpus.index._match_mask(self.norm_showing, self.guessed)
+        self._entries: Optional[List[Tuple[str, str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def tracks(self, showing: str) -> bool:
+        """Return True if the set was narrowed up to this exact board."""
+        return _normalize_showing(showing) == self.norm_showing
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """Return the surviving ``(puzzle, puzzle_norm)`` tuples in corpus order."""
+        if self._entries is None:
+            if not self._mask:
+                self._entries = []
+            else:
+                ids = self._bucket.ids
+                self._entries = [self.corpus.entries[ids[local]] for local in _iter_bits(self._mask)]
+        return self._entries
+
+    def _blanks(self) -> List[int]:
+        return [pos for pos, ch in enumerate(self.norm_showing) if ch == '_']
+
+    def reveal(self, letter: str, showing: str):
+        """Keep puzzles with ``letter`` exactly where it just appeared on ``showing``."""
+        new_norm = _normalize_showing(showing)
+        if len(new_norm) != len(self.norm_showing):
+            raise ValueError("Board shape changed; start a new CandidateSet")
+        self.guessed.add(letter)
+        if self._mask:
+            columns = self._bucket.columns
+            for pos, (old, new) in enumerate(zip(self.norm_showing, new_norm)):
+                if old == '_' and new == letter:
+                    self._mask &= columns[pos].get(letter, 0)
+        self.norm_showing = new_norm
+        if self._mask:
+            self._mask = _exclude_letter(self._bucket, self._mask, letter, self._blanks())
+        self._entries = None
+
+    def miss(self, letter: str):
+        """Drop puzzles that contain ``letter`` under any remaining blank."""
+        self.guessed.add(letter)
+        if self._mask:
+            self._mask = _exclude_letter(self._bucket, self._mask, letter, self._blanks())
+        self._entries = None
+
+    def observe(self, letter: str, showing: str):
+        """Narrow after ``letter`` was called; ``showing`` is the board afterwards."""
+        if not letter or len(letter) != 1 or not letter.isalpha():
+            return
+        if letter in _normalize_showing(showing):
+            self.reveal(letter, showing)
+        else:
+            self.miss(letter)
+
+
+def _normalize_showing(showing: str) -> str:
+    """Reduce a board to letters, underscores and spaces like the corpus entries."""
+    return re.sub(r'[^A-Z_ ]', '', showing.upper())
+
+
+def get_corpus_index() -> CorpusIndex:
+    """Return the process-wide corpus index, building it on first use."""
+    global _CORPUS_INDEX
+    if _CORPUS_INDEX is None:
+        _CORPUS_INDEX = CorpusIndex()
+    return _CORPUS_INDEX
@@ -0,0 +1,336 @@
+"""
+Compiled Corpus Snapshot for Wheel of Fortune
+Compiles ``data/puzzles/*.csv`` (and ``data/bonus_puzzles.txt`` when present)
+into one versioned binary file that every consumer loads with ``mmap``, so
+multi-process simulations share the pages instead of each parsing the CSVs.
+
+Layout: an 8-byte magic, a little-endian uint32 header length, a JSON header,
+then 8-byte aligned sections:
+
+- ``letters``: rows x width uint8 matrix of normalized puzzles (A-Z and single
+  spaces, zero padded), with ``lengths`` (uint16) giving each row's length
+- ``text`` / ``text_offsets``: the raw puzzle field of every row (utf-8,
+  uint32 offsets)
+- ``dates`` / ``date_offsets``: the raw date field of every row
+- ``category_ids`` / ``round_ids``: uint16 ids into the header's tables
+- ``field_counts``: uint8 number of comma-separated fields on the line
+
+The header records each source file's size, mtime and sha256. The snapshot
+is rebuilt automatically when a source changes, and also when a source was
+only touched, so its new mtime is recorded and it isn't hashed on every load.
+
+Build it ahead of time with ``python corpus_snapshot.py``.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_NAME = "corpus.snapshot"
+BONUS_FILE = "bonus_puzzles.txt"
+_MAGIC = b"WOFSNAP\x00"
+
+_SNAPSHOTS: Dict[Path, 'CorpusSnapshot'] = {}
+
+
+def normalize_puzzle(puzzle: str) -> str:
+    """Strip punctuation and collapse whitespace so puzzles compare by letters."""
+    puzzle_norm = re.sub(r'[^A-Z ]', '', puzzle.upper())
+    return re.sub(r'\s+', ' ', puzzle_norm).strip()
+
+
+def default_puzzles_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / "data" / "puzzles"
+
+
+def _source_paths(puzzles_dir: Path) -> List[Tuple[str, Path]]:
+    """Return ``(name, path)`` for every source, names relative to ``puzzles_dir``."""
+    sources = [(p.name, p) for p in sorted(puzzles_dir.glob("*.csv"))]
+    bonus = puzzles_dir.parent / BONUS_FILE
+    if bonus.exists():
+        sources.append(("../" + BONUS_FILE, bonus))
+    return sources
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _parse_source(name: str, text: str) -> List[Tuple[str, str, str, str, int]]:
+    """Split a source into ``(puzzle, category, date, round, field_count)`` rows."""
+    rows = []
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        if name.endswith(BONUS_FILE):
+            rows.append((line.strip(), "", "", "", 1))
+            continue
+        parts = line.rstrip('\r').split(',')
+        padded = parts + [""] * (4 - len(parts))
+        rows.append((padded[0], padded[1], padded[2], padded[3], min(len(parts), 255)))
+    return rows
+
+
+def _string_column(values: List[str]) -> Tuple[bytes, bytes]:
+    offsets = array('I', [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode('utf-8')
+        offsets.append(len(blob))
+    return bytes(blob), offsets.tobytes()
+
+
+def _id_column(values: List[str], table: Dict[str, int]) -> bytes:
+    ids = array('H')
+    for value in values:
+        ids.append(table.setdefault(value, len(table)))
+    return ids.tobytes()
+
+
+def build_snapshot(puzzles_dir: Path = None, path: Path = None) -> Path:
+    """Compile the CSV sources into a snapshot file and return its path."""
+    puzzles_dir = Path(puzzles_dir) if puzzles_dir else default_puzzles_dir()
+    path = Path(path) if path else puzzles_dir / SNAPSHOT_NAME
+
+    sources = []
+    rows: List[Tuple[str, str, str, str, int]] = []
+    for name, source in _source_paths(puzzles_dir):
+        data = source.read_bytes()
+        stat = source.stat()
+        parsed = _parse_source(name, data.decode('utf-8', errors='replace'))
+        sources.append({
+            "name": name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "start": len(rows),
+            "count": len(parsed),
+        })
+        rows.extend(parsed)
+
+    norms = [normalize_puzzle(puzzle.strip().upper()).encode('ascii') for puzzle, *_ in rows]
+    width = max((len(n) for n in norms), default=0)
+    letters = b"".join(n.ljust(width, b"\x00") for n in norms)
+    lengths = array('H', (len(n) for n in norms)).tobytes()
+
+    text, text_offsets = _string_column([r[0] for r in rows])
+    dates, date_offsets = _string_column([r[2] for r in rows])
+    categories: Dict[str, int] = {}
+    rounds: Dict[str, int] = {}
+    category_ids = _id_column([r[1] for r in rows], categories)
+    round_ids = _id_column([r[3] for r in rows], rounds)
+    field_counts = bytes(r[4] for r in rows)
+
+    sections = [
+        ("letters", letters), ("lengths", lengths),
+        ("text", text), ("text_offsets", text_offsets),
+        ("dates", dates), ("date_offsets", date_offsets),
+        ("category_ids", category_ids), ("round_ids", round_ids),
+        ("field_counts", field_counts),
+    ]
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(rows),
+        "width": width,
+        "sources": sources,
+        "categories": list(categories),
+        "rounds": list(rounds),
+        "sections": {},
+    }
+    # Section offsets are relative to the end of the padded header
+    offset = 0
+    for section, payload in sections:
+        header["sections"][section] = [offset, len(payload)]
+        offset += len(payload) + (-len(payload) % 8)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b" " * (-(len(_MAGIC) + 4 + len(header_bytes)) % 8)
+
+    body = bytearray()
+    body += _MAGIC
+    body += len(header_bytes).to_bytes(4, 'little')
+    body += header_bytes
+    for _, payload in sections:
+        body += payload
+        body += b"\x00" * (-len(payload) % 8)
+
+    # Write next to the target and rename so concurrent readers never see a
+    # half-written snapshot
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return path
+
+
+class CorpusSnapshot:
+    """
+    Read-only view over a snapshot file mapped into memory.
+
+    Row accessors decode on demand; ``letters`` exposes the normalized puzzle
+    matrix without copying (a NumPy array when NumPy is installed).
+    """
+
+    def __init__(self, path: Path, puzzles_dir: Path):
+        self.path = Path(path)
+        self.puzzles_dir = Path(puzzles_dir)
+        with self.path.open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if bytes(view[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"{self.path} is not a corpus snapshot")
+        header_len = int.from_bytes(view[len(_MAGIC):len(_MAGIC) + 4], 'little')
+        base = len(_MAGIC) + 4
+        self.header = json.loads(bytes(view[base:base + header_len]).decode('utf-8'))
+        if self.header.get("version") != SNAPSHOT_VERSION or self.header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{self.path} was built by an incompatible version")
+
+        data_start = base + header_len
+        sections = {}
+        for name, (offset, size) in self.header["sections"].items():
+            sections[name] = view[data_start + offset:data_start + offset + size]
+
+        self.rows: int = self.header["rows"]
+        self.width: int = self.header["width"]
+        self.sources: List[Dict] = self.header["sources"]
+        self.categories: List[str] = self.header["categories"]
+        self.rounds: List[str] = self.header["rounds"]
+        self._by_path = {(self.puzzles_dir / s["name"]).resolve(): s for s in self.sources}
+        self._letters = sections["letters"]
+        self._lengths = sections["lengths"].cast('H')
+        self._text = sections["text"]
+        self._text_offsets = sections["text_offsets"].cast('I')
+        self._dates = sections["dates"]
+        self._date_offsets = sections["date_offsets"].cast('I')
+        self._category_ids = sections["category_ids"].cast('H')
+        self._round_ids = sections["round_ids"].cast('H')
+        self._field_counts = sections["field_counts"]
+        self._touched = False
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def letters(self):
+        """The ``rows x width`` uint8 matrix of normalized puzzles."""
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self._letters, dtype=np.uint8).reshape(self.rows, self.width)
+        return self._letters
+
+    @property
+    def lengths(self):
+        """Length of each normalized puzzle in ``letters``."""
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self._lengths, dtype=np.uint16)
+        return self._lengths
+
+    def source_rows(self, path) -> Optional[range]:
+        """Return the row range for a source file, or None if it isn't in the snapshot."""
+        source = self._by_path.get(Path(path).resolve())
+        if source is None:
+            return None
+        return range(source["start"], source["start"] + source["count"])
+
+    def puzzle(self, i: int) -> str:
+        """The raw puzzle field of row ``i``."""
+        return bytes(self._text[self._text_offsets[i]:self._text_offsets[i + 1]]).decode('utf-8')
+
+    def puzzle_norm(self, i: int) -> str:
+        """The normalized puzzle of row ``i``."""
+        start = i * self.width
+        return bytes(self._letters[start:start + self._lengths[i]]).decode('ascii')
+
+    def category(self, i: int) -> str:
+        return self.categories[self._category_ids[i]]
+
+    def date(self, i: int) -> str:
+        return bytes(self._dates[self._date_offsets[i]:self._date_offsets[i + 1]]).decode('utf-8')
+
+    def round(self, i: int) -> str:
+        return self.rounds[self._round_ids[i]]
+
+    def field_count(self, i: int) -> int:
+        return self._field_counts[i]
+
+    def record(self, i: int) -> Tuple[str, str, str, str]:
+        """Return ``(puzzle, category, date, round)`` for row ``i``."""
+        return self.puzzle(i), self.category(i), self.date(i), self.round(i)
+
+    def is_stale(self) -> bool:
+        """True if a source file was added, removed, or its contents changed."""
+        current = _source_paths(self.puzzles_dir)
+        if [name for name, _ in current] != [s["name"] for s in self.sources]:
+            return True
+        for (_, path), source in zip(current, self.sources):
+            stat = path.stat()
+            if stat.st_size == source["size"] and stat.st_mtime_ns == source["mtime_ns"]:
+                continue
+            # Touched (e.g. by a checkout) but possibly unchanged
+            if stat.st_size != source["size"] or _sha256(path) != source["sha256"]:
+                return True
+            self._touched = True
+        return False
+
+    def needs_refresh(self) -> bool:
+        """True if the snapshot is stale, or a source was touched without changing."""
+        return self.is_stale() or self._touched
+
+
+def _snapshot_path(puzzles_dir: Path) -> Path:
+    """Snapshot location: next to the CSVs, or the temp dir if that's read-only."""
+    if os.access(puzzles_dir, os.W_OK):
+        return puzzles_dir / SNAPSHOT_NAME
+    tag = hashlib.sha1(str(puzzles_dir).encode('utf-8')).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"{tag}-{SNAPSHOT_NAME}"
+
+
+def load_snapshot(puzzles_dir: Path = None) -> CorpusSnapshot:
+    """Return the snapshot for ``puzzles_dir``, rebuilding it if missing or stale."""
+    puzzles_dir = Path(puzzles_dir).resolve() if puzzles_dir else default_puzzles_dir()
+    snapshot = _SNAPSHOTS.get(puzzles_dir)
+    if snapshot is not None and not snapshot.needs_refresh():
+        return snapshot
+
+    path = _snapshot_path(puzzles_dir)
+    snapshot = None
+    if path.exists():
+        try:
+            snapshot = CorpusSnapshot(path, puzzles_dir)
+            if snapshot.needs_refresh():
+                snapshot = None
+        except (ValueError, KeyError, TypeError):
+            snapshot = None
+    if snapshot is None:
+        snapshot = CorpusSnapshot(build_snapshot(puzzles_dir, path), puzzles_dir)
+    _SNAPSHOTS[puzzles_dir] = snapshot
+    return snapshot
+
+
+if __name__ == "__main__":
+    puzzles_dir = Path(sys.argv[1]).resolve() if len(sys.argv) > 1 else default_puzzles_dir()
+    snapshot = CorpusSnapshot(build_snapshot(puzzles_dir, _snapshot_path(puzzles_dir)), puzzles_dir)
+    print(f"Wrote {snapshot.path} ({snapshot.path.stat().st_size} bytes)")
+    print(f"  rows: {len(snapshot)}, width: {snapshot.width}, categories: {len(snapshot.categories)}")
+    for source in snapshot.sources:
+        print(f"  {source['name']}: {source['count']} rows")
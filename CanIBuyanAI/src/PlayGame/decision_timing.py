@@ -0,0 +1,177 @@
+"""
+Decision Timing for Wheel of Fortune AI Players
+Per-call wall-clock and CPU time of player turns and of the expensive phases
+inside them, collected into histograms that can be dumped as JSON.
+
+Nothing is timed unless a recorder is active, so the hooks cost one context
+variable lookup per call the rest of the time:
+
+    recorder = LatencyRecorder()
+    with recording(recorder):
+        play_random_game(["smart", "smart", "solve_timing"])
+    recorder.dump("latency.json")
+
+Phase times are inclusive: a phase called from inside another (the letter
+model inside the solution estimate, say) counts towards both.
+"""
+
+import bisect
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List
+
+# Upper bounds of the histogram buckets in milliseconds (1-2-5 steps from
+# 10 microseconds to 100 seconds); a last bucket catches anything slower
+BUCKET_BOUNDS_MS = [scale * step for scale in (0.01, 0.1, 1, 10, 100, 1000, 10000) for step in (1, 2, 5)] + [100000]
+
+_RECORDER: ContextVar = ContextVar('decision_timing_recorder', default=None)
+
+
+class LatencyHistogram:
+    """Count, total, extremes and bucketed distribution of one kind of time."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+
+    def merge(self, other: 'LatencyHistogram'):
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (capped at the slowest call)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS + [self.max], self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_json(self) -> Dict:
+        return {'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max,
+                'mean': self.mean, 'p50': self.percentile(0.5), 'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99), 'buckets': self.buckets}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.count, histogram.total = data['count'], data['total']
+        histogram.min, histogram.max = data['min'], data['max']
+        histogram.buckets = list(data['buckets'])
+        return histogram
+
+
+class LatencyRecorder:
+    """Wall and CPU time histograms, keyed by player (``player:smart``) or phase name."""
+
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def record(self, name: str, wall_ms: float, cpu_ms: float):
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = {'wall_ms': LatencyHistogram(), 'cpu_ms': LatencyHistogram()}
+        timing['wall_ms'].add(wall_ms)
+        timing['cpu_ms'].add(cpu_ms)
+
+    def merge(self, other: 'LatencyRecorder'):
+        for name, timing in other.timings.items():
+            mine = self.timings.setdefault(name, {'wall_ms': LatencyHistogram(), 'cpu_ms': LatencyHistogram()})
+            for kind, histogram in timing.items():
+                mine[kind].merge(histogram)
+
+    def to_json(self) -> Dict:
+        return {'bucket_bounds_ms': BUCKET_BOUNDS_MS,
+                'timings': {name: {kind: histogram.to_json() for kind, histogram in timing.items()}
+                            for name, timing in sorted(self.timings.items())}}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'LatencyRecorder':
+        recorder = cls()
+        for name, timing in data['timings'].items():
+            recorder.timings[name] = {kind: LatencyHistogram.from_json(histogram) for kind, histogram in timing.items()}
+        return recorder
+
+    def dump(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, indent=2)
+
+    def format_table(self) -> List[str]:
+        """One line per player or phase, slowest p95 first."""
+        lines = []
+        for name, timing in sorted(self.timings.items(), key=lambda item: -item[1]['wall_ms'].percentile(0.95)):
+            wall, cpu = timing['wall_ms'], timing['cpu_ms']
+            lines.append(f"{name:40} | Calls: {wall.count:7d} | Wall p50 {wall.percentile(0.5):8.2f}ms "
+                         f"p95 {wall.percentile(0.95):8.2f}ms max {wall.max:8.2f}ms | CPU mean {cpu.mean:8.2f}ms")
+        return lines
+
+
+def current_recorder() -> LatencyRecorder:
+    """The active recorder, or None."""
+    return _RECORDER.get()
+
+
+@contextmanager
+def recording(recorder: LatencyRecorder):
+    """Time every hooked call made inside this block into ``recorder``."""
+    token = _RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _RECORDER.reset(token)
+
+
+@contextmanager
+def timed(name: str):
+    """Time the block as one call of ``name`` (if a recorder is active)."""
+    recorder = _RECORDER.get()
+    if recorder is None:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        recorder.record(name, (time.perf_counter() - wall) * 1000, (time.thread_time() - cpu) * 1000)
+
+
+def timed_phase(func):
+    """Decorator timing every call of ``func`` under its name (if a recorder is active)."""
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _RECORDER.get()
+        if recorder is None:
+            return func(*args, **kwargs)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            recorder.record(name, (time.perf_counter() - wall) * 1000, (time.thread_time() - cpu) * 1000)
+    return wrapper
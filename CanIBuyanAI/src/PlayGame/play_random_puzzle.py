@@ -12,6 +12,19 @@ try:
 except Exception:
   from src.PlayGame.smart_player import computer_turn_smart, computer_turn_smart_conservative, computer_turn_smart_aggressive
 
+try:
+  from corpus_index import CandidateSet
+  from decision_timing import timed
+  from puzzle_sampler import get_sampler
+  import game_engine
+  from game_engine import GameState, Wheel, apply_action, emit, use_wheel
+except Exception:
+  from src.PlayGame.corpus_index import CandidateSet
+  from src.PlayGame.decision_timing import timed
+  from src.PlayGame.puzzle_sampler import get_sampler
+  from src.PlayGame import game_engine
+  from src.PlayGame.game_engine import GameState, Wheel, apply_action, emit, use_wheel
+
 def computer_turn(showing, winnings, previous_guesses, turn):
   # Guess in the order of the alphabet
   alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
@@ -256,25 +269,9 @@ def computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn):
       break
   return character, dollar
 
-def get_random_puzzle():
-  random_int = random.randint(0,900) # Roughly size of num puzzles in valid
-  number = 0
-  # Resolve data path relative to this file so imports as package work
-  import os
-  base = os.path.dirname(__file__)
-  data_path = os.path.abspath(os.path.join(base, '..', '..', 'data', 'puzzles', 'valid.csv'))
-  with open(data_path) as f:
-    for line in f:
-      line = line.rstrip('\n')
-      parts = line.split(',')
-      if len(parts) < 4:
-        continue
-      puzzle, clue, date, game_type = parts[0], parts[1], parts[2], parts[3]
-      if number == random_int:
-        clue = clue.replace("&amp;", "&") # HTML Code
-        puzzle = puzzle.replace("&amp;", "&") # HTML Code
-        return(puzzle, clue, date, game_type)
-      number = number + 1
+def get_random_puzzle(rng=random):
+  # Any puzzle from the valid split, loaded into memory once
+  return get_sampler("valid").sample(rng)
 
 def human_turn(showing, winnings, previous_guesses, turn, puzzle):
 
@@ -376,156 +373,150 @@ def print_board(showing):
   print(to_print)
 
 def spin_wheel():
-  wheel_values = [0,-1,500,550,600,650,700,750,800,850,900,-1,500,550,600,650,700,750,800,850,900,500,550,600]
-  # Note that the wheel changes over time ... free play now an 850. Different rounds, etc.
-  print("Wheel is spinning ....")
-  print("It landed on ....")
-  time.sleep(2) # Drama!
-  ascii_wheel.draw_ascii_wheel(wheel_values, radius=18, label_style="long")
-  dollar = random.choice(wheel_values)
-  print("....", dollar, "dollars")
-  return dollar
-
-
-def play_random_game(type_of_players):
+  # Spins the wheel of the game in progress; any drama is up to its listeners
+  return game_engine.spin_wheel()
+
+
+class ConsoleListener:
+  # Prints the game for people watching. delay is the pause (in seconds) for drama
+  def __init__(self, delay=2):
+    self.delay = delay
+
+  def __call__(self, event):
+    kind = event['type']
+    if kind == 'start':
+      print("Welcome to Wheel of Fortune")
+      print("You are playing a game of type:", event['game_type'])
+      print("The clue is:", event['clue'])
+      print_board(event['showing'])
+    elif kind == 'turn':
+      time.sleep(self.delay) # Let humans see what is going on
+      print("It is player", event['player'], "'s turn")
+      print("This player is:", event['player_type'])
+    elif kind == 'spin':
+      # Note that the wheel changes over time ... free play now an 850. Different rounds, etc.
+      print("Wheel is spinning ....")
+      print("It landed on ....")
+      time.sleep(self.delay) # Drama!
+      ascii_wheel.draw_ascii_wheel(event['values'], radius=18, label_style="long")
+      print("....", event['value'], "dollars")
+    elif kind == 'solve_attempt':
+      if event['correct']:
+        print(f"Player {event['player']} solved the puzzle with '{event['guess']}' and wins!")
+      else:
+        print(f"Player {event['player']} attempted to solve with '{event['guess']}' and was incorrect.")
+    elif kind == 'invalid_guess':
+      print(f"Invalid guess from player {event['player']}: '{event['guess']}'. Skipping turn.")
+    elif kind == 'repeat_guess':
+      print("Sorry, that's already been guessed .... next player")
+    elif kind == 'miss':
+      print("Sorry, not in the puzzle ... next player")
+    elif kind == 'status':
+      print("Winnings:", event['winnings'])
+      print("Previous guesses:", event['previous_guesses'])
+      print("The clue is:", event['clue'])
+      print_board(event['showing'])
+    elif kind == 'solve_chance':
+      print("Player", event['player'], "has a chance to solve")
+    elif kind == 'final_solve':
+      if event['correct']:
+        print("Player", event['player'], "won!")
+        print("Winnings:", event['winnings'])
+      else:
+        print("Wrong ... next player")
+        print("The clue is:", event['clue'])
+        print_board(event['showing'])
+    elif kind == 'game_over' and event['solved']:
+      print("Winnings:", event['winnings'])
+
+
+def take_turn(type_of_player, state, candidates):
+  # Ask a player for their action. The turn functions charge vowels and bankruptcies on state.winnings
+  showing, winnings, previous_guesses, turn = state.showing, state.winnings, state.previous_guesses, state.turn
+  if type_of_player == "human":
+    return human_turn(showing, winnings, previous_guesses, turn, state.puzzle)
+  elif type_of_player == "morse":
+    return computer_turn_morse(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "oxford":
+    return computer_turn_oxford(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "trigram":
+    return computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "smart":
+    return computer_turn_smart(showing, winnings, previous_guesses, turn, candidates)
+  elif type_of_player == "conservative":
+    return computer_turn_smart_conservative(showing, winnings, previous_guesses, turn, candidates)
+  elif type_of_player == "aggressive":
+    return computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn, candidates)
+  raise ValueError("Unknown player type: " + type_of_player)
+
+
+def normalize_guess(guess, puzzle):
+  # Solve attempts count if their letters match the puzzle's, whatever the punctuation; letters are upper-cased
+  if isinstance(guess, str) and guess.startswith('SOLVE:'):
+    candidate = guess.split(':', 1)[1].upper()
+    if re.sub(r'[^A-Z]', '', candidate) == re.sub(r'[^A-Z]', '', puzzle):
+      return 'SOLVE:' + puzzle
+    return 'SOLVE:' + candidate
+  return guess.upper() if isinstance(guess, str) else guess
+
+
+def play_random_game(type_of_players, rng=None, listeners=None):
+  # rng seeds the puzzle and the wheel; listeners get every game event (nothing is shown without them)
+  rng = rng or random.Random()
+  listeners = list(listeners or [])
+  wheel = Wheel(rng=rng, listeners=listeners)
 
   # Play the game
-  puzzle, clue, date, game_type = get_random_puzzle()
-  print("Welcome to Wheel of Fortune")
-  print("You are playing a game of type:", game_type)
-  print("The clue is:", clue)
+  puzzle, clue, date, game_type = get_random_puzzle(rng)
+  state = GameState(puzzle, clue, date, game_type)
+  emit(listeners, {'type': 'start', 'game_type': game_type, 'clue': clue, 'showing': state.showing})
 
-  # Mask out word
-  showing = puzzle
-  showing = re.sub(r"[A-Z]","_",showing)
-  print_board(showing)
+  # Candidate puzzles for the smart players, narrowed as the board fills in
+  candidates = CandidateSet(state.showing)
 
-  # Play the game
-  guess = ""
-  previous_guesses = []
-  turn = 0
+  with use_wheel(wheel):
+    while not state.board_complete:
+      # Ends wierd if last letter is guessed and not solved.# TODO
+      type_of_player = type_of_players[state.player]
+      emit(listeners, {'type': 'turn', 'player': state.player, 'player_type': type_of_player, 'turn': state.turn})
 
-  winnings = [0,0,0]
-  dollar = 0
-  is_solved = False
-
-  while showing != puzzle:
-    time.sleep(2) # Let humans see what is going on
-    # Ends wierd if last letter is guessed and not solved.# TODO
-    print("It is player", turn % 3, "'s turn")
-
-    # Type of player
-    type_of_player = type_of_players[turn % 3]
-    print("This player is:", type_of_player)
-
-    if type_of_player == "human":
-      guess, dollar = human_turn(showing, winnings, previous_guesses, turn, puzzle)
-    elif type_of_player == "morse":
-      guess, dollar = computer_turn_morse(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "oxford":
-      guess, dollar = computer_turn_oxford(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "trigram":
-      guess, dollar = computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "smart":
-      guess, dollar = computer_turn_smart(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "conservative":
-      guess, dollar = computer_turn_smart_conservative(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "aggressive":
-      guess, dollar = computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn)
-
-    ## Human playing
-    #if turn % 3 == 0:
-    #  guess, dollar = human_turn(showing, winnings, previous_guesses, turn, puzzle)
-    #
-    ## Computer playing
-    #elif turn % 3 == 1:
-    #  guess, dollar = computer_turn_oxford(showing, winnings, previous_guesses, turn)
-    #elif turn % 3 == 2:
-    #  guess, dollar = computer_turn_morse(showing, winnings, previous_guesses, turn)
-
-
-    # Handle special 
-    # VE attempts from computer players
-    current = turn % 3
-    if isinstance(guess, str) and guess.startswith('SOLVE:'):
-      candidate = guess.split(':', 1)[1].upper()
-      # Normalize both candidate and puzzle for comparison
-      cand_norm = re.sub(r'[^A-Z]', '', candidate)
-      puzzle_norm = re.sub(r'[^A-Z]', '', puzzle)
-      if cand_norm == puzzle_norm:
-        print(f"Player {current} solved the puzzle with '{candidate}' and wins!")
-        print("Winnings:", winnings)
-        showing = puzzle
-        is_solved = True
-        break
-      else:
-        print(f"Player {current} attempted to solve with '{candidate}' and was incorrect.")
-        turn = turn + 1
-        continue
-    else:
-      # Normalize guess
-      if isinstance(guess, str):
-        guess = guess.upper()
+      with timed("player:" + type_of_player):
+        guess, dollar = take_turn(type_of_player, state, candidates)
+      guess = normalize_guess(guess, puzzle)
 
       # Reject multi-character non-solve guesses to avoid corrupting state
-      if guess != "_" and (not isinstance(guess, str) or len(guess) != 1):
-        print(f"Invalid guess from player {current}: '{guess}'. Skipping turn.")
-        turn = turn + 1
-        continue
-
-      # Double check that guess has not already been said
-      if guess in previous_guesses and guess != "_":
-        print("Sorry, that's already been guessed .... next player")
-        turn = turn + 1
+      if guess != "_" and (not isinstance(guess, str) or (len(guess) != 1 and not guess.startswith('SOLVE:'))):
+        emit(listeners, {'type': 'invalid_guess', 'player': state.player, 'guess': guess})
+        state = state.copy()
+        state.turn += 1
         continue
 
-      # Update board for a valid single-letter guess
-      if guess != "_":
-        previous_guesses.append(guess)
-
-      correct_places = [pos for pos, char in enumerate(puzzle) if char == guess]
-
-      if guess == "_":
-        # Wrong guess or special marker (bankrupt/lose turn)
-        turn = turn + 1
-      elif len(correct_places) < 1:
-        print("Sorry, not in the puzzle ... next player")
-        turn = turn + 1
-      else:
-        # Correct guess: do not advance turn
-        pass
-
-      # Credit winnings to the player who made the guess
-      winnings[current] = winnings[current] + (dollar * len(correct_places))
-      for correct_letter in correct_places:
-        showing = showing[:correct_letter] + guess + showing[correct_letter + 1:]
-    print("Winnings:", winnings)
-    print("Previous guesses:", previous_guesses)
-    print("The clue is:", clue)
-    print_board(showing)
-
-  while not is_solved:
-    print("Player", turn % 3, "has a chance to solve")
-    type_of_player = type_of_players[turn % 3] # wouldn't have hit this above
-    # If human, let them guess, otheerwise let computer guess
-    if type_of_player == "human":
-      solve = input("Your guess to solve: ...... ").upper() # TODO: clean
-    else:
-      # If the board is complete or already solved, don't loop forever
-      if showing == puzzle:
-        solve = puzzle
+      state, events = apply_action(state, guess, dollar)
+      for event in events:
+        emit(listeners, event)
+        if event['type'] in ('reveal', 'miss'):
+          candidates.observe(event['letter'], state.showing)
+      if state.is_over:
+        emit(listeners, {'type': 'game_over', 'winner': state.winner, 'winnings': state.winnings, 'solved': True})
+        return state.winner
+      if not guess.startswith('SOLVE:'):
+        emit(listeners, {'type': 'status', 'winnings': state.winnings, 'previous_guesses': state.previous_guesses,
+                         'clue': clue, 'showing': state.showing})
+
+    while not state.is_over:
+      emit(listeners, {'type': 'solve_chance', 'player': state.player})
+      type_of_player = type_of_players[state.player] # wouldn't have hit this above
+      # If human, let them guess, otheerwise let computer guess
+      if type_of_player == "human":
+        solve = input("Your guess to solve: ...... ").upper() # TODO: clean
       else:
-        solve = showing
-  
-    if solve == puzzle:
-      print("Player", turn % 3, "won!")
-      print("Winnings:", winnings)
-      is_solved = True
-    else:
-      print("Wrong ... next player")
-      turn = turn + 1
-      print("The clue is:", clue)
-      print_board(showing)
+        solve = state.showing
+
+      player = state.player
+      state, events = apply_action(state, 'SOLVE:' + solve, 0)
+      emit(listeners, {'type': 'final_solve', 'player': player, 'correct': state.is_over,
+                       'winnings': state.winnings, 'clue': clue, 'showing': state.showing})
+  return state.winner
 
 if __name__ == '__main__':
   type_of_players = sys.argv[1:]
@@ -537,7 +528,7 @@ if __name__ == '__main__':
     time.sleep(3)
   #type_of_players = ["morse", "morse", "oxford"] # TODO: Set with command line
 
-  play_random_game(type_of_players)
+  play_random_game(type_of_players, listeners=[ConsoleListener()])
 
 
 
@@ -8,7 +8,32 @@ from collections import Counter
 from pathlib import Path
 from typing import Tuple, Dict, List
 
+try:
+    from corpus_index import CandidateSet, DictionaryIndex, get_corpus_index
+    from decision_timing import timed_phase
+except Exception:
+    from src.PlayGame.corpus_index import CandidateSet, DictionaryIndex, get_corpus_index
+    from src.PlayGame.decision_timing import timed_phase
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 _DICT_CACHE: List[str] = []
+_DICT_INDEX: DictionaryIndex = None
+
+# Without NumPy the letter model loops in Python, so it only looks at this
+# many candidates to keep turns fast
+_PURE_PYTHON_MAX_CANDIDATES = 400
+
+# English letter frequencies used when the letter model has no estimate
+_BASE_FREQ = {
+    **{c: f for c, f in zip("ETAOINSHRDLU", [0.127,0.091,0.081,0.075,0.07,0.069,0.067,0.063,0.061,0.060,0.043,0.040])},
+    **{c: f for c, f in zip("CMFWYGPBVKQJXZ", [0.028,0.024,0.024,0.024,0.02,0.02,0.02,0.019,0.013,0.01,0.008,0.001,0.001,0.001])}
+}
 
 
 def should_spin_or_buy_vowel(
@@ -17,7 +42,8 @@ def should_spin_or_buy_vowel(
     previous_guesses: List[str],
     next_letter_candidate: str = None,
     opponents_winnings: List[int] = None,
-    strategy: str = 'optimized'
+    strategy: str = 'optimized',
+    candidates: CandidateSet = None
 ) -> Tuple[str, str]:
     """
     Intelligent decision function for Wheel of Fortune gameplay.
@@ -27,6 +53,7 @@ def should_spin_or_buy_vowel(
         winnings: Current player winnings
         previous_guesses: List of letters already guessed
         next_letter_candidate: The letter we're considering guessing (optional)
+        candidates: The game's CandidateSet, used instead of a corpus lookup (optional)
     
     Returns:
         Tuple of (decision, reasoning) where decision is 'spin', 'buy_vowel', or 'solve'
@@ -35,7 +62,7 @@ def should_spin_or_buy_vowel(
     
     # Analyze current game state
     game_state = analyze_game_state(showing, previous_guesses)
-    letter_model = build_letter_probability_model(showing, previous_guesses)
+    letter_model = build_letter_probability_model(showing, previous_guesses, candidates=candidates)
     
     # If we can't afford a vowel, we must spin
     if winnings < 250:
@@ -47,7 +74,9 @@ def should_spin_or_buy_vowel(
 
     # Estimate how confident we are about the full puzzle solution by
     # matching the showing pattern against the known puzzle corpus or synthesis.
-    solution_dist = estimate_solution_distribution(showing, previous_guesses, letter_model=letter_model)
+    solution_dist = estimate_solution_distribution(
+        showing, previous_guesses, letter_model=letter_model, candidates=candidates
+    )
     solution_confidence = solution_dist.get('top_probability', 0.0)
     synthesized = solution_dist.get('synthesized', False)
     candidate_count = solution_dist.get('candidate_count', 0)
@@ -224,49 +253,37 @@ def analyze_vowel_value(
     }
 
 
-def _load_matching_puzzles(showing: str) -> tuple:
-    """Return the normalized showing pattern and matching puzzles from the corpus."""
+def _load_matching_puzzles(
+    showing: str,
+    previous_guesses: List[str] = None,
+    candidates: CandidateSet = None
+) -> tuple:
+    """Return the normalized showing pattern and matching puzzles from the corpus.
+
+    Lookups go through the process-wide positional index, which is built once
+    from the corpus files. When ``previous_guesses`` is given, puzzles that
+    would hide an already-guessed letter under a blank are excluded as well.
+    A game's ``candidates`` set that is in sync with ``showing`` is read
+    directly instead.
+    """
     norm_showing = re.sub(r'[^A-Z_ ]', '', showing.upper())
     if not norm_showing.strip():
         return norm_showing, []
 
-    pattern = '^' + re.escape(norm_showing).replace('_', '[A-Z]') + '$'
-    prog = re.compile(pattern)
-
-    # Resolve the puzzle list relative to the repo root to work in both CLI and IDE
-    base = Path(__file__).resolve().parents[2] / "data" / "puzzles"
-    puzzle_files = ["valid.csv", "train.csv", "test.csv", "years_1_25.csv"]
-    # Deduplicate by normalized puzzle text so the same puzzle appearing in
-    # multiple corpus files doesn't artificially dilute the confidence score.
-    matches = []
-    seen_norm = set()
-    for fname in puzzle_files:
-        p = base / fname
-        if not p.exists():
-            continue
-        try:
-            with p.open('r') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    puzzle = line.split(',')[0].strip().upper()
-                    puzzle_norm = re.sub(r'[^A-Z ]', '', puzzle)
-                    puzzle_norm = re.sub(r'\s+', ' ', puzzle_norm).strip()
-                    if prog.match(puzzle_norm) and puzzle_norm not in seen_norm:
-                        matches.append((puzzle, puzzle_norm))
-                        seen_norm.add(puzzle_norm)
-        except FileNotFoundError:
-            continue
+    if candidates is not None and candidates.tracks(showing):
+        return norm_showing, candidates.entries()
 
-    return norm_showing, matches
+    return norm_showing, get_corpus_index().lookup(norm_showing, previous_guesses or ())
 
 
+@timed_phase
 def estimate_solution_distribution(
     showing: str,
     previous_guesses: List[str],
     top_k: int = 10,
     letter_model: Dict = None,
-    allow_corpus_lookup: bool = False
+    allow_corpus_lookup: bool = False,
+    candidates: CandidateSet = None
 ) -> Dict:
     """Estimate a probability distribution over possible solutions from the corpus.
 
@@ -275,14 +292,14 @@ def estimate_solution_distribution(
     by how well they fit the revealed letters and how many blanks they fill.
     Returns a small distribution with top candidates and a `top_probability`.
     """
-    norm_showing, matches = _load_matching_puzzles(showing)
+    norm_showing, matches = _load_matching_puzzles(showing, previous_guesses, candidates)
     # To avoid "cheating" by memorizing the dataset, skip direct lookups unless explicitly allowed.
     if not allow_corpus_lookup:
         matches = []
 
     if not matches:
         # Try to build a plausible full candidate from the system dictionary.
-        dict_candidate, dict_conf = _synthesize_from_dictionary(showing, previous_guesses, letter_model)
+        dict_candidate, dict_conf = _synthesize_from_dictionary(showing, previous_guesses, letter_model, candidates)
         if dict_candidate:
             return {
                 'candidates': [(dict_candidate, dict_conf)],
@@ -292,7 +309,7 @@ def estimate_solution_distribution(
             }
         # Fallback: synthesize a best-guess candidate using the letter model or
         # default English frequencies so we still have a solve target.
-        fallback_candidate = synthesize_candidate(showing, previous_guesses, letter_model)
+        fallback_candidate = synthesize_candidate(showing, previous_guesses, letter_model, candidates)
         if not fallback_candidate.strip('_ '):
             return {'candidates': [], 'top_probability': 0.0}
         # Give a modest pseudo-confidence; higher if almost solved
@@ -328,7 +345,13 @@ def estimate_solution_distribution(
     }
 
 
-def _synthesize_from_dictionary(showing: str, previous_guesses: List[str], letter_model: Dict = None) -> Tuple[str, float]:
+@timed_phase
+def _synthesize_from_dictionary(
+    showing: str,
+    previous_guesses: List[str],
+    letter_model: Dict = None,
+    candidates: CandidateSet = None
+) -> Tuple[str, float]:
     """Build a candidate solution using dictionary matches for each word.
 
     Returns (candidate, confidence) or ('', 0.0) if not enough evidence.
@@ -341,7 +364,7 @@ def _synthesize_from_dictionary(showing: str, previous_guesses: List[str], lette
     if not words:
         return "", 0.0
 
-    letter_model = letter_model or build_letter_probability_model(showing, previous_guesses)
+    letter_model = letter_model or build_letter_probability_model(showing, previous_guesses, candidates=candidates)
     filled_words = []
     any_blank = False
 
@@ -369,19 +392,62 @@ def _synthesize_from_dictionary(showing: str, previous_guesses: List[str], lette
     return candidate, confidence
 
 
+def _count_blank_letters(
+    puzzle_norms: List[str],
+    blank_positions: List[int],
+    previous_guesses: List[str]
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Count letters under the blanks of equal-length candidates with NumPy.
+
+    The candidates form an (N x L) uint8 matrix; only the blank columns are
+    kept. Returns ``(candidate_hits, reveal_counts)``: how many candidates have
+    each letter under some blank, and how many blanks it fills in total.
+    Letters are ordered by first appearance, row by row, as the loop would.
+    """
+    matrix = np.frombuffer(''.join(puzzle_norms).encode('ascii'), dtype=np.uint8)
+    blanks = matrix.reshape(len(puzzle_norms), -1)[:, blank_positions]
+
+    countable = np.zeros(256, dtype=bool)
+    countable[ord('A'):ord('Z') + 1] = True
+    for letter in previous_guesses:
+        if len(letter) == 1 and 'A' <= letter <= 'Z':
+            countable[ord(letter)] = False
+    keep = countable[blanks]
+
+    rows = np.nonzero(keep)[0]
+    codes = blanks[keep]
+    reveal_totals = np.bincount(codes, minlength=256)
+    one_hot = np.zeros((len(puzzle_norms), 256), dtype=bool)
+    one_hot[rows, codes] = True
+    hit_totals = one_hot.sum(axis=0)
+
+    present, first_seen = np.unique(codes, return_index=True)
+    order = present[np.argsort(first_seen)]
+    reveal_counts = {chr(code): int(reveal_totals[code]) for code in order}
+    candidate_hits = {chr(code): int(hit_totals[code]) for code in order}
+    return candidate_hits, reveal_counts
+
+
+@timed_phase
 def build_letter_probability_model(
     showing: str,
     previous_guesses: List[str],
-    max_candidates: int = 400
+    max_candidates: int = None,
+    candidates: CandidateSet = None
 ) -> Dict:
     """Create a positional letter probability model from matching corpus entries.
 
     It looks at all candidate solutions that fit the current pattern and
     computes the probability of each letter appearing in any blank plus the
     expected number of letters that would be revealed by guessing it.
+    ``max_candidates`` caps how many matches are used; by default all of them
+    are (or the first 400 when NumPy is unavailable).
     """
-    norm_showing, matches = _load_matching_puzzles(showing)
-    matches = matches[:max_candidates]
+    norm_showing, matches = _load_matching_puzzles(showing, previous_guesses, candidates)
+    if max_candidates is None and not NUMPY_AVAILABLE:
+        max_candidates = _PURE_PYTHON_MAX_CANDIDATES
+    if max_candidates is not None:
+        matches = matches[:max_candidates]
     if not matches:
         # Use a simple English frequency fallback so we still produce useful guesses
         base_freq = {
@@ -419,22 +485,26 @@ def build_letter_probability_model(
             'available_vowels': 0,
         }
 
-    candidate_hits = Counter()
-    reveal_counts = Counter()
     total_candidates = len(matches)
-
-    for _, puzzle_norm in matches:
-        seen_in_candidate = set()
-        for pos in blank_positions:
-            if pos >= len(puzzle_norm):
-                continue
-            letter = puzzle_norm[pos]
-            if letter == ' ' or letter in previous_guesses:
-                continue
-            reveal_counts[letter] += 1
-            seen_in_candidate.add(letter)
-        for letter in seen_in_candidate:
-            candidate_hits[letter] += 1
+    if NUMPY_AVAILABLE and all(len(puzzle_norm) == len(norm_showing) for _, puzzle_norm in matches):
+        candidate_hits, reveal_counts = _count_blank_letters(
+            [puzzle_norm for _, puzzle_norm in matches], blank_positions, previous_guesses
+        )
+    else:
+        candidate_hits = Counter()
+        reveal_counts = Counter()
+        for _, puzzle_norm in matches:
+            seen_in_candidate = set()
+            for pos in blank_positions:
+                if pos >= len(puzzle_norm):
+                    continue
+                letter = puzzle_norm[pos]
+                if letter == ' ' or letter in previous_guesses:
+                    continue
+                reveal_counts[letter] += 1
+                seen_in_candidate.add(letter)
+            for letter in seen_in_candidate:
+                candidate_hits[letter] += 1
 
     prob_any = {letter: candidate_hits[letter] / total_candidates for letter in candidate_hits}
     expected_reveals = {letter: reveal_counts[letter] / total_candidates for letter in reveal_counts}
@@ -480,46 +550,70 @@ def _load_dictionary() -> List[str]:
     return _DICT_CACHE
 
 
+def _load_dictionary_index() -> DictionaryIndex:
+    """Return the length-bucketed index over the system dictionary, built once."""
+    global _DICT_INDEX
+    if _DICT_INDEX is None:
+        _DICT_INDEX = DictionaryIndex(_load_dictionary())
+    return _DICT_INDEX
+
+
+class _LetterWeights(dict):
+    """Per-letter score weights: model probability, then English frequency."""
+
+    def __init__(self, prob_any: Dict[str, float]):
+        super().__init__()
+        self.prob_any = prob_any
+
+    def __missing__(self, ch: str) -> float:
+        weight = self.prob_any.get(ch, _BASE_FREQ.get(ch, 0.001))
+        self[ch] = weight
+        return weight
+
+
+def _qu_bonus(word: str) -> float:
+    """Heuristic: after QU, prefer I (e.g., QUICK) and penalize other vowels."""
+    bonus = 0.0
+    for i in range(len(word) - 2):
+        if word[i] == 'Q' and word[i+1] == 'U':
+            next_c = word[i+2]
+            if next_c == 'I':
+                bonus += 0.5
+            elif next_c in 'AOEY':
+                bonus -= 0.2
+    return bonus
+
+
+def top_word_matches(pattern: str, letter_model: Dict, k: int = 5) -> List[str]:
+    """Return the ``k`` dictionary words matching ``pattern`` that the letter model likes best.
+
+    A word scores the sum of its letters' ``prob_any`` (English frequency when
+    the model has no estimate), adjusted by the QU heuristic.
+    """
+    index = _load_dictionary_index()
+    if not len(index):
+        return []
+    weights = _LetterWeights(letter_model.get('prob_any', {}))
+    return index.top_k(pattern, weights, k, bonus=_qu_bonus, bonus_when=('QUA', 'QUE', 'QUI', 'QUO', 'QUY'))
+
+
 def _best_word_match(pattern: str, previous_guesses: List[str], letter_model: Dict) -> str:
     """Pick the best dictionary word matching the underscore pattern."""
-    words = _load_dictionary()
-    if not words:
-        return ""
-    regex = '^' + re.escape(pattern).replace('_', '[A-Z]') + '$'
-    prog = re.compile(regex)
-    candidates = [w for w in words if len(w) == len(pattern) and prog.match(w)]
-    if not candidates:
-        return ""
+    best = top_word_matches(pattern, letter_model, k=1)
+    return best[0] if best else ""
 
-    # Score by sum of letter probabilities (fallback to frequency if missing)
-    prob_any = letter_model.get('prob_any', {})
-    base_freq = {
-        **{c: f for c, f in zip("ETAOINSHRDLU", [0.127,0.091,0.081,0.075,0.07,0.069,0.067,0.063,0.061,0.060,0.043,0.040])},
-        **{c: f for c, f in zip("CMFWYGPBVKQJXZ", [0.028,0.024,0.024,0.024,0.02,0.02,0.02,0.019,0.013,0.01,0.008,0.001,0.001,0.001])}
-    }
-    def score(word: str) -> float:
-        base = sum(prob_any.get(c, base_freq.get(c, 0.001)) for c in word)
-        # Heuristic: after QU, prefer I (e.g., QUICK) and penalize other vowels
-        bonus = 0.0
-        for i in range(len(word) - 2):
-            if word[i] == 'Q' and word[i+1] == 'U':
-                next_c = word[i+2]
-                if next_c == 'I':
-                    bonus += 0.5
-                elif next_c in 'AOEY':
-                    bonus -= 0.2
-        return base + bonus
-
-    best = max(candidates, key=score)
-    return best
-
-
-def synthesize_candidate(showing: str, previous_guesses: List[str], letter_model: Dict = None) -> str:
+
+def synthesize_candidate(
+    showing: str,
+    previous_guesses: List[str],
+    letter_model: Dict = None,
+    candidates: CandidateSet = None
+) -> str:
     """Fill blanks with most probable letters to form a plausible candidate."""
     if not showing:
         return ""
     if not letter_model:
-        letter_model = build_letter_probability_model(showing, previous_guesses)
+        letter_model = build_letter_probability_model(showing, previous_guesses, candidates=candidates)
 
     ranking = sorted(
         letter_model.get('expected_reveals', {}).items(),
@@ -666,10 +760,10 @@ def calculate_decision_score(
     }
 
 
-def get_best_vowel_guess(showing: str, previous_guesses: List[str]) -> str:
+def get_best_vowel_guess(showing: str, previous_guesses: List[str], candidates: CandidateSet = None) -> str:
     """Determine the best vowel to guess based on the candidate set."""
 
-    letter_model = build_letter_probability_model(showing, previous_guesses)
+    letter_model = build_letter_probability_model(showing, previous_guesses, candidates=candidates)
     if letter_model.get('best_vowel') or letter_model.get('best_info_vowel'):
         return letter_model.get('best_vowel') or letter_model.get('best_info_vowel')
     
@@ -686,10 +780,10 @@ def get_best_vowel_guess(showing: str, previous_guesses: List[str]) -> str:
     return max(available_vowels.keys(), key=lambda x: available_vowels[x])
 
 
-def get_best_consonant_guess(showing: str, previous_guesses: List[str]) -> str:
+def get_best_consonant_guess(showing: str, previous_guesses: List[str], candidates: CandidateSet = None) -> str:
     """Determine the best consonant to guess using the candidate set."""
 
-    letter_model = build_letter_probability_model(showing, previous_guesses)
+    letter_model = build_letter_probability_model(showing, previous_guesses, candidates=candidates)
     if letter_model.get('best_consonant') or letter_model.get('best_info_consonant'):
         return letter_model.get('best_consonant') or letter_model.get('best_info_consonant')
     
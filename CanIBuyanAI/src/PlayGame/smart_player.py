@@ -24,7 +24,7 @@ import re
 SOLVE_CONFIDENCE_THRESHOLD = 0.75
 
 
-def computer_turn_smart(showing, winnings, previous_guesses, turn):
+def computer_turn_smart(showing, winnings, previous_guesses, turn, candidates=None):
     """
     Smart computer player that uses advanced decision-making logic.
     
@@ -33,6 +33,7 @@ def computer_turn_smart(showing, winnings, previous_guesses, turn):
         winnings: List of winnings for all players
         previous_guesses: List of already guessed letters
         turn: Current turn number
+        candidates: The game's CandidateSet, narrowed as letters are revealed (optional)
     
     Returns:
         Tuple of (guess, dollar_value)
@@ -42,7 +43,8 @@ def computer_turn_smart(showing, winnings, previous_guesses, turn):
     # Build opponents list and use smart decision function
     opponents = [w for i, w in enumerate(winnings) if i != (turn % 3)]
     decision, reasoning = should_spin_or_buy_vowel(
-        showing, player_winnings, previous_guesses, opponents_winnings=opponents, strategy='optimized'
+        showing, player_winnings, previous_guesses, opponents_winnings=opponents, strategy='optimized',
+        candidates=candidates
     )
     
     print(f"Smart AI reasoning: {reasoning}")
@@ -52,13 +54,13 @@ def computer_turn_smart(showing, winnings, previous_guesses, turn):
         # corpus candidate if available; otherwise synthesize a best-effort
         # guess by filling blanks with the common vowel 'E'. The game loop
         # will validate the attempt.
-        sol = estimate_solution_distribution(showing, previous_guesses)
+        sol = estimate_solution_distribution(showing, previous_guesses, candidates=candidates)
         top = sol.get('candidates', [])
         if top:
             candidate = top[0][0]
         else:
             from smart_decision import synthesize_candidate
-            candidate = synthesize_candidate(showing, previous_guesses)
+            candidate = synthesize_candidate(showing, previous_guesses, candidates=candidates)
         print(f"Smart AI attempting to solve: {candidate} (p={sol.get('top_probability', 0.0):.2f})")
         return f"SOLVE:{candidate}", 0
     
@@ -66,7 +68,7 @@ def computer_turn_smart(showing, winnings, previous_guesses, turn):
         # Ensure the actual winnings array shows sufficient funds; in some
         # contexts decision reasoning can be stale, so check the real state.
         if winnings[turn % 3] >= 250:
-            vowel = get_best_vowel_guess(showing, previous_guesses)
+            vowel = get_best_vowel_guess(showing, previous_guesses, candidates)
             print(f"Smart AI bought vowel: {vowel}")
             winnings[turn % 3] -= 250
             return vowel, 0
@@ -93,12 +95,12 @@ def computer_turn_smart(showing, winnings, previous_guesses, turn):
             winnings[turn % 3] = 0
             return "_", 0
         else:
-            consonant = get_best_consonant_guess(showing, previous_guesses)
+            consonant = get_best_consonant_guess(showing, previous_guesses, candidates)
             print(f"Smart AI guessed consonant: {consonant}")
             return consonant, dollar
 
 
-def computer_turn_smart_conservative(showing, winnings, previous_guesses, turn):
+def computer_turn_smart_conservative(showing, winnings, previous_guesses, turn, candidates=None):
     """
     Conservative version of smart player - more likely to buy vowels.
     """
@@ -108,7 +110,8 @@ def computer_turn_smart_conservative(showing, winnings, previous_guesses, turn):
     # Modify the decision by being more conservative
     opponents = [w for i, w in enumerate(winnings) if i != (turn % 3)]
     decision, reasoning = should_spin_or_buy_vowel(
-        showing, player_winnings, previous_guesses, opponents_winnings=opponents, strategy='optimized'
+        showing, player_winnings, previous_guesses, opponents_winnings=opponents, strategy='optimized',
+        candidates=candidates
     )
     
     # Conservative adjustment: if we have money and there might be vowels, buy them
@@ -125,7 +128,7 @@ def computer_turn_smart_conservative(showing, winnings, previous_guesses, turn):
     if decision == 'buy_vowel':
         # Double-check actual funds before buying (avoid stale reasoning)
         if winnings[turn % 3] >= 250:
-            vowel = get_best_vowel_guess(showing, previous_guesses)
+            vowel = get_best_vowel_guess(showing, previous_guesses, candidates)
             print(f"Conservative AI bought vowel: {vowel}")
             winnings[turn % 3] -= 250
             return vowel, 0
@@ -134,13 +137,13 @@ def computer_turn_smart_conservative(showing, winnings, previous_guesses, turn):
             decision = 'spin'
     else:
         if decision == 'solve':
-            sol = estimate_solution_distribution(showing, previous_guesses)
+            sol = estimate_solution_distribution(showing, previous_guesses, candidates=candidates)
             top = sol.get('candidates', [])
             if top:
                 candidate = top[0][0]
             else:
                 from smart_decision import synthesize_candidate
-                candidate = synthesize_candidate(showing, previous_guesses)
+                candidate = synthesize_candidate(showing, previous_guesses, candidates=candidates)
             print(f"Conservative AI attempting to solve: {candidate} (p={sol.get('top_probability', 0.0):.2f})")
             return f"SOLVE:{candidate}", 0
 
@@ -160,12 +163,12 @@ def computer_turn_smart_conservative(showing, winnings, previous_guesses, turn):
             winnings[turn % 3] = 0
             return "_", 0
         else:
-            consonant = get_best_consonant_guess(showing, previous_guesses)
+            consonant = get_best_consonant_guess(showing, previous_guesses, candidates)
             print(f"Conservative AI guessed consonant: {consonant}")
             return consonant, dollar
 
 
-def computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn):
+def computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn, candidates=None):
     """
     Aggressive version of smart player - more likely to spin for higher rewards.
     """
@@ -174,7 +177,8 @@ def computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn):
     
     opponents = [w for i, w in enumerate(winnings) if i != (turn % 3)]
     decision, reasoning = should_spin_or_buy_vowel(
-        showing, player_winnings, previous_guesses, opponents_winnings=opponents, strategy='optimized'
+        showing, player_winnings, previous_guesses, opponents_winnings=opponents, strategy='optimized',
+        candidates=candidates
     )
     
     # Aggressive adjustment: prefer spinning unless vowels are very likely
@@ -189,7 +193,7 @@ def computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn):
     if decision == 'buy_vowel':
         # Double-check actual funds before buying (avoid stale reasoning)
         if winnings[turn % 3] >= 250:
-            vowel = get_best_vowel_guess(showing, previous_guesses)
+            vowel = get_best_vowel_guess(showing, previous_guesses, candidates)
             print(f"Aggressive AI bought vowel: {vowel}")
             winnings[turn % 3] -= 250
             return vowel, 0
@@ -198,13 +202,13 @@ def computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn):
             decision = 'spin'
     else:
         if decision == 'solve':
-            sol = estimate_solution_distribution(showing, previous_guesses)
+            sol = estimate_solution_distribution(showing, previous_guesses, candidates=candidates)
             top = sol.get('candidates', [])
             if top:
                 candidate = top[0][0]
             else:
                 from smart_decision import synthesize_candidate
-                candidate = synthesize_candidate(showing, previous_guesses)
+                candidate = synthesize_candidate(showing, previous_guesses, candidates=candidates)
             print(f"Aggressive AI attempting to solve: {candidate} (p={sol.get('top_probability', 0.0):.2f})")
             return f"SOLVE:{candidate}", 0
 
@@ -224,7 +228,7 @@ def computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn):
             winnings[turn % 3] = 0
             return "_", 0
         else:
-            consonant = get_best_consonant_guess(showing, previous_guesses)
+            consonant = get_best_consonant_guess(showing, previous_guesses, candidates)
             print(f"Aggressive AI guessed consonant: {consonant}")
             return consonant, dollar
 
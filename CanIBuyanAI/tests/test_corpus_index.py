@@ -0,0 +1,96 @@
+import os
+import sys
+from collections import defaultdict
+
+# Make src/PlayGame importable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'PlayGame'))
+
+import corpus_index
+
+
+def _write_corpus(tmp_path, rows):
+    (tmp_path / 'valid.csv').write_text('\n'.join(rows) + '\n')
+    return corpus_index.CorpusIndex(data_dir=tmp_path, puzzle_files=['valid.csv'])
+
+
+def test_word_shape():
+    assert corpus_index.word_shape('THE QUICK FOX') == (3, 5, 3)
+
+
+def test_lookup_only_matches_same_shape(tmp_path):
+    index = _write_corpus(tmp_path, [
+        'DOOR HINGE,Around the House,4/14/06 (#4445),BR',
+        'DOOR HINGES,Around the House,4/14/06 (#4445),BR',
+        'POOR THING,Phrase,4/14/06 (#4445),R1',
+    ])
+    assert index.lookup('_OOR _ING_') == [('DOOR HINGE', 'DOOR HINGE')]
+    assert index.lookup('_OOR ______') == [('DOOR HINGES', 'DOOR HINGES')]
+    assert index.lookup('____') == []
+
+
+def test_duplicates_keep_first_occurrence(tmp_path):
+    index = _write_corpus(tmp_path, [
+        "DON'T STOP,Phrase,1/1/06 (#1),R1",
+        'DONT STOP,Phrase,1/2/06 (#2),R2',
+    ])
+    assert len(index) == 1
+    assert index.lookup('____ ____') == [("DON'T STOP", 'DONT STOP')]
+
+
+def test_guessed_letters_cannot_hide_under_blanks(tmp_path):
+    index = _write_corpus(tmp_path, [
+        'DOOR HINGE,Around the House,4/14/06 (#4445),BR',
+        'POOR HINGE,Phrase,4/14/06 (#4445),R1',
+    ])
+    assert len(index.lookup('_OOR HINGE')) == 2
+    # P was called and missed, so POOR HINGE is impossible
+    assert index.lookup('_OOR HINGE', guessed=['P']) == [('DOOR HINGE', 'DOOR HINGE')]
+    # E was called but only shows at the end, so both still fit
+    assert len(index.lookup('_OOR ____E', guessed=['O', 'R', 'E'])) == 2
+
+
+def test_pattern_index_blanks_only_hide_letters():
+    index = corpus_index.PatternIndex(["DON'T", 'DONUT', 'DONOR'])
+    assert index.match('DON_T') == ['DONUT']
+    assert index.match("DON'T") == ["DON'T"]
+    assert index.match('DO___', guessed=['U']) == ['DONOR']
+
+
+def test_candidate_set_narrows_in_place(tmp_path):
+    index = _write_corpus(tmp_path, [
+        'DOOR HINGE,Around the House,4/14/06 (#4445),BR',
+        'POOR HINGE,Phrase,4/14/06 (#4445),R1',
+        'POOR THING,Phrase,4/14/06 (#4445),R1',
+    ])
+    candidates = corpus_index.CandidateSet('____ _____', corpus=index)
+    assert len(candidates) == 3
+
+    candidates.observe('E', '____ ____E')
+    assert [p for p, _ in candidates.entries()] == ['DOOR HINGE', 'POOR HINGE']
+    candidates.observe('P', '____ ____E')
+    assert [p for p, _ in candidates.entries()] == ['DOOR HINGE']
+    assert candidates.tracks('____ ____E')
+    assert not candidates.tracks('_OO_ ____E')
+
+
+def test_dictionary_index_top_k_prefers_weights_then_order():
+    words = ['CAT', 'COT', 'CUT', 'DOG', "C'T", 'TAC']
+    index = corpus_index.DictionaryIndex(words)
+    assert index.match('C_T') == ['CAT', 'COT', 'CUT']
+    weights = {'C': 0.1, 'T': 0.1, 'A': 0.5, 'O': 0.5, 'U': 0.2}
+    # CAT and COT tie; the earlier word wins, like max() over the matches
+    assert index.top_k('C_T', weights, k=1) == ['CAT']
+    assert index.top_k('C_T', weights, k=3) == ['CAT', 'COT', 'CUT']
+    assert index.top_k('C_T', weights, bonus=lambda w: 1.0, bonus_when=['CU']) == ['CUT']
+    assert index.top_k('____', weights) == []
+
+
+def test_dictionary_index_vectorized_path_matches_plain_scoring(monkeypatch):
+    words = ['%s%s%s' % (a, b, c) for a in 'ABCDEFGH' for b in 'AEIOU' for c in 'RSTLN']
+    words += ['ÆON', 'ŒON']
+    index = corpus_index.DictionaryIndex(words)
+    weights = defaultdict(float, {ch: (ord(ch) % 7) / 10 for ch in 'ABCDEFGHIORSTLNUEÆŒ'})
+    expected = sorted(index.match('___'), key=lambda w: -sum(weights[c] for c in w))[:5]
+    assert index.top_k('___', weights, k=5) == expected
+    monkeypatch.setattr(corpus_index, '_VECTOR_MIN_MATCHES', 0)
+    assert index.top_k('___', weights, k=5) == expected
@@ -0,0 +1,68 @@
+import os
+import sys
+
+# Make src/PlayGame importable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'PlayGame'))
+
+import corpus_snapshot
+
+
+def _write(path, rows):
+    path.write_text('\n'.join(rows) + '\n')
+
+
+def test_snapshot_round_trips_fields(tmp_path):
+    puzzles = tmp_path / 'puzzles'
+    puzzles.mkdir()
+    _write(puzzles / 'valid.csv', [
+        "DON'T STOP,Phrase,1/1/06 (#1),R1",
+        'FISH &amp; CHIPS,Food &amp; Drink,1/2/06 (#2),BR',
+    ])
+    _write(tmp_path / 'bonus_puzzles.txt', ['ARCTIC CIRCLE', '', 'magnetic field'])
+
+    snapshot = corpus_snapshot.load_snapshot(puzzles)
+    assert len(snapshot) == 4
+    rows = snapshot.source_rows(puzzles / 'valid.csv')
+    assert [snapshot.record(i) for i in rows] == [
+        ("DON'T STOP", 'Phrase', '1/1/06 (#1)', 'R1'),
+        ('FISH &amp; CHIPS', 'Food &amp; Drink', '1/2/06 (#2)', 'BR'),
+    ]
+    assert [snapshot.puzzle_norm(i) for i in rows] == ['DONT STOP', 'FISH AMP CHIPS']
+    bonus = snapshot.source_rows(tmp_path / 'bonus_puzzles.txt')
+    assert [snapshot.puzzle(i) for i in bonus] == ['ARCTIC CIRCLE', 'magnetic field']
+    assert snapshot.source_rows(tmp_path / 'other.txt') is None
+
+
+def test_snapshot_rebuilds_when_a_source_changes(tmp_path):
+    _write(tmp_path / 'valid.csv', ['DOOR HINGE,Around the House,4/14/06 (#4445),BR'])
+    first = corpus_snapshot.load_snapshot(tmp_path)
+    assert corpus_snapshot.load_snapshot(tmp_path) is first
+
+    # Same contents with a new mtime keeps the snapshot
+    os.utime(tmp_path / 'valid.csv', ns=(0, 0))
+    assert not first.is_stale()
+
+    _write(tmp_path / 'valid.csv', ['POOR THING,Phrase,4/14/06 (#4445),R1'])
+    os.utime(tmp_path / 'valid.csv', ns=(1, 1))
+    second = corpus_snapshot.load_snapshot(tmp_path)
+    assert second is not first
+    assert second.puzzle(0) == 'POOR THING'
+
+
+def test_touched_sources_are_recorded_so_later_loads_skip_hashing(tmp_path, monkeypatch):
+    _write(tmp_path / 'valid.csv', ['DOOR HINGE,Around the House,4/14/06 (#4445),BR'])
+    first = corpus_snapshot.load_snapshot(tmp_path)
+    os.utime(tmp_path / 'valid.csv', ns=(0, 0))
+    second = corpus_snapshot.load_snapshot(tmp_path)
+    assert second is not first and second.sources[0]['mtime_ns'] == 0
+
+    def no_hashing(path):
+        raise AssertionError(f"re-hashed {path}")
+
+    monkeypatch.setattr(corpus_snapshot, '_sha256', no_hashing)
+    assert corpus_snapshot.load_snapshot(tmp_path) is second
+
+
+def test_crlf_sources_keep_clean_round_fields(tmp_path):
+    (tmp_path / 'valid.csv').write_bytes(b'DOOR HINGE,Around the House,4/14/06 (#4445),BR\r\n')
+    assert corpus_snapshot.load_snapshot(tmp_path).record(0)[3] == 'BR'
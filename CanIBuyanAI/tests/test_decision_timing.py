@@ -0,0 +1,40 @@
+import os
+import sys
+
+# Make src/PlayGame importable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'PlayGame'))
+
+import decision_timing
+import smart_decision
+from decision_timing import LatencyHistogram, LatencyRecorder, recording, timed
+
+
+def test_phases_are_timed_only_while_recording():
+    recorder = LatencyRecorder()
+    smart_decision.estimate_solution_distribution('T_E _U_C_', ['T', 'E', 'C'])
+    assert recorder.timings == {}
+
+    with recording(recorder):
+        with timed('player:smart'):
+            smart_decision.estimate_solution_distribution('T_E _U_C_', ['T', 'E', 'C'])
+    assert decision_timing.current_recorder() is None
+    assert {'player:smart', 'estimate_solution_distribution', '_synthesize_from_dictionary'} <= set(recorder.timings)
+    outer = recorder.timings['player:smart']['wall_ms']
+    inner = recorder.timings['estimate_solution_distribution']['wall_ms']
+    assert outer.count == inner.count == 1 and outer.total >= inner.total
+
+
+def test_histograms_merge_and_round_trip_through_json():
+    first, second = LatencyRecorder(), LatencyRecorder()
+    for ms in (0.004, 0.3, 2.5):
+        first.record('should_solve_now', ms, ms / 2)
+    second.record('should_solve_now', 700.0, 650.0)
+    first.merge(second)
+
+    wall = first.timings['should_solve_now']['wall_ms']
+    assert wall.count == 4 and wall.max == 700.0 and sum(wall.buckets) == 4
+    assert wall.percentile(0.5) == 0.5 and wall.percentile(1.0) == 700.0
+
+    again = LatencyRecorder.from_json(first.to_json())
+    assert again.to_json() == first.to_json()
+    assert LatencyHistogram().percentile(0.5) == 0.0
@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+from collections import Counter
+
+# Make src/PlayGame importable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'PlayGame'))
+
+import puzzle_sampler
+
+ROWS = [
+    'DOOR HINGE,Around the House,4/14/06 (#4445),R1',
+    'FISH &amp; CHIPS,Food &amp; Drink,1/2/06 (#2),BR',
+    'POOR THING,Phrase,4/14/06 (#4445),R1',
+    'ICE CREAM SUNDAE,Food &amp; Drink,4/15/06 (#4446),T1',
+    'A,Thing,4/16/06 (#4447)',
+]
+
+
+def _sampler(tmp_path):
+    puzzles = tmp_path / 'puzzles'
+    puzzles.mkdir()
+    (puzzles / 'valid.csv').write_text('\n'.join(ROWS) + '\n')
+    return puzzle_sampler.PuzzleSampler('valid', puzzles)
+
+
+def test_loads_complete_rows_and_filters(tmp_path):
+    sampler = _sampler(tmp_path)
+    assert len(sampler) == 4
+    assert sampler.at(1) == ('FISH & CHIPS', 'Food & Drink', '1/2/06 (#2)', 'BR')
+    assert [p for p, _, _, _ in sampler.sweep(round='R1')] == ['DOOR HINGE', 'POOR THING']
+    assert [p for p, _, _, _ in sampler.sweep(category='Food & Drink', words=3)] == ['ICE CREAM SUNDAE']
+    assert [p for p, _, _, _ in sampler.sweep(length=9)] == ['DOOR HINGE', 'FISH & CHIPS', 'POOR THING']
+    try:
+        sampler.sample(round='R5')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected a ValueError for an empty filter')
+
+
+def test_seeded_draws_and_draws_without_replacement(tmp_path):
+    sampler = _sampler(tmp_path)
+    first = [sampler.sample(random.Random(3)) for _ in range(5)]
+    assert first == [sampler.sample(random.Random(3)) for _ in range(5)]
+
+    rng = random.Random(0)
+    once_each = [sampler.sample(rng, replace=False)[0] for _ in range(4)]
+    assert sorted(once_each) == sorted(p for p, _, _, _ in sampler.sweep())
+
+
+def test_stratified_draws_weight_strata_equally(tmp_path):
+    sampler = _sampler(tmp_path)
+    rng = random.Random(1)
+    rounds = Counter(sampler.sample(rng, stratify_by='round')[3] for _ in range(3000))
+    assert set(rounds) == {'R1', 'BR', 'T1'}
+    assert all(900 < count < 1100 for count in rounds.values())
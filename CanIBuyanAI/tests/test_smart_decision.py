@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Make src/PlayGame importable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'PlayGame'))
+
+import corpus_index
+import smart_decision
+
+
+def test_letter_model_numpy_path_matches_loop(tmp_path, monkeypatch):
+    (tmp_path / 'valid.csv').write_text('\n'.join([
+        'DOOR HINGE,Around the House,4/14/06 (#4445),BR',
+        'POOR THING,Phrase,4/14/06 (#4445),R1',
+        'GOOD THING,Phrase,4/14/06 (#4445),R1',
+        'MOOD RINGS,Thing,4/14/06 (#4445),R2',
+    ]) + '\n')
+    index = corpus_index.CorpusIndex(data_dir=tmp_path, puzzle_files=['valid.csv'])
+    showing = '_OO_ _____'
+    guessed = ['O', 'E']
+
+    def model():
+        candidates = corpus_index.CandidateSet(showing, guessed, corpus=index)
+        return smart_decision.build_letter_probability_model(showing, guessed, candidates=candidates)
+
+    vectorized = model()
+    monkeypatch.setattr(smart_decision, 'NUMPY_AVAILABLE', False)
+    looped = model()
+
+    # best_info_* break ties by set iteration order in the loop, so skip them
+    for key in vectorized:
+        if not key.startswith('best_info'):
+            assert vectorized[key] == looped[key], key
+    assert list(vectorized['expected_reveals']) == list(looped['expected_reveals'])
+    assert vectorized['candidate_count'] == 3
+    assert vectorized['prob_any']['G'] == 1.0
+    assert vectorized['expected_reveals']['N'] == 1.0
+    assert 'E' not in vectorized['prob_any']
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Wheel of Fortune Backend Server (ASGI)
+The routes of ``backend.py`` served by an async server such as uvicorn.
+
+Every request still goes through the Flask app, so routes, responses and the
+``Server-Timing`` header are exactly those of ``python backend.py``. What
+changes is who waits where:
+
+- The event loop holds the connections, so idle keep-alive clients and slow
+  uploads cost no thread.
+- Solver, move and puzzle routes run on a small bounded thread pool
+  (``SOLVER_THREADS``). The solver is in-process and CPU bound, so a few
+  threads sharing the warm indexes beat one thread per client.
+- Commentary routes, which may wait seconds on ChatGPT, have a pool of their
+  own (``COMMENTARY_THREADS``), so a slow host never holds up a move.
+- Request bodies are capped at ``MAX_BODY_BYTES`` (Flask's
+  ``MAX_CONTENT_LENGTH`` if set) and answered with a 413 beyond it, since the
+  loop buffers them before any thread sees them. Websockets are refused.
+
+Usage:
+    pip install uvicorn
+    python asgi.py --port 8083
+    uvicorn asgi:app --port 8083
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import backend
+
+SOLVER_THREADS = int(os.environ.get('WOF_SOLVER_THREADS', 4))
+COMMENTARY_THREADS = int(os.environ.get('WOF_COMMENTARY_THREADS', 32))
+MAX_BODY_BYTES = int(os.environ.get('WOF_MAX_BODY_BYTES', backend.app.config.get('MAX_CONTENT_LENGTH') or 1 << 20))
+
+# Routes that wait on an outside service rather than the CPU
+SLOW_ROUTES = ('/api/commentary',)
+
+SOLVER_POOL = ThreadPoolExecutor(SOLVER_THREADS, thread_name_prefix='solver')
+COMMENTARY_POOL = ThreadPoolExecutor(COMMENTARY_THREADS, thread_name_prefix='commentary')
+
+
+def wsgi_environ(scope, body):
+    """The WSGI environ of an ASGI HTTP request."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name, value = name.decode('latin-1'), value.decode('latin-1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'content-length':
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def call_flask(scope, body):
+    """Run one request through the Flask app; returns ``(status, headers, body)``."""
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+    chunks = backend.app.wsgi_app(wsgi_environ(scope, body), start_response)
+    try:
+        content = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return response['status'], response['headers'], content
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Importing backend built the indexes, so the server starts warm
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            SOLVER_POOL.shutdown(wait=False)
+            COMMENTARY_POOL.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] == 'websocket':
+        await receive()  # websocket.connect
+        await send({'type': 'websocket.close'})
+        return
+    if scope['type'] != 'http':
+        raise NotImplementedError(f"Unsupported ASGI scope {scope['type']!r}")
+
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+        chunks.append(message.get('body', b''))
+        size += len(chunks[-1])
+        if size > MAX_BODY_BYTES:
+            await send({'type': 'http.response.start', 'status': 413,
+                        'headers': [(b'content-type', b'application/json'), (b'connection', b'close')]})
+            await send({'type': 'http.response.body',
+                        'body': json.dumps({'error': f"Request body is over {MAX_BODY_BYTES} bytes"}).encode()})
+            return
+        if not message.get('more_body'):
+            break
+    body = b''.join(chunks)
+
+    pool = COMMENTARY_POOL if scope['path'].startswith(SLOW_ROUTES) else SOLVER_POOL
+    status, headers, content = await asyncio.get_running_loop().run_in_executor(pool, call_flask, scope, body)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': content})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the backend over ASGI with uvicorn.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8083)
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("uvicorn is not installed; install it with: pip install uvicorn")
+        return 1
+    print(f"Loaded {len(backend.PUZZLES)} puzzles from CSV data")
+    print(f"Solver index: {len(backend.SOLUTION_INDEX)} puzzles")
+    print(f"Starting Wheel of Fortune backend server (ASGI, {SOLVER_THREADS} solver threads)...")
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,57 +4,75 @@ Wheel of Fortune Backend Server
 Serves puzzle data and handles AI player logic
 """
 
-import csv
 import json
 import random
-import re
-from flask import Flask, jsonify, request, send_from_directory
+import threading
+import time
+from flask import Flask, g, jsonify, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.exceptions import BadRequest, NotFound
 import os
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from src.PlayGame.chatgpt_wrapper import ChatGPTWrapper
+from src.PlayGame.decision_timing import LatencyRecorder
+from src.game_sessions import GameSession, SessionStore
+from src.puzzle_store import FILTER_FIELDS, MAX_PHRASE_LENGTH, PuzzleStore
+from src.solution_index import get_solution_index
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+PUZZLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'puzzles')
+
+# Fallback puzzles if the CSVs don't exist
+FALLBACK_PUZZLES = [
+    {"phrase": "WHEEL OF FORTUNE", "category": "TV SHOW"},
+    {"phrase": "GOOD LUCK", "category": "PHRASE"},
+    {"phrase": "HAPPY BIRTHDAY", "category": "EVENT"}
+]
+
 # Load puzzle data
 def load_puzzles():
-    puzzles = []
-    puzzle_file = os.path.join('data', 'puzzles', 'valid.csv')
-    
-    if not os.path.exists(puzzle_file):
-        # Fallback puzzles if CSV doesn't exist
-        return [
-            {"phrase": "WHEEL OF FORTUNE", "category": "TV SHOW"},
-            {"phrase": "GOOD LUCK", "category": "PHRASE"},
-            {"phrase": "HAPPY BIRTHDAY", "category": "EVENT"}
-        ]
+    """Every puzzle of the corpus the board can show, indexed for filtered draws"""
+    if not os.path.exists(os.path.join(PUZZLES_DIR, 'valid.csv')):
+        return PuzzleStore(FALLBACK_PUZZLES)
     
     try:
-        with open(puzzle_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) >= 2:
-                    phrase = row[0].strip().upper()
-                    category = row[1].strip().upper()
-                    # Only include puzzles with letters (no numbers/symbols)
-                    if re.match(r'^[A-Z\s&\'-]+$', phrase) and len(phrase) <= 50:
-                        puzzles.append({
-                            "phrase": phrase,
-                            "category": category
-                        })
+        return PuzzleStore.from_corpus(PUZZLES_DIR)
     except Exception as e:
         print(f"Error loading puzzles: {e}")
-        # Return fallback puzzles
-        return [
-            {"phrase": "WHEEL OF FORTUNE", "category": "TV SHOW"},
-            {"phrase": "GOOD LUCK", "category": "PHRASE"},
-            {"phrase": "HAPPY BIRTHDAY", "category": "EVENT"}
-        ]
-    
-    return puzzles[:500]  # Limit to first 500 puzzles for performance
+        return PuzzleStore(FALLBACK_PUZZLES)
 
 # Global puzzle data
 PUZZLES = load_puzzles()
 
+# Solver index, built once here so no request pays for it
+SOLUTION_INDEX = get_solution_index()
+
+# Games in progress, for clients that send only each turn's event
+SESSIONS = SessionStore()
+
+# Most game states one batch request may carry
+MAX_BATCH = 1000
+
+# Most ranked solutions one solve request may ask for
+MAX_SOLUTIONS = 50
+
+# Wall and CPU time of every API request, by route
+LATENCY = LatencyRecorder()
+_LATENCY_LOCK = threading.Lock()
+
+# Host commentary, from ChatGPT when OPENAI_API_KEY is set (else templates); created on first use
+COMMENTARY = None
+_COMMENTARY_LOCK = threading.Lock()
+
 # AI Player Strategies
 class AIPlayer:
     def __init__(self, strategy='morse'):
@@ -65,8 +83,8 @@ class AIPlayer:
             'alphabetical': "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
         }
     
-    def get_next_guess(self, revealed_letters, used_letters, current_money, puzzle_category):
-        """Get the next letter guess from AI player"""
+    def get_next_guess(self, revealed_letters, used_letters, current_money, puzzle_category, candidates=None):
+        """Get the next letter guess from AI player (``candidates``: the game's CandidateSet, if it has one)"""
         alphabet = self.alphabet_orders.get(self.strategy, self.alphabet_orders['morse'])
         vowels = "AEIOU"
         
@@ -83,15 +101,94 @@ class AIPlayer:
                 return {'action': 'guess_consonant', 'letter': letter}
         
         # If no letters left, try to solve
-        return {'action': 'solve', 'solution': self._attempt_solve(revealed_letters, puzzle_category)}
+        return {'action': 'solve',
+                'solution': self._attempt_solve(revealed_letters, puzzle_category, used_letters, candidates)}
     
-    def _attempt_solve(self, revealed_letters, category):
+    def _attempt_solve(self, revealed_letters, category, used_letters=(), candidates=None):
         """Attempt to solve the puzzle based on revealed letters"""
-        # Simple pattern matching - in a real implementation, this would be more sophisticated
-        pattern = ''.join(revealed_letters).replace('_', '.')
-        
-        # For now, return a placeholder - this would need more advanced logic
-        return "PLACEHOLDER SOLUTION"
+        return SOLUTION_INDEX.solve(revealed_letters, used_letters, category, candidates=candidates)['solution']
+
+# One player per strategy; they hold no per-game state
+AI_PLAYERS = {}
+
+def ai_player(strategy):
+    """The shared AI player for a strategy (unknown strategies play morse)"""
+    if strategy not in AIPlayer().alphabet_orders:
+        strategy = 'morse'
+    if strategy not in AI_PLAYERS:
+        AI_PLAYERS[strategy] = AIPlayer(strategy)
+    return AI_PLAYERS[strategy]
+
+def batch_next_guesses(states):
+    """
+    ``get_next_guess`` for many game states at once.
+    
+    Each player takes the first letter of its alphabet that is unused and,
+    for a vowel, affordable; with NumPy that is one masked argmax per
+    strategy over a states x letters matrix. States with no letter left are
+    solved, each distinct board once.
+    """
+    players = [ai_player(state.get('strategy', 'morse')) for state in states]
+    used = [state.get('used_letters') or [] for state in states]
+    money = [state.get('current_money') or 0 for state in states]
+    letters = [None] * len(states)
+    
+    if NUMPY_AVAILABLE and states:
+        alphabet = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+        is_vowel = np.isin(alphabet, list("AEIOU"))
+        taken = np.zeros((len(states), 26), dtype=bool)
+        for row, letters_used in enumerate(used):
+            columns = [ord(letter) - 65 for letter in letters_used if len(letter) == 1 and 'A' <= letter <= 'Z']
+            taken[row, columns] = True
+        allowed = ~taken & (~is_vowel | (np.array(money) >= 250)[:, None])
+        by_strategy = {}
+        for row, player in enumerate(players):
+            by_strategy.setdefault(player.strategy, []).append(row)
+        for strategy, rows in by_strategy.items():
+            order = np.array([ord(letter) - 65 for letter in players[rows[0]].alphabet_orders[strategy]])
+            candidates = allowed[rows][:, order]
+            first = candidates.argmax(axis=1)
+            found = candidates[np.arange(len(rows)), first]
+            for row, position, ok in zip(rows, first.tolist(), found.tolist()):
+                if ok:
+                    letters[row] = alphabet[order[position]]
+    else:
+        for row, player in enumerate(players):
+            for letter in player.alphabet_orders[player.strategy]:
+                if letter not in used[row] and (letter not in "AEIOU" or money[row] >= 250):
+                    letters[row] = letter
+                    break
+    
+    moves = []
+    solutions = {}
+    for state, player, letter, letters_used in zip(states, players, letters, used):
+        if letter is not None:
+            moves.append({'action': 'buy_vowel' if letter in "AEIOU" else 'guess_consonant', 'letter': str(letter)})
+            continue
+        revealed = state.get('revealed_letters') or []
+        category = state.get('puzzle_category', '')
+        board = (tuple(revealed), frozenset(letters_used), category)
+        if board not in solutions:
+            solutions[board] = player._attempt_solve(revealed, category, letters_used)
+        moves.append({'action': 'solve', 'solution': solutions[board]})
+    return moves
+
+# Request timing
+@app.before_request
+def start_timer():
+    g.request_start = (time.perf_counter(), time.thread_time())
+
+@app.after_request
+def record_timing(response):
+    """Record each API request's time and report it in a Server-Timing header"""
+    if request.path.startswith('/api/') and 'request_start' in g:
+        wall, cpu = g.request_start
+        wall_ms = (time.perf_counter() - wall) * 1000
+        cpu_ms = (time.thread_time() - cpu) * 1000
+        with _LATENCY_LOCK:
+            LATENCY.record(f"route:{request.url_rule.rule if request.url_rule else request.path}", wall_ms, cpu_ms)
+        response.headers['Server-Timing'] = f"app;dur={wall_ms:.3f}, cpu;dur={cpu_ms:.3f}"
+    return response
 
 # Routes
 @app.route('/')
@@ -102,16 +199,75 @@ def index():
 def serve_static(filename):
     return send_from_directory('.', filename)
 
+def int_arg(name, default=None):
+    """An integer query string argument"""
+    value = request.args.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+
+def puzzle_filters():
+    """
+    Puzzle filters from the query string: category, round, length and words,
+    each repeatable; length and words also take ranges like ``10-20``
+    """
+    filters = {}
+    for field in FILTER_FIELDS:
+        given = request.args.getlist(field)
+        if not given:
+            continue
+        values = []
+        for value in given:
+            if field in ('length', 'words'):
+                try:
+                    low, _, high = value.partition('-')
+                    low, high = int(low), int(high or low)
+                except ValueError:
+                    raise BadRequest(f"{field} must be a number or a range like 10-20")
+                if low > high:
+                    raise BadRequest(f"{field} range {value} is inverted")
+                # Out of range values are kept as an empty filter, which matches nothing
+                values.extend(range(low, min(high, MAX_PHRASE_LENGTH) + 1))
+            else:
+                values.append(value)
+        filters[field] = values
+    return filters
+
+@app.errorhandler(BadRequest)
+@app.errorhandler(NotFound)
+def api_error(error):
+    if not request.path.startswith('/api/'):
+        return error
+    return jsonify({'error': error.description}), error.code
+
+@app.route('/api/puzzles')
+def list_puzzles():
+    """List puzzles matching the filters, a page at a time"""
+    limit = min(max(int_arg('limit', 50), 1), 200)
+    filters = puzzle_filters()
+    puzzles, next_cursor = PUZZLES.page(int_arg('cursor'), limit, **filters)
+    return jsonify({'puzzles': puzzles, 'next_cursor': next_cursor, 'count': PUZZLES.count(**filters)})
+
 @app.route('/api/puzzles/random')
 def get_random_puzzle():
-    """Get a random puzzle"""
-    puzzle = random.choice(PUZZLES)
+    """Get a random puzzle matching the filters"""
+    puzzle = PUZZLES.random(**puzzle_filters())
+    if puzzle is None:
+        return jsonify({'error': 'No puzzles match those filters'}), 404
     return jsonify(puzzle)
 
 @app.route('/api/puzzles/count')
 def get_puzzle_count():
-    """Get total number of available puzzles"""
-    return jsonify({'count': len(PUZZLES)})
+    """Get the number of puzzles matching the filters"""
+    return jsonify({'count': PUZZLES.count(**puzzle_filters())})
+
+@app.route('/api/puzzles/facets')
+def get_puzzle_facets():
+    """Get the puzzle count of every category and round type"""
+    return jsonify({'category': PUZZLES.values('category'), 'round': PUZZLES.values('round')})
 
 @app.route('/api/ai/move', methods=['POST'])
 def get_ai_move():
@@ -124,11 +280,117 @@ def get_ai_move():
     current_money = data.get('current_money', 0)
     puzzle_category = data.get('puzzle_category', '')
     
-    ai_player = AIPlayer(strategy)
-    move = ai_player.get_next_guess(revealed_letters, used_letters, current_money, puzzle_category)
+    move = ai_player(strategy).get_next_guess(revealed_letters, used_letters, current_money, puzzle_category)
+    
+    return jsonify(move)
+
+@app.route('/api/ai/moves:batch', methods=['POST'])
+def get_ai_moves_batch():
+    """Get the next move of every game state in ``states``, in order"""
+    data = request.json or {}
+    states = data.get('states')
+    if not isinstance(states, list) or not all(isinstance(state, dict) for state in states):
+        raise BadRequest("states must be a list of game states")
+    if len(states) > MAX_BATCH:
+        raise BadRequest(f"At most {MAX_BATCH} states per batch")
+    
+    return jsonify({'moves': batch_next_guesses(states)})
+
+def open_session(session_id):
+    session = SESSIONS.get(session_id)
+    if session is None:
+        raise NotFound("No such session (it may have expired)")
+    return session
+
+def apply_event(session, event):
+    """Apply a ``{'letter': 'T', 'positions': [0, 5]}`` event to a session"""
+    try:
+        session.apply(event.get('letter'), event.get('positions', []))
+    except (AttributeError, ValueError) as e:
+        raise BadRequest(f"Bad event: {e}")
+
+@app.route('/api/sessions', methods=['POST'])
+def create_session():
+    """Start a server-side game from its board, letters used so far and category"""
+    data = request.json
+    
+    session = GameSession(data.get('revealed_letters', []), data.get('used_letters', []),
+                          data.get('puzzle_category', ''), SOLUTION_INDEX)
+    session_id = SESSIONS.create(session)
+    
+    return jsonify(dict(session.to_json(), session_id=session_id, ttl=SESSIONS.ttl)), 201
+
+@app.route('/api/sessions/<session_id>', methods=['GET', 'DELETE'])
+def session_state(session_id):
+    """Get a game's state, or end the game"""
+    if request.method == 'DELETE':
+        if not SESSIONS.close(session_id):
+            raise NotFound("No such session (it may have expired)")
+        return jsonify({'closed': session_id})
+    session = open_session(session_id)
+    with session.lock:
+        return jsonify(session.to_json())
+
+@app.route('/api/sessions/<session_id>/events', methods=['POST'])
+def post_session_event(session_id):
+    """Record the latest letter called: ``{'letter': 'T', 'positions': [0, 5]}`` (no positions for a miss)"""
+    session = open_session(session_id)
+    with session.lock:
+        apply_event(session, request.json or {})
+        return jsonify({'candidate_count': len(session.candidates), 'events': session.events})
+
+@app.route('/api/sessions/<session_id>/move', methods=['POST'])
+def get_session_move(session_id):
+    """Get AI player's next move in a session, after applying the latest ``event`` if one is sent"""
+    data = request.json or {}
+    session = open_session(session_id)
+    with session.lock:
+        if data.get('event'):
+            apply_event(session, data['event'])
+        move = ai_player(data.get('strategy', 'morse')).get_next_guess(
+            session.revealed_letters, session.used_letters, data.get('current_money', 0),
+            session.puzzle_category, session.candidates)
     
     return jsonify(move)
 
+@app.route('/api/ai/solve', methods=['POST'])
+def solve_puzzle():
+    """Get the most probable solution of a board"""
+    data = request.json
+    top_n = data.get('top_n', 5)
+    if not isinstance(top_n, int) or isinstance(top_n, bool):
+        raise BadRequest("top_n must be an integer")
+    
+    result = SOLUTION_INDEX.solve(data.get('revealed_letters', []), data.get('used_letters', []),
+                                  data.get('puzzle_category', ''), top_n=min(max(top_n, 1), MAX_SOLUTIONS))
+    
+    return jsonify(result)
+
+def commentary_host():
+    global COMMENTARY
+    with _COMMENTARY_LOCK:
+        if COMMENTARY is None:
+            COMMENTARY = ChatGPTWrapper()
+        return COMMENTARY
+
+@app.route('/api/commentary', methods=['POST'])
+def get_commentary():
+    """Get the host's commentary on a game action (may wait seconds on ChatGPT)"""
+    data = request.json or {}
+    action = data.get('action')
+    if not isinstance(action, dict):
+        raise BadRequest("Expected {\"action\": {\"type\": ..., \"details\": ...}}")
+    
+    commentary = commentary_host().generate_pat_sajak_commentary(action, data.get('player_name', 'our contestant'))
+    
+    return jsonify({'commentary': commentary})
+
+@app.route('/api/stats/latency')
+def get_latency_stats():
+    """Per-route request latency and CPU histograms"""
+    with _LATENCY_LOCK:
+        return jsonify(LATENCY.to_json())
+
 @app.route('/api/wheel/spin')
 def spin_wheel():
     """Simulate wheel spin"""
@@ -148,5 +410,6 @@ def spin_wheel():
 
 if __name__ == '__main__':
     print(f"Loaded {len(PUZZLES)} puzzles from CSV data")
+    print(f"Solver index: {len(SOLUTION_INDEX)} puzzles")
     print("Starting Wheel of Fortune backend server...")
     app.run(host='0.0.0.0', port=8083, debug=True)
\ No newline at end of file
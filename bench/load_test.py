@@ -0,0 +1,227 @@
+"""
+Load Test for the Backend API
+Hammers a running backend with concurrent clients, each on its own
+keep-alive connection, and reports throughput and latency percentiles as
+seen by the clients, along with the server's own time per request (from the
+``Server-Timing`` header).
+
+Requests are built from the same seeded boards as ``run_bench.py``.
+
+With ``--serve`` it starts the backend itself instead, once per way of serving
+it (the Flask threaded server or the ASGI app under uvicorn), and runs the
+same load against each in turn.
+
+Usage:
+    python bench/load_test.py --serve flask --serve asgi --clients 128 --requests 4000
+    python backend.py &                                   # then, once it is up:
+    python bench/load_test.py --clients 32 --requests 5000
+    python bench/load_test.py --route /api/ai/move --clients 100 --url http://127.0.0.1:8083
+    python bench/load_test.py --route /api/ai/moves:batch --batch 100     # 100 moves per request
+"""
+
+import argparse
+import http.client
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run_bench import make_boards
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Ways to serve the backend, each a command line given the port
+SERVERS: Dict[str, Callable[[int], List[str]]] = {
+    'flask': lambda port: [sys.executable, '-c',
+                           f"import backend; backend.app.run(host='127.0.0.1', port={port}, threaded=True)"],
+    'asgi': lambda port: [sys.executable, 'asgi.py', '--host', '127.0.0.1', '--port', str(port)],
+}
+
+_SERVER_TIMING = re.compile(r'(\w+);dur=([\d.]+)')
+
+
+def _board_payload(board: Dict[str, Any]) -> Dict[str, Any]:
+    return {'revealed_letters': list(board['showing']), 'used_letters': board['previous_guesses'],
+            'current_money': board['scores'][0], 'puzzle_category': board['category'], 'strategy': 'morse'}
+
+
+# Request body builders by route; each takes the boards of one request
+PAYLOADS: Dict[str, Callable[[List[Dict[str, Any]]], Any]] = {
+    '/api/ai/solve': lambda boards: _board_payload(boards[0]),
+    '/api/ai/move': lambda boards: _board_payload(boards[0]),
+    '/api/ai/moves:batch': lambda boards: {'states': [_board_payload(board) for board in boards]},
+}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def request_bodies(route: str, boards: List[Dict[str, Any]], batch: int = 1) -> List[bytes]:
+    """JSON bodies for ``route``, each carrying ``batch`` boards (only the batch route takes more than one)."""
+    if route != '/api/ai/moves:batch':
+        batch = 1
+    groups = [boards[start:start + batch] for start in range(0, len(boards), batch)]
+    return [json.dumps(PAYLOADS[route](group)).encode() for group in groups if len(group) == batch]
+
+
+@contextmanager
+def serve(server: str, port: int, startup: float = 120.0):
+    """Run the backend the ``server`` way on ``port`` for the block, yielding its URL once it answers."""
+    process = subprocess.Popen(SERVERS[server](port), cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + startup
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"The {server} server exited with code {process.returncode}")
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            try:
+                connection.request('GET', '/api/puzzles/count')
+                if connection.getresponse().status == 200:
+                    break
+            except (OSError, http.client.HTTPException):
+                pass
+            finally:
+                connection.close()
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"The {server} server did not start within {startup:.0f}s")
+            time.sleep(0.25)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def run_load(url: str, route: str, bodies: List[bytes], clients: int, requests: int,
+             timeout: float = 30.0, batch: int = 1) -> Dict[str, Any]:
+    """
+    Send ``requests`` POSTs of ``bodies`` (round robin) to ``url + route``
+    from ``clients`` threads, and summarize what they saw. ``batch`` is the
+    number of moves each body asks for.
+    """
+    target = urlsplit(url)
+    latencies: List[float] = []
+    server_ms: List[float] = []
+    errors = [0]
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    start_line = threading.Barrier(clients + 1)
+
+    def client():
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+        mine, my_server = [], []
+        start_line.wait()
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                break
+            sent = time.perf_counter()
+            try:
+                connection.request('POST', route, bodies[n % len(bodies)], {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+                timing = dict(_SERVER_TIMING.findall(response.getheader('Server-Timing') or ''))
+            except (OSError, http.client.HTTPException):
+                ok, timing = False, {}
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+            if ok:
+                mine.append((time.perf_counter() - sent) * 1000)
+                if 'app' in timing:
+                    my_server.append(float(timing['app']))
+            else:
+                with lock:
+                    errors[0] += 1
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+            server_ms.extend(my_server)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    start_line.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    return {
+        'route': route,
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'moves_per_sec': len(latencies) * batch / elapsed if elapsed else 0.0,
+        'p50_ms': _percentile(latencies, 0.5),
+        'p95_ms': _percentile(latencies, 0.95),
+        'p99_ms': _percentile(latencies, 0.99),
+        'max_ms': max(latencies, default=0.0),
+        'server_mean_ms': sum(server_ms) / len(server_ms) if server_ms else None,
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    line = f"{result['serving']:6} " if 'serving' in result else ''
+    line += (f"{result['route']:16} {result['clients']:4d} clients | {result['requests_per_sec']:9,.1f} req/s | "
+            f"p50 {result['p50_ms']:7.2f}ms p95 {result['p95_ms']:7.2f}ms p99 {result['p99_ms']:7.2f}ms "
+            f"max {result['max_ms']:7.2f}ms | {result['errors']} errors")
+    if result['moves_per_sec'] != result['requests_per_sec']:
+        line += f" | {result['moves_per_sec']:,.0f} moves/s"
+    if result['server_mean_ms'] is not None:
+        line += f" | server {result['server_mean_ms']:.2f}ms/req"
+    return line
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test a running backend.")
+    parser.add_argument('--url', default='http://127.0.0.1:8083', help="backend base URL")
+    parser.add_argument('--serve', action='append', choices=sorted(SERVERS), default=None,
+                        help="start the backend this way instead of using --url; repeat to compare")
+    parser.add_argument('--port', type=int, default=8093, help="port for the backends --serve starts")
+    parser.add_argument('--route', default='/api/ai/solve', choices=sorted(PAYLOADS))
+    parser.add_argument('--clients', type=int, action='append', default=None,
+                        help="concurrent clients (default: 32); repeat to try several")
+    parser.add_argument('--requests', type=int, default=2000, help="requests per run")
+    parser.add_argument('--batch', type=int, default=100, help="game states per request on the batch route")
+    parser.add_argument('--boards', type=int, default=100, help="puzzles to sample (each at three stages)")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--json', default=None, help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    boards = make_boards(args.boards, args.seed)
+    batch = args.batch if args.route == '/api/ai/moves:batch' else 1
+    if batch > len(boards):
+        parser.error(f"--batch is larger than the {len(boards)} boards sampled")
+    bodies = request_bodies(args.route, boards, batch)
+    results = []
+    for server in args.serve or [None]:
+        with (serve(server, args.port) if server else nullcontext(args.url)) as url:
+            for clients in args.clients or [32]:
+                results.append(run_load(url, args.route, bodies, clients, args.requests, batch=batch))
+                if server:
+                    results[-1]['serving'] = server
+                print(format_result(results[-1]))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(result['errors'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
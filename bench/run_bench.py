@@ -0,0 +1,207 @@
+"""
+Benchmarks for the Decision and Solver Hot Paths
+Times the functions every AI move goes through on a fixed, seeded set of
+boards drawn from data/puzzles/test.csv, each at an early, mid and late
+stage of reveal, and checks the results against a stored baseline.
+
+For every benchmark it reports operations per second and the peak memory
+allocated during one pass over the boards (via ``tracemalloc``). A benchmark
+regresses when its speed drops, or its peak memory grows, by more than the
+tolerance.
+
+Usage:
+    python bench/run_bench.py                    # compare with bench/baseline.json
+    python bench/run_bench.py --save-baseline    # record a new baseline
+    python bench/run_bench.py --only should_solve_now --boards 20
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src' / 'PlayGame'))
+sys.path.insert(0, str(ROOT / 'src' / 'Simulations'))
+
+BASELINE_FILE = Path(__file__).resolve().parent / 'baseline.json'
+BONUS_PUZZLES = ROOT / 'data' / 'bonus_puzzles.txt'
+
+# Share of each puzzle's distinct letters already called at each stage
+STAGES = {'early': 0.2, 'mid': 0.5, 'late': 0.8}
+
+
+def make_boards(count: int = 30, seed: int = 2024, split: str = 'test') -> List[Dict[str, Any]]:
+    """
+    ``count`` seeded puzzles, each as an early, mid and late board: the
+    showing, the called letters (hits plus a few misses) and scores.
+    """
+    from puzzle_sampler import PuzzleSampler
+
+    rng = random.Random(seed)
+    sampler = PuzzleSampler(split)
+    boards = []
+    for puzzle, clue, _, round_type in sampler.sweep(rng, shuffle=True):
+        letters = sorted({ch for ch in puzzle if ch.isalpha()})
+        if len(letters) < 4:
+            continue
+        misses = [ch for ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZ" if ch not in letters]
+        for stage, share in STAGES.items():
+            called = rng.sample(letters, max(1, round(len(letters) * share)))
+            called += rng.sample(misses, min(len(misses), rng.randint(0, 3)))
+            boards.append({
+                'stage': stage,
+                'puzzle': puzzle,
+                'category': clue,
+                'round': round_type,
+                'previous_guesses': called,
+                'showing': ''.join(ch if not ch.isalpha() or ch in called else '_' for ch in puzzle),
+                'scores': [rng.randrange(0, 3000, 50) for _ in range(3)],
+            })
+        if len(boards) >= count * len(STAGES):
+            break
+    return boards
+
+
+def _load_module(name: str, path: Path):
+    """Import a file under its own name (both trees have a ``smart_decision``)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_benchmarks(boards: List[Dict[str, Any]]) -> Dict[str, Tuple[Callable[[Dict[str, Any]], Any], List]]:
+    """
+    ``(callable, boards)`` per benchmark; the callable takes one board. Setup
+    work (indexes, letter models) is done here, untimed.
+    """
+    from smart_decision import should_spin_or_buy_vowel
+    from solve_decision import should_solve_now
+    from solve_timing_experiments import GameSimulator
+    from src.letter_chooser import LetterChooserAI
+    from src.solver import PuzzleSolverAI
+
+    full_smart_decision = _load_module('bench_smart_decision',
+                                       ROOT / 'CanIBuyanAI' / 'src' / 'PlayGame' / 'smart_decision.py')
+    solver = PuzzleSolverAI(puzzles_file=str(BONUS_PUZZLES))
+    chooser = LetterChooserAI(puzzles_file=str(BONUS_PUZZLES))
+    simulator = GameSimulator()
+
+    # _best_word_match works on one word; use each board's first unfinished word
+    for board in boards:
+        words = [word for word in board['showing'].split() if '_' in word] or board['showing'].split()
+        board['word'] = words[0]
+        board['letter_model'] = full_smart_decision.build_letter_probability_model(
+            board['showing'], board['previous_guesses'])
+
+    # Full games start from a blank board, so play each puzzle once
+    games = [dict(board, seed=seed) for seed, board in enumerate(b for b in boards if b['stage'] == 'early')]
+
+    return {
+        'should_spin_or_buy_vowel': (lambda board: should_spin_or_buy_vowel(
+            board['showing'], board['scores'][0], board['previous_guesses']), boards),
+        'should_solve_now': (lambda board: should_solve_now(
+            board['showing'], board['scores'], 0, board['category'], board['previous_guesses']), boards),
+        'PuzzleSolverAI.solve': (lambda board: solver.solve(
+            board['showing'], guessed=board['previous_guesses']), boards),
+        'LetterChooserAI.choose_letters': (lambda board: chooser.choose_letters(
+            board['showing'], guessed=board['previous_guesses']), boards),
+        '_best_word_match': (lambda board: full_smart_decision._best_word_match(
+            board['word'], board['previous_guesses'], board['letter_model']), boards),
+        'simulate_game': (lambda board: simulator.play_seeded_game(
+            ['smart', 'solve_timing', 'conservative'], board['seed'],
+            (board['puzzle'], board['category'], '', board['round'])), games),
+    }
+
+
+def measure(func: Callable, boards: List[Dict[str, Any]], min_time: float = 0.5) -> Dict[str, float]:
+    """ops/sec over repeated passes (at least ``min_time`` seconds) and one pass's peak memory."""
+    tracemalloc.start()
+    for board in boards:
+        func(board)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for board in boards:
+            func(board)
+        calls += len(boards)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    return {'ops_per_sec': calls / elapsed, 'peak_kib': peak / 1024}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = 0.25) -> List[str]:
+    """Names of the benchmarks that got slower, or hungrier, than ``tolerance`` allows."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result['ops_per_sec'] < before['ops_per_sec'] * (1 - tolerance):
+            regressions.append(name)
+        # A little absolute slack keeps tiny peaks from flapping
+        elif result['peak_kib'] > before['peak_kib'] * (1 + tolerance) + 64:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the decision and solver hot paths.")
+    parser.add_argument('--boards', type=int, default=30, help="puzzles to sample (each at three stages)")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--min-time', type=float, default=0.5, help="seconds to time each benchmark for")
+    parser.add_argument('--only', action='append', default=None, help="run just this benchmark; repeatable")
+    parser.add_argument('--baseline', default=str(BASELINE_FILE))
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown / memory growth before failing (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    boards = make_boards(args.boards, args.seed)
+    benchmarks = build_benchmarks(boards)
+    if args.only:
+        unknown = set(args.only) - set(benchmarks)
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        benchmarks = {name: benchmark for name, benchmark in benchmarks.items() if name in args.only}
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text())['results'] if baseline_path.exists() else {}
+
+    results = {}
+    print(f"{len(boards)} boards ({args.boards} puzzles x {', '.join(STAGES)}), seed {args.seed}")
+    for name, (func, inputs) in benchmarks.items():
+        results[name] = measure(func, inputs, args.min_time)
+        line = f"{name:32} {results[name]['ops_per_sec']:12,.1f} ops/sec {results[name]['peak_kib']:10,.1f} KiB peak"
+        if name in baseline:
+            line += f"  ({results[name]['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.0%} vs baseline)"
+        print(line)
+
+    if args.save_baseline:
+        merged = dict(baseline, **results)
+        baseline_path.write_text(json.dumps({'boards': args.boards, 'seed': args.seed, 'results': merged},
+                                            indent=2) + "\n")
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"REGRESSED (beyond {args.tolerance:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Headless Game Engine for Wheel of Fortune
+The game rules shared by the interactive CLI and the simulators.
+
+Nothing in here prints, sleeps or touches the global RNG. ``apply_action``
+turns a ``GameState`` plus one player action into a new state and a list of
+events; front ends decide what to show for each event by registering
+listeners. Randomness comes from the ``Wheel``'s injectable RNG, and players
+reach the wheel of the game being played through ``spin_wheel``.
+"""
+
+import contextlib
+import contextvars
+import random
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Note that the wheel changes over time ... free play now an 850. Different rounds, etc.
+WHEEL_VALUES = [0, -1, 500, 550, 600, 650, 700, 750, 800, 850, 900, -1,
+                500, 550, 600, 650, 700, 750, 800, 850, 900, 500, 550, 600]
+VOWEL_COST = 250
+VOWELS = "AEIOU"
+
+Event = Dict
+Listener = Callable[[Event], None]
+
+
+def emit(listeners: Iterable[Listener], event: Event):
+    """Send ``event`` to every listener in order."""
+    for listener in listeners:
+        listener(event)
+
+
+class Wheel:
+    """
+    The wheel, with its own RNG.
+
+    ``spin`` draws a value and reports it to the wheel's listeners as a
+    ``spin`` event, which is where front ends hang their spinning animation.
+    Given pre-drawn ``spins``, the wheel lands on those in order (and only
+    uses its RNG once they run out), so different players can be dealt the
+    exact same spins.
+    """
+
+    def __init__(self, values: List[int] = None, rng: random.Random = None,
+                 listeners: List[Listener] = None, spins: Iterable[int] = None):
+        self.values = list(values or WHEEL_VALUES)
+        self.rng = rng or random.Random()
+        self.listeners = list(listeners or [])
+        self.spins = iter(spins) if spins is not None else None
+
+    def spin(self) -> int:
+        dollar = next(self.spins, None) if self.spins is not None else None
+        if dollar is None:
+            dollar = self.rng.choice(self.values)
+        emit(self.listeners, {'type': 'spin', 'value': dollar, 'values': self.values})
+        return dollar
+
+
+def draw_spins(rng: random.Random, count: int, values: List[int] = None) -> List[int]:
+    """Pre-draw ``count`` wheel spins, for a ``Wheel(spins=...)``."""
+    values = list(values or WHEEL_VALUES)
+    return [rng.choice(values) for _ in range(count)]
+
+
+# The wheel of the game being played. Players call spin_wheel() from inside
+# their turn functions, so the game makes its wheel current for their calls.
+_CURRENT_WHEEL: contextvars.ContextVar = contextvars.ContextVar('current_wheel', default=None)
+_DEFAULT_WHEEL = Wheel(rng=random)
+
+
+@contextlib.contextmanager
+def use_wheel(wheel: Wheel):
+    """Make ``wheel`` the one ``spin_wheel`` draws from inside the block."""
+    token = _CURRENT_WHEEL.set(wheel)
+    try:
+        yield wheel
+    finally:
+        _CURRENT_WHEEL.reset(token)
+
+
+def spin_wheel() -> int:
+    """Spin the current game's wheel (a silent wheel on the global RNG otherwise)."""
+    wheel = _CURRENT_WHEEL.get()
+    return (wheel or _DEFAULT_WHEEL).spin()
+
+
+class GameState:
+    """Everything about a game in progress: the board, guesses, money and turn."""
+
+    def __init__(self, puzzle: str, clue: str = "", date: str = "", game_type: str = "",
+                 showing: str = None, previous_guesses: List[str] = None,
+                 winnings: List[int] = None, turn: int = 0, winner: Optional[int] = None):
+        self.puzzle = puzzle
+        self.clue = clue
+        self.date = date
+        self.game_type = game_type
+        # Mask out the letters
+        self.showing = showing if showing is not None else re.sub(r"[A-Z]", "_", puzzle)
+        self.previous_guesses = list(previous_guesses or [])
+        self.winnings = list(winnings or [0, 0, 0])
+        self.turn = turn
+        self.winner = winner
+
+    @property
+    def player(self) -> int:
+        """Index of the player whose turn it is."""
+        return self.turn % len(self.winnings)
+
+    @property
+    def board_complete(self) -> bool:
+        return self.showing == self.puzzle
+
+    @property
+    def is_over(self) -> bool:
+        return self.winner is not None
+
+    def copy(self) -> 'GameState':
+        return GameState(self.puzzle, self.clue, self.date, self.game_type, self.showing,
+                         self.previous_guesses, self.winnings, self.turn, self.winner)
+
+
+def apply_action(state: GameState, guess: str, dollar: int) -> Tuple[GameState, List[Event]]:
+    """
+    Apply one player action and return ``(new_state, events)``.
+
+    ``guess`` and ``dollar`` are what the turn functions return: a letter and
+    the wheel value it was called on, ``"_"`` for a lost turn or bankrupt, or
+    ``"SOLVE:<answer>"``. Turn functions charge for vowels and zero a bankrupt
+    player themselves, on the ``winnings`` list they were handed.
+    ``state`` is left untouched.
+    """
+    state = state.copy()
+    player = state.player
+    events: List[Event] = []
+
+    if guess.startswith('SOLVE:'):
+        attempt = guess[6:]
+        correct = attempt == state.puzzle
+        events.append({'type': 'solve_attempt', 'player': player, 'guess': attempt, 'correct': correct})
+        if correct:
+            state.winner = player
+            state.showing = state.puzzle
+        else:
+            state.turn += 1
+        return state, events
+
+    # Double check that guess has not already been said (I've seen it on TV before)
+    if guess in state.previous_guesses and guess != "_":
+        events.append({'type': 'repeat_guess', 'player': player, 'letter': guess})
+        state.turn += 1
+        return state, events
+
+    state.previous_guesses.append(guess)
+    if guess == "_":  # Lost turn or bankrupt
+        if dollar == -1:
+            state.winnings[player] = 0
+            events.append({'type': 'bankrupt', 'player': player})
+        else:
+            events.append({'type': 'lost_turn', 'player': player})
+        state.turn += 1
+        return state, events
+
+    correct_places = [pos for pos, char in enumerate(state.puzzle) if char == guess]
+    if correct_places:
+        amount = dollar * len(correct_places)
+        state.winnings[player] += amount
+        showing = list(state.showing)
+        for pos in correct_places:
+            showing[pos] = guess
+        state.showing = ''.join(showing)
+        events.append({'type': 'reveal', 'player': player, 'letter': guess, 'vowel': guess in VOWELS,
+                       'count': len(correct_places), 'amount': amount})
+    else:
+        events.append({'type': 'miss', 'player': player, 'letter': guess, 'vowel': guess in VOWELS})
+        state.turn += 1
+    return state, events
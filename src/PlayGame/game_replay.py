@@ -0,0 +1,168 @@
+"""
+Game Replays for Wheel of Fortune
+A compact log of every turn of a game, and a replayer that rebuilds the game
+state at any turn from the log alone, without running any player logic.
+
+A replay is one packed JSON line:
+
+    {"v": 1, "seed": 42, "split": "valid", "puzzle_id": 118,
+     "players": ["smart", "morse", "oxford"],
+     "turns": [["T", 650, 650, 0, 4], ["A", 0, null, -250, 18], ...],
+     "winner": 0}
+
+Each turn is ``[guess, dollar, spin, charge, revealed]``: what the player
+returned (a letter, ``"_"`` or ``"SOLVE:..."``) and the dollar value handed
+to the engine, the wheel value it spun (null if it did not spin), the change
+the player made to its own winnings before the engine ran (-250 for a vowel,
+minus everything on a bankrupt), and a bitmask of the board positions the
+turn revealed. A null guess is a turn the player forfeited because its turn
+function failed. Games without a ``puzzle_id`` carry the puzzle record itself
+as ``"puzzle"``.
+
+Replaying applies the same engine actions in order, so state at turn ``n``
+costs O(n):
+
+    for entry in read_replays("games.replay.jsonl"):
+        state = replay(entry, turn=12)
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from game_engine import GameState, apply_action
+
+REPLAY_VERSION = 1
+
+
+def revealed_mask(before: str, after: str) -> int:
+    """Bitmask of the positions that differ between two boards."""
+    mask = 0
+    for pos, (old, new) in enumerate(zip(before, after)):
+        if old != new:
+            mask |= 1 << pos
+    return mask
+
+
+class ReplayRecorder:
+    """
+    Builds the replay of one game as it is played.
+
+    Register it as a listener on the game's wheel so it sees the spins, then
+    call ``begin_turn`` before asking a player for its move and ``end_turn``
+    once the engine has applied it.
+    """
+
+    def __init__(self, state: GameState, player_types: List[str], seed: int = None,
+                 puzzle_id: int = None, split: str = None):
+        self.entry = {'v': REPLAY_VERSION, 'seed': seed, 'split': split, 'puzzle_id': puzzle_id,
+                      'players': list(player_types), 'turns': [], 'winner': None}
+        if puzzle_id is None:
+            self.entry['puzzle'] = [state.puzzle, state.clue, state.date, state.game_type]
+        self._spin = None
+        self._winnings = 0
+
+    def __call__(self, event: Dict):
+        if event['type'] == 'spin':
+            self._spin = event['value']
+
+    def begin_turn(self, state: GameState):
+        self._spin = None
+        self._winnings = state.winnings[state.player]
+
+    def end_turn(self, state: GameState, guess: str, dollar: int, new_state: GameState):
+        """``state`` is the state the engine was handed (after the player's own charges)."""
+        charge = state.winnings[state.player] - self._winnings
+        self.entry['turns'].append([guess, dollar, self._spin, charge, revealed_mask(state.showing, new_state.showing)])
+
+    def finish(self, winner: Optional[int]) -> Dict:
+        self.entry['winner'] = winner
+        return self.entry
+
+
+def replay_puzzle(entry: Dict, sampler=None) -> Tuple[str, str, str, str]:
+    """The ``(puzzle, clue, date, round)`` a replay was played on."""
+    if entry.get('puzzle_id') is None:
+        return tuple(entry['puzzle'])
+    if sampler is None:
+        from puzzle_sampler import get_sampler
+        sampler = get_sampler(entry['split'])
+    return sampler.records[entry['puzzle_id']]
+
+
+def replay_states(entry: Dict, sampler=None, verify: bool = True) -> Iterator[GameState]:
+    """
+    The state before the first turn and after every turn of a replay.
+
+    With ``verify``, each turn's revealed positions are checked against the
+    log, which catches a replay read against the wrong puzzle split.
+    """
+    state = GameState(*replay_puzzle(entry, sampler))
+    yield state
+    for number, (guess, dollar, _, charge, revealed) in enumerate(entry['turns']):
+        handed = state.copy()
+        handed.winnings[handed.player] += charge
+        if guess is None:
+            state = handed.copy()
+            state.turn += 1
+        else:
+            state, _ = apply_action(handed, guess, dollar)
+        if verify and revealed_mask(handed.showing, state.showing) != revealed:
+            raise ValueError(f"Replay diverges from its log at turn {number}")
+        yield state
+
+
+def replay(entry: Dict, turn: int = None, sampler=None, verify: bool = True) -> GameState:
+    """The state after ``turn`` turns of a replay (after the last turn by default)."""
+    turns = len(entry['turns']) if turn is None else turn
+    if not 0 <= turns <= len(entry['turns']):
+        raise IndexError(f"Replay has {len(entry['turns'])} turns, not {turn}")
+    for number, state in enumerate(replay_states(entry, sampler, verify)):
+        if number == turns:
+            return state
+
+
+class ReplayLog:
+    """Append-only JSONL file of packed replays, buffered like the results sink."""
+
+    def __init__(self, path: str, flush_every: int = 1000):
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer: List[str] = []
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, entry: Dict):
+        self._buffer.append(json.dumps(entry, separators=(',', ':')))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._buffer = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def tell(self) -> int:
+        """Size of the file once everything written so far is flushed."""
+        self.flush()
+        return self._file.tell()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_replays(path: str) -> Iterator[Dict]:
+    """Stream the replays of a log file."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
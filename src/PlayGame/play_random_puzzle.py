@@ -1,5 +1,4 @@
 import random
-import re
 import sys
 import time
 import ascii_wheel
@@ -10,6 +9,11 @@ from solve_timing_ai import (
     computer_turn_solve_timing_balanced
 )
 from solve_advisor import SolveAdvisor
+from puzzle_sampler import get_sampler
+from decision_timing import timed
+from game_replay import ReplayLog, ReplayRecorder
+import game_engine
+from game_engine import GameState, Wheel, apply_action, emit, use_wheel
 
 def computer_turn(showing, winnings, previous_guesses, turn):
   # Guess in the order of the alphabet
@@ -255,19 +259,9 @@ def computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn):
       break
   return character, dollar
 
-def get_random_puzzle():
-  random_int = random.randint(0,900) # Roughly size of num puzzles in valid
-  number = 0
-  with open("../../data/puzzles/valid.csv") as f:
-    for line in f:
-      line = line.rstrip('\n')
-      puzzle, clue, date, game_type = line.split(',')
-      if number == random_int:
-        #print(line)
-        clue = clue.replace("&amp;", "&") # HTML Code
-        puzzle = puzzle.replace("&amp;", "&") # HTML Code
-        return(puzzle, clue, date, game_type)
-      number = number + 1
+def get_random_puzzle(rng=random):
+  # Any puzzle from the valid split, loaded into memory once
+  return get_sampler("valid").sample(rng)
 
 def human_turn(showing, winnings, previous_guesses, turn, puzzle, clue="PHRASE"):
 
@@ -379,142 +373,158 @@ def print_board(showing):
   print(to_print)
 
 def spin_wheel():
-  wheel_values = [0,-1,500,550,600,650,700,750,800,850,900,-1,500,550,600,650,700,750,800,850,900,500,550,600]
-  # Note that the wheel changes over time ... free play now an 850. Different rounds, etc.
-  print("Wheel is spinning ....")
-  print("It landed on ....")
-  time.sleep(2) # Drama!
-  ascii_wheel.draw_ascii_wheel(wheel_values, radius=18, label_style="long")
-  dollar = random.choice(wheel_values)
-  print("....", dollar, "dollars")
-  return dollar
-
-
-def play_random_game(type_of_players):
-
-  # Play the game
-  puzzle, clue, date, game_type = get_random_puzzle()
-  print("Welcome to Wheel of Fortune")
-  print("You are playing a game of type:", game_type)
-  print("The clue is:", clue)
-
-  # Mask out word
-  showing = puzzle
-  showing = re.sub(r"[A-Z]","_",showing)
-  print_board(showing)
-
-  # Play the game
-  guess = ""
-  previous_guesses = []
-  turn = 0
-
-  winnings = [0,0,0]
-  dollar = 0
-  is_solved = False
-
-  while showing != puzzle:
-    time.sleep(2) # Let humans see what is going on
-    # Ends wierd if last letter is guessed and not solved.# TODO
-    print("It is player", turn % 3, "'s turn")
-
-    # Type of player
-    type_of_player = type_of_players[turn % 3]
-    print("This player is:", type_of_player)
-
-    if type_of_player == "human":
-      guess, dollar = human_turn(showing, winnings, previous_guesses, turn, puzzle, clue)
-    elif type_of_player == "morse":
-      guess, dollar = computer_turn_morse(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "oxford":
-      guess, dollar = computer_turn_oxford(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "trigram":
-      guess, dollar = computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "smart":
-      guess, dollar = computer_turn_smart(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "conservative":
-      guess, dollar = computer_turn_smart_conservative(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "aggressive":
-      guess, dollar = computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn)
-    elif type_of_player == "solve_timing":
-      guess, dollar = computer_turn_solve_timing_balanced(showing, winnings, previous_guesses, turn, puzzle, game_type)
-    elif type_of_player == "solve_conservative":
-      guess, dollar = computer_turn_solve_timing_conservative(showing, winnings, previous_guesses, turn, puzzle, game_type)
-    elif type_of_player == "solve_aggressive":
-      guess, dollar = computer_turn_solve_timing_aggressive(showing, winnings, previous_guesses, turn, puzzle, game_type)
-
-    ## Human playing
-    #if turn % 3 == 0:
-    #  guess, dollar = human_turn(showing, winnings, previous_guesses, turn, puzzle)
-    #
-    ## Computer playing
-    #elif turn % 3 == 1:
-    #  guess, dollar = computer_turn_oxford(showing, winnings, previous_guesses, turn)
-    #elif turn % 3 == 2:
-    #  guess, dollar = computer_turn_morse(showing, winnings, previous_guesses, turn)
-
-
-    # Check if this is a solve attempt
-    if guess.startswith('SOLVE:'):
-      solve_guess = guess[6:]  # Remove 'SOLVE:' prefix
-      print(f"Player {turn % 3} attempts to solve: '{solve_guess}'")
-      if solve_guess == puzzle:
-        print(f"CORRECT! Player {turn % 3} solved the puzzle!")
-        print("Final winnings:", winnings)
-        return turn % 3  # Return winner
+  # Spins the wheel of the game in progress; any drama is up to its listeners
+  return game_engine.spin_wheel()
+
+
+class ConsoleListener:
+  # Prints the game for people watching. delay is the pause (in seconds) for drama
+  def __init__(self, delay=2):
+    self.delay = delay
+
+  def __call__(self, event):
+    kind = event['type']
+    if kind == 'start':
+      print("Welcome to Wheel of Fortune")
+      print("You are playing a game of type:", event['game_type'])
+      print("The clue is:", event['clue'])
+      print_board(event['showing'])
+    elif kind == 'turn':
+      time.sleep(self.delay) # Let humans see what is going on
+      print("It is player", event['player'], "'s turn")
+      print("This player is:", event['player_type'])
+    elif kind == 'spin':
+      print("Wheel is spinning ....")
+      print("It landed on ....")
+      time.sleep(self.delay) # Drama!
+      ascii_wheel.draw_ascii_wheel(event['values'], radius=18, label_style="long")
+      print("....", event['value'], "dollars")
+    elif kind == 'solve_attempt':
+      print(f"Player {event['player']} attempts to solve: '{event['guess']}'")
+      if event['correct']:
+        print(f"CORRECT! Player {event['player']} solved the puzzle!")
       else:
         print("Wrong solution ... next player")
-        turn = turn + 1
-    # Double check that guess has not already been said (I've seen it on TV before)
-    elif guess in previous_guesses and guess != "_":
+    elif kind == 'repeat_guess':
       print("Sorry, that's already been guessed .... next player")
-      turn = turn + 1
-    else:
-      # Update board
-      previous_guesses.append(guess)
-      correct_places = []
-      for pos,char in enumerate(puzzle):
-        if(char == guess):
-            correct_places.append(pos)
-      #print(correct_places)
-      if guess == "_": # Hacky way to say the comp got it wrong or bankrupt, etc.
-        turn = turn + 1
-      elif len(correct_places) < 1:
-        print("Sorry, not in the puzzle ... next player")
-        turn = turn + 1
+    elif kind == 'miss':
+      print("Sorry, not in the puzzle ... next player")
+    elif kind == 'status':
+      print("Winnings:", event['winnings'])
+      print("Previous guesses:", event['previous_guesses'])
+      print("The clue is:", event['clue'])
+      print_board(event['showing'])
+    elif kind == 'solve_chance':
+      print("Player", event['player'], "has a chance to solve")
+    elif kind == 'final_solve':
+      if event['correct']:
+        print("Player", event['player'], "won!")
+        print("Winnings:", event['winnings'])
       else:
-        # Add winnings for correct letter guesses
-        winnings[(turn % 3)] = winnings[(turn % 3)] + (dollar * len(correct_places))
-        for correct_letter in correct_places:
-          showing = showing[:correct_letter] + guess + showing[correct_letter + 1:]
-    
-    # Only print status if we're not solving
-    if not guess.startswith('SOLVE:'):
-      print("Winnings:", winnings)
-      print("Previous guesses:", previous_guesses)
-      print("The clue is:", clue)
-      print_board(showing)
-
-  while not is_solved:
-    print("Player", turn % 3, "has a chance to solve")
-    type_of_player = type_of_players[turn % 3] # wouldn't have hit this above
-    # If human, let them guess, otheerwise let computer guess
-    if type_of_player == "human":
-      solve = input("Your guess to solve: ...... ").upper() # TODO: clean
-    else:
-      solve = showing
-  
-    if solve == puzzle:
-      print("Player", turn % 3, "won!")
-      print("Winnings:", winnings)
-      is_solved = True
-    else:
-      print("Wrong ... next player")
-      turn = turn + 1
-      print("The clue is:", clue)
-      print_board(showing)
+        print("Wrong ... next player")
+        print("The clue is:", event['clue'])
+        print_board(event['showing'])
+    elif kind == 'game_over' and event['solved']:
+      print("Final winnings:", event['winnings'])
+
+
+def take_turn(type_of_player, state):
+  # Ask a player for their action. The turn functions charge vowels and bankruptcies on state.winnings
+  showing, winnings, previous_guesses, turn = state.showing, state.winnings, state.previous_guesses, state.turn
+  if type_of_player == "human":
+    return human_turn(showing, winnings, previous_guesses, turn, state.puzzle, state.clue)
+  elif type_of_player == "morse":
+    return computer_turn_morse(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "oxford":
+    return computer_turn_oxford(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "trigram":
+    return computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "smart":
+    return computer_turn_smart(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "conservative":
+    return computer_turn_smart_conservative(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "aggressive":
+    return computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn)
+  elif type_of_player == "solve_timing":
+    return computer_turn_solve_timing_balanced(showing, winnings, previous_guesses, turn, state.puzzle, state.game_type)
+  elif type_of_player == "solve_conservative":
+    return computer_turn_solve_timing_conservative(showing, winnings, previous_guesses, turn, state.puzzle, state.game_type)
+  elif type_of_player == "solve_aggressive":
+    return computer_turn_solve_timing_aggressive(showing, winnings, previous_guesses, turn, state.puzzle, state.game_type)
+  raise ValueError("Unknown player type: " + type_of_player)
+
+
+def play_random_game(type_of_players, rng=None, listeners=None, replay_log=None):
+  # rng seeds the puzzle and the wheel; listeners get every game event (nothing is shown without them)
+  # replay_log (a ReplayLog) gets the game's replay once it is over
+  rng = rng or random.Random()
+  listeners = list(listeners or [])
+  wheel = Wheel(rng=rng, listeners=listeners)
+
+  # Play the game
+  puzzle, clue, date, game_type = get_random_puzzle(rng)
+  state = GameState(puzzle, clue, date, game_type)
+  recorder = None
+  if replay_log is not None:
+    sampler = get_sampler("valid")
+    recorder = ReplayRecorder(state, type_of_players, puzzle_id=sampler.position((puzzle, clue, date, game_type)),
+                              split=sampler.split)
+    wheel.listeners.append(recorder)
+  emit(listeners, {'type': 'start', 'game_type': game_type, 'clue': clue, 'showing': state.showing})
+
+  with use_wheel(wheel):
+    while not state.board_complete:
+      # Ends wierd if last letter is guessed and not solved.# TODO
+      type_of_player = type_of_players[state.player]
+      emit(listeners, {'type': 'turn', 'player': state.player, 'player_type': type_of_player, 'turn': state.turn})
+
+      if recorder:
+        recorder.begin_turn(state)
+      with timed("player:" + type_of_player):
+        guess, dollar = take_turn(type_of_player, state)
+      new_state, events = apply_action(state, guess, dollar)
+      if recorder:
+        recorder.end_turn(state, guess, dollar, new_state)
+      state = new_state
+      for event in events:
+        emit(listeners, event)
+      if state.is_over:
+        emit(listeners, {'type': 'game_over', 'winner': state.winner, 'winnings': state.winnings, 'solved': True})
+        if recorder:
+          replay_log.write(recorder.finish(state.winner))
+        return state.winner
+
+      # Only print status if we're not solving
+      if not guess.startswith('SOLVE:'):
+        emit(listeners, {'type': 'status', 'winnings': state.winnings, 'previous_guesses': state.previous_guesses,
+                         'clue': clue, 'showing': state.showing})
+
+    while not state.is_over:
+      emit(listeners, {'type': 'solve_chance', 'player': state.player})
+      type_of_player = type_of_players[state.player] # wouldn't have hit this above
+      # If human, let them guess, otheerwise let computer guess
+      if type_of_player == "human":
+        solve = input("Your guess to solve: ...... ").upper() # TODO: clean
+      else:
+        solve = state.showing
+
+      player = state.player
+      if recorder:
+        recorder.begin_turn(state)
+      new_state, events = apply_action(state, 'SOLVE:' + solve, 0)
+      if recorder:
+        recorder.end_turn(state, 'SOLVE:' + solve, 0, new_state)
+      state = new_state
+      emit(listeners, {'type': 'final_solve', 'player': player, 'correct': state.is_over,
+                       'winnings': state.winnings, 'clue': clue, 'showing': state.showing})
+  if recorder:
+    replay_log.write(recorder.finish(state.winner))
+  return state.winner
 
 if __name__ == '__main__':
-  type_of_players = sys.argv[1:]
+  # --replay-log=FILE appends the game's replay to FILE
+  replay_path = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--replay-log=')), None)
+  type_of_players = [arg for arg in sys.argv[1:] if not arg.startswith('--replay-log=')]
   print(type_of_players)
   if len(type_of_players) != 3:
     print("There should be 3 players ... creating a default game with solve timing AI players")
@@ -524,7 +534,11 @@ if __name__ == '__main__':
     time.sleep(3)
   #type_of_players = ["morse", "morse", "oxford"] # TODO: Set with command line
 
-  play_random_game(type_of_players)
+  if replay_path:
+    with ReplayLog(replay_path) as replay_log:
+      play_random_game(type_of_players, listeners=[ConsoleListener()], replay_log=replay_log)
+  else:
+    play_random_game(type_of_players, listeners=[ConsoleListener()])
 
 
 
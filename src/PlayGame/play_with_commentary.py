@@ -5,11 +5,13 @@ Integrates Pat Sajak commentary and player personalities into the game
 """
 
 import random
-import re
 import sys
 import time
-import ascii_wheel
 from smart_player import computer_turn_smart, computer_turn_smart_conservative, computer_turn_smart_aggressive
+from puzzle_sampler import get_sampler
+import game_engine
+from game_engine import GameState, Wheel, apply_action, emit, use_wheel
+from play_random_puzzle import ConsoleListener
 
 # Try to import and initialize interactive host
 try:
@@ -288,19 +290,9 @@ def computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn):
             break
     return character, dollar
 
-def get_random_puzzle():
+def get_random_puzzle(rng=random):
     """Get a random puzzle from the database"""
-    random_int = random.randint(0,900)
-    number = 0
-    with open("../../data/puzzles/valid.csv") as f:
-        for line in f:
-            line = line.rstrip('\n')
-            puzzle, clue, date, game_type = line.split(',')
-            if number == random_int:
-                clue = clue.replace("&amp;", "&")
-                puzzle = puzzle.replace("&amp;", "&")
-                return(puzzle, clue, date, game_type)
-            number = number + 1
+    return get_sampler("valid").sample(rng)
 
 def human_turn(showing, winnings, previous_guesses, turn, puzzle):
     """Human turn with commentary integration"""
@@ -403,117 +395,93 @@ def print_board(showing):
     print(to_print)
 
 def spin_wheel():
-    """Spin the wheel and return the value"""
-    wheel_values = [0,-1,500,550,600,650,700,750,800,850,900,-1,500,550,600,650,700,750,800,850,900,500,550,600]
-    print("Wheel is spinning ....")
-    print("It landed on ....")
-    time.sleep(2)
-    ascii_wheel.draw_ascii_wheel(wheel_values, radius=18, label_style="long")
-    dollar = random.choice(wheel_values)
-    print("....", dollar, "dollars")
-    return dollar
-
-def play_random_game(type_of_players, enable_commentary=True):
-    """Play a random game with optional commentary"""
-    
+    """Spin the wheel of the game in progress; the drama is up to its listeners"""
+    return game_engine.spin_wheel()
+
+class CommentaryListener:
+    """Passes the outcome of every guess, and the winner, on to the interactive host"""
+
+    def __call__(self, event):
+        kind = event['type']
+        if kind == 'miss':
+            safe_log_action('wrong_guess', event['player'], f"letter: {event['letter']}, count: 0")
+        elif kind == 'reveal':
+            safe_log_action('correct_guess', event['player'], f"letter: {event['letter']}, count: {event['count']}")
+        elif kind == 'game_over':
+            safe_generate_victory_speech(event['winner'], event['winnings'][event['winner']])
+        elif kind == 'final_solve' and event['correct']:
+            safe_generate_victory_speech(event['player'], event['winnings'][event['player']])
+
+def take_turn(type_of_player, state):
+    """Ask a player for their action; turn functions charge vowels and bankruptcies on state.winnings"""
+    showing, winnings, previous_guesses, turn = state.showing, state.winnings, state.previous_guesses, state.turn
+    if type_of_player == "human":
+        return human_turn(showing, winnings, previous_guesses, turn, state.puzzle)
+    elif type_of_player == "morse":
+        return computer_turn_morse(showing, winnings, previous_guesses, turn)
+    elif type_of_player == "oxford":
+        return computer_turn_oxford(showing, winnings, previous_guesses, turn)
+    elif type_of_player == "trigram":
+        return computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn)
+    elif type_of_player == "smart":
+        return computer_turn_smart(showing, winnings, previous_guesses, turn)
+    elif type_of_player == "conservative":
+        return computer_turn_smart_conservative(showing, winnings, previous_guesses, turn)
+    elif type_of_player == "aggressive":
+        return computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn)
+    raise ValueError("Unknown player type: " + type_of_player)
+
+def play_random_game(type_of_players, enable_commentary=True, rng=None, listeners=None):
+    """
+    Play a random game with optional commentary on the shared game engine.
+
+    rng seeds the puzzle and the wheel; listeners get every game event (the
+    command line registers a ConsoleListener), and the interactive host is
+    added to them when commentary is enabled. Returns the winning player.
+    """
+    rng = rng or random.Random()
+    listeners = list(listeners or [])
     # Enable interactive host mode if requested
     if enable_commentary:
         safe_enable_interactive_mode()
-    
-    # Play the game
-    puzzle, clue, date, game_type = get_random_puzzle()
-    print("Welcome to Wheel of Fortune")
-    print("You are playing a game of type:", game_type)
-    print("The clue is:", clue)
-
-    # Mask out word
-    showing = puzzle
-    showing = re.sub(r"[A-Z]","_",showing)
-    print_board(showing)
+        listeners.append(CommentaryListener())
+    wheel = Wheel(rng=rng, listeners=listeners)
 
     # Play the game
-    guess = ""
-    previous_guesses = []
-    turn = 0
-
-    winnings = [0,0,0]
-    dollar = 0
-    is_solved = False
-
-    while showing != puzzle:
-        time.sleep(2)
-        print("It is player", turn % 3, "'s turn")
-
-        # Type of player
-        type_of_player = type_of_players[turn % 3]
-        print("This player is:", type_of_player)
-
-        if type_of_player == "human":
-            guess, dollar = human_turn(showing, winnings, previous_guesses, turn, puzzle)
-        elif type_of_player == "morse":
-            guess, dollar = computer_turn_morse(showing, winnings, previous_guesses, turn)
-        elif type_of_player == "oxford":
-            guess, dollar = computer_turn_oxford(showing, winnings, previous_guesses, turn)
-        elif type_of_player == "trigram":
-            guess, dollar = computer_turn_trigrams_bigrams(showing, winnings, previous_guesses, turn)
-        elif type_of_player == "smart":
-            guess, dollar = computer_turn_smart(showing, winnings, previous_guesses, turn)
-        elif type_of_player == "conservative":
-            guess, dollar = computer_turn_smart_conservative(showing, winnings, previous_guesses, turn)
-        elif type_of_player == "aggressive":
-            guess, dollar = computer_turn_smart_aggressive(showing, winnings, previous_guesses, turn)
-
-        # Double check that guess has not already been said
-        if guess in previous_guesses and guess != "_":
-            print("Sorry, that's already been guessed .... next player")
-            turn = turn + 1
-        else:
-            # Update board
-            previous_guesses.append(guess)
-            correct_places = []
-            for pos,char in enumerate(puzzle):
-                if(char == guess):
-                    correct_places.append(pos)
-            
-            if guess == "_":  # Hacky way to say the comp got it wrong or bankrupt, etc.
-                turn = turn + 1
-            elif len(correct_places) < 1:
-                if enable_commentary:
-                    safe_log_action('wrong_guess', turn % 3, f'letter: {guess}, count: 0')
-                print("Sorry, not in the puzzle ... next player")
-                turn = turn + 1
+    puzzle, clue, date, game_type = get_random_puzzle(rng)
+    state = GameState(puzzle, clue, date, game_type)
+    emit(listeners, {'type': 'start', 'game_type': game_type, 'clue': clue, 'showing': state.showing})
+
+    with use_wheel(wheel):
+        while not state.board_complete:
+            type_of_player = type_of_players[state.player]
+            emit(listeners, {'type': 'turn', 'player': state.player, 'player_type': type_of_player,
+                             'turn': state.turn})
+            guess, dollar = take_turn(type_of_player, state)
+            state, events = apply_action(state, guess, dollar)
+            for event in events:
+                emit(listeners, event)
+            if state.is_over:
+                emit(listeners, {'type': 'game_over', 'winner': state.winner, 'winnings': state.winnings,
+                                 'solved': True})
+                return state.winner
+            emit(listeners, {'type': 'status', 'winnings': state.winnings, 'previous_guesses': state.previous_guesses,
+                             'clue': clue, 'showing': state.showing})
+
+        while not state.is_over:
+            emit(listeners, {'type': 'solve_chance', 'player': state.player})
+            type_of_player = type_of_players[state.player]
+            # If human, let them guess, otherwise let computer guess
+            if type_of_player == "human":
+                solve = input("Your guess to solve: ...... ").upper()
             else:
-                if enable_commentary:
-                    safe_log_action('correct_guess', turn % 3, f'letter: {guess}, count: {len(correct_places)}')
-        
-        winnings[(turn % 3)] = winnings[(turn % 3)] + (dollar * len(correct_places))
-        for correct_letter in correct_places:
-            showing = showing[:correct_letter] + guess + showing[correct_letter + 1:]
-        print("Winnings:", winnings)
-        print("Previous guesses:", previous_guesses)
-        print("The clue is:", clue)
-        print_board(showing)
-
-    while not is_solved:
-        print("Player", turn % 3, "has a chance to solve")
-        type_of_player = type_of_players[turn % 3]
-        # If human, let them guess, otherwise let computer guess
-        if type_of_player == "human":
-            solve = input("Your guess to solve: ...... ").upper()
-        else:
-            solve = showing
-      
-        if solve == puzzle:
-            print("Player", turn % 3, "won!")
-            print("Winnings:", winnings)
-            if enable_commentary:
-                safe_generate_victory_speech(turn % 3, winnings[turn % 3])
-            is_solved = True
-        else:
-            print("Wrong ... next player")
-            turn = turn + 1
-            print("The clue is:", clue)
-            print_board(showing)
+                solve = state.showing
+
+            player = state.player
+            state, events = apply_action(state, 'SOLVE:' + solve, 0)
+            emit(listeners, {'type': 'final_solve', 'player': player, 'correct': state.is_over,
+                             'winnings': state.winnings, 'clue': clue, 'showing': state.showing})
+    return state.winner
 
 if __name__ == '__main__':
     # Parse command line arguments
@@ -543,4 +511,4 @@ if __name__ == '__main__':
         print("🎪 Get ready for Pat Sajak commentary and player personalities!")
     print()
     
-    play_random_game(type_of_players, enable_commentary)
\ No newline at end of file
+    play_random_game(type_of_players, enable_commentary, listeners=[ConsoleListener()])
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Puzzle Sampler for Wheel of Fortune
+Loads one split of the puzzle corpus (valid, train, test ...) into memory once
+and draws puzzles from it in O(1), so games never go back to the disk.
+
+Draws can be restricted to a category, a round type (``R1``, ``T1``, ``BR``
+...), a puzzle length (letters only) or a word count, seeded through any
+``random.Random``, made without replacement, or stratified so every round
+type (say) is equally likely. ``sweep`` walks the split exactly once for
+exhaustive evaluation.
+"""
+
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from corpus_snapshot import load_snapshot
+except Exception:
+    from src.PlayGame.corpus_snapshot import load_snapshot
+
+Puzzle = Tuple[str, str, str, str]
+
+# Attributes draws can be filtered or stratified on
+FILTER_FIELDS = ("category", "round", "length", "words")
+
+_SAMPLERS: Dict[Tuple[str, str], 'PuzzleSampler'] = {}
+
+
+def _wanted(value) -> Optional[frozenset]:
+    """A filter value as a set of allowed values (None allows anything)."""
+    if value is None:
+        return None
+    if isinstance(value, (str, int)):
+        return frozenset([value])
+    return frozenset(value)
+
+
+class PuzzleSampler:
+    """
+    Every puzzle of one split, as ``(puzzle, clue, date, game_type)`` records.
+
+    Filters accept a single value or a collection, e.g.
+    ``sample(rng, round=["R1", "R2"], length=range(10, 21))``.
+    """
+
+    def __init__(self, split: str = "valid", puzzles_dir=None, rng: random.Random = None):
+        snapshot = load_snapshot(puzzles_dir)
+        name = split if split.endswith(".csv") else split + ".csv"
+        rows = snapshot.source_rows(snapshot.puzzles_dir / name)
+        if rows is None:
+            raise ValueError(f"No puzzle split named {split!r} in {snapshot.puzzles_dir}")
+
+        self.split = split
+        self.rng = rng or random.Random()
+        self.records: List[Puzzle] = []
+        self.attributes: Dict[str, list] = {field: [] for field in FILTER_FIELDS}
+        for i in rows:
+            if snapshot.field_count(i) < 4:
+                continue
+            puzzle, clue, date, game_type = snapshot.record(i)
+            clue = clue.replace("&amp;", "&") # HTML Code
+            puzzle = puzzle.replace("&amp;", "&") # HTML Code
+            self.records.append((puzzle, clue, date, game_type))
+            self.attributes["category"].append(clue)
+            self.attributes["round"].append(game_type)
+            self.attributes["length"].append(sum(ch.isalpha() for ch in puzzle))
+            self.attributes["words"].append(sum(any(ch.isalpha() for ch in word) for word in puzzle.split()))
+
+        self._matches: Dict[tuple, List[int]] = {}
+        self._strata: Dict[tuple, List[List[int]]] = {}
+        self._unused: Dict[tuple, List[int]] = {}
+        self._positions: Dict[Puzzle, int] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _key(self, filters: dict) -> tuple:
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown puzzle filter(s): {', '.join(sorted(unknown))}")
+        return tuple(_wanted(filters.get(field)) for field in FILTER_FIELDS)
+
+    def indices(self, **filters) -> List[int]:
+        """Positions (into ``records``) of the puzzles passing ``filters``, in file order."""
+        key = self._key(filters)
+        matches = self._matches.get(key)
+        if matches is None:
+            matches = list(range(len(self.records)))
+            for field, wanted in zip(FILTER_FIELDS, key):
+                if wanted is not None:
+                    values = self.attributes[field]
+                    matches = [i for i in matches if values[i] in wanted]
+            self._matches[key] = matches
+        return matches
+
+    def strata(self, by: str, **filters) -> Dict[object, List[int]]:
+        """The matching positions grouped by one attribute."""
+        if by not in FILTER_FIELDS:
+            raise TypeError(f"Cannot stratify on {by!r}")
+        groups: Dict[object, List[int]] = {}
+        values = self.attributes[by]
+        for i in self.indices(**filters):
+            groups.setdefault(values[i], []).append(i)
+        return groups
+
+    def sample(self, rng: random.Random = None, replace: bool = True, stratify_by: str = None,
+               **filters) -> Puzzle:
+        """
+        Draw one puzzle.
+
+        Args:
+            rng: Random source (defaults to the sampler's own)
+            replace: False draws without replacement: each matching puzzle
+                comes up once before any repeats
+            stratify_by: Pick a value of this attribute uniformly first, then
+                a puzzle within it
+            **filters: Restrict the draw by category, round, length or words
+        """
+        rng = rng or self.rng
+        key = self._key(filters)
+        if stratify_by is not None:
+            groups = self._strata.get((stratify_by,) + key)
+            if groups is None:
+                groups = [group for _, group in sorted(self.strata(stratify_by, **filters).items(), key=lambda kv: str(kv[0]))]
+                self._strata[(stratify_by,) + key] = groups
+            if not groups:
+                raise ValueError(f"No puzzles in the {self.split} split match {filters}")
+            group = rng.randrange(len(groups))
+            pool = groups[group]
+        else:
+            group = None
+            pool = self.indices(**filters)
+            if not pool:
+                raise ValueError(f"No puzzles in the {self.split} split match {filters}")
+
+        if replace:
+            return self.records[pool[rng.randrange(len(pool))]]
+
+        # Swap-remove from what's left of this pool; refill once it runs dry
+        unused_key = (stratify_by, group) + key
+        unused = self._unused.get(unused_key)
+        if not unused:
+            unused = self._unused[unused_key] = list(pool)
+        j = rng.randrange(len(unused))
+        unused[j], unused[-1] = unused[-1], unused[j]
+        return self.records[unused.pop()]
+
+    def reset(self):
+        """Forget earlier draws made without replacement."""
+        self._unused.clear()
+
+    def at(self, position: int, **filters) -> Puzzle:
+        """The ``position``-th matching puzzle in file order (as ``sweep`` yields them)."""
+        return self.records[self.indices(**filters)[position]]
+
+    def position(self, record: Puzzle) -> Optional[int]:
+        """Position of ``record`` in ``records`` (its first copy), or None if not in this split."""
+        if self._positions is None:
+            self._positions = {}
+            for i, known in enumerate(self.records):
+                self._positions.setdefault(known, i)
+        return self._positions.get(tuple(record))
+
+    def sweep(self, rng: random.Random = None, shuffle: bool = False, **filters) -> Iterator[Puzzle]:
+        """Yield every matching puzzle exactly once, in file order or shuffled by ``rng``."""
+        order = list(self.indices(**filters))
+        if shuffle:
+            (rng or self.rng).shuffle(order)
+        for i in order:
+            yield self.records[i]
+
+
+def get_sampler(split: str = "valid", puzzles_dir=None) -> PuzzleSampler:
+    """Shared sampler for a split, loaded on first use."""
+    key = (split, str(puzzles_dir))
+    sampler = _SAMPLERS.get(key)
+    if sampler is None:
+        sampler = _SAMPLERS[key] = PuzzleSampler(split, puzzles_dir)
+    return sampler
@@ -15,6 +15,8 @@ import random
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 
+from decision_timing import timed_phase
+
 
 def estimate_entropy(showing: str, category: str = None) -> float:
     """
@@ -356,12 +358,14 @@ def expected_value_of_spinning(
     return spin_expected_value
 
 
+@timed_phase
 def should_solve_now(
     showing: str, 
     scores: List[int], 
     player_index: int,
     category: str = None,
-    previous_guesses: List[str] = None
+    previous_guesses: List[str] = None,
+    base_solve_threshold: float = 0.7
 ) -> Tuple[bool, str, Dict[str, float]]:
     """
     Main decision function: should the AI solve the puzzle now?
@@ -372,6 +376,7 @@ def should_solve_now(
         player_index: Index of current player
         category: Puzzle category
         previous_guesses: Letters already guessed
+        base_solve_threshold: Solve probability needed before the situational adjustments
     
     Returns:
         Tuple of (should_solve, reasoning, analysis_data)
@@ -389,8 +394,6 @@ def should_solve_now(
     max_opponent_score = max(scores[:player_index] + scores[player_index+1:]) if len(scores) > 1 else 0
     
     # Calculate solve threshold based on multiple factors
-    base_solve_threshold = 0.7  # Base probability threshold for solving
-    
     # Adjust threshold based on game situation
     if current_score < max_opponent_score:
         # Behind - need to take more risks, lower threshold
@@ -8,7 +8,8 @@ This AI player makes strategic decisions about:
 3. Risk assessment based on game state and opponent scores
 """
 
-from typing import Tuple, List, Optional
+import re
+from typing import Callable, Tuple, List, Optional
 from solve_decision import should_solve_now, estimate_entropy, estimate_solve_probability
 from smart_decision import should_spin_or_buy_vowel, get_best_vowel_guess, get_best_consonant_guess
 
@@ -21,17 +22,24 @@ class SolveTimingAI:
     analysis of when to solve the puzzle early versus continuing to play.
     """
     
-    def __init__(self, risk_tolerance: float = 0.5, solve_aggressiveness: float = 0.5):
+    def __init__(self, risk_tolerance: float = 0.5, solve_aggressiveness: float = 0.5,
+                 base_solve_threshold: float = None):
         """
         Initialize the SolveTimingAI with configurable parameters.
         
         Args:
             risk_tolerance: How much risk to take (0.0 = very conservative, 1.0 = very aggressive)
             solve_aggressiveness: How eager to solve early (0.0 = wait longer, 1.0 = solve quickly)
+            base_solve_threshold: If given, solve once the adjusted probability reaches
+                ``should_solve_now``'s situational threshold built from this base,
+                instead of the fixed threshold of the solve personality
         """
         self.risk_tolerance = max(0.0, min(1.0, risk_tolerance))
         self.solve_aggressiveness = max(0.0, min(1.0, solve_aggressiveness))
+        self.base_solve_threshold = base_solve_threshold
         self.name = f"SolveTimingAI(risk={risk_tolerance:.1f}, solve={solve_aggressiveness:.1f})"
+        if base_solve_threshold is not None:
+            self.name = self.name[:-1] + f", threshold={base_solve_threshold:.2f})"
     
     def make_turn_decision(
         self, 
@@ -64,7 +72,8 @@ class SolveTimingAI:
         
         # Step 1: Decide if we should solve now
         should_solve, solve_reasoning, solve_analysis = should_solve_now(
-            showing, winnings, player_index, category, previous_guesses
+            showing, winnings, player_index, category, previous_guesses,
+            base_solve_threshold=0.7 if self.base_solve_threshold is None else self.base_solve_threshold
         )
         
         # Adjust solve decision based on AI personality
@@ -79,7 +88,9 @@ class SolveTimingAI:
         print(f"  Score vs Opponents: {solve_analysis['score_difference']:+d}")
         
         # Apply personality adjustment to solve decision
-        if self.solve_aggressiveness > 0.7:  # Aggressive solver
+        if self.base_solve_threshold is not None:  # Tuned threshold
+            should_solve = adjusted_solve_prob >= solve_analysis['solve_threshold']
+        elif self.solve_aggressiveness > 0.7:  # Aggressive solver
             should_solve = adjusted_solve_prob >= 0.6
         elif self.solve_aggressiveness < 0.3:  # Conservative solver
             should_solve = adjusted_solve_prob >= 0.8
@@ -261,6 +272,43 @@ def computer_turn_solve_timing_balanced(showing, winnings, previous_guesses, tur
     return computer_turn_solve_timing_ai(showing, winnings, previous_guesses, turn, puzzle, category, balanced_ai)
 
 
+# Parameterized variants, named like 'solve_timing(risk=0.2,solve=0.8,threshold=0.65)'
+SOLVE_TIMING_VARIANT = re.compile(r"solve_timing\((.*)\)$")
+SOLVE_TIMING_PARAMETERS = {'risk': 'risk_tolerance', 'solve': 'solve_aggressiveness',
+                           'threshold': 'base_solve_threshold'}
+
+
+def solve_timing_player_type(risk_tolerance: float = 0.5, solve_aggressiveness: float = 0.5,
+                             base_solve_threshold: float = None) -> str:
+    """Player type name for a SolveTimingAI with these parameters."""
+    name = f"solve_timing(risk={risk_tolerance:g},solve={solve_aggressiveness:g}"
+    if base_solve_threshold is not None:
+        name += f",threshold={base_solve_threshold:g}"
+    return name + ")"
+
+
+def solve_timing_variant(player_type: str) -> Optional[Callable]:
+    """
+    Turn function for a parameterized player type such as
+    'solve_timing(risk=0.2,solve=0.8,threshold=0.65)' (omitted parameters
+    keep their defaults), or None if the name is not one.
+    """
+    match = SOLVE_TIMING_VARIANT.match(player_type)
+    if match is None:
+        return None
+    parameters = {}
+    for assignment in filter(None, match.group(1).split(',')):
+        name, _, value = assignment.partition('=')
+        if name.strip() not in SOLVE_TIMING_PARAMETERS:
+            raise ValueError(f"Unknown SolveTimingAI parameter {name.strip()!r} in {player_type!r}")
+        parameters[SOLVE_TIMING_PARAMETERS[name.strip()]] = float(value)
+    variant_ai = SolveTimingAI(**parameters)
+
+    def computer_turn_solve_timing_variant(showing, winnings, previous_guesses, turn, puzzle=None, category=None):
+        return computer_turn_solve_timing_ai(showing, winnings, previous_guesses, turn, puzzle, category, variant_ai)
+    return computer_turn_solve_timing_variant
+
+
 # Test the AI
 if __name__ == "__main__":
     # Test scenarios
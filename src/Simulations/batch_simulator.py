@@ -0,0 +1,325 @@
+"""
+Batch Simulator - Thousands of Games in Lockstep
+Plays many games of one matchup at once with NumPy, for strategies whose
+moves depend only on the board, the called letters and the money.
+
+Each game is a row: the puzzle as per-letter counts, the called letters as a
+26-bit mask, the three players' winnings and whose turn it is. One ``step``
+moves every unfinished game forward by one action, with the seat policies
+and the wheel vectorized across games.
+
+Policies:
+- ``alphabetical``, ``morse``, ``oxford``: the fixed letter orders of
+  ``computer_turn``, ``computer_turn_morse`` and ``computer_turn_oxford``
+- ``smart``, ``conservative``, ``aggressive``: the spin/vowel rule of
+  ``should_spin_or_buy_vowel`` (and the smart players' adjustments to it),
+  picking letters by English frequency as the smart players do.
+
+Usage:
+    python batch_simulator.py morse oxford smart --games 100000 --seed 1
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Add the PlayGame directory to the path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'PlayGame'))
+
+from game_engine import VOWEL_COST, VOWELS, WHEEL_VALUES
+from puzzle_sampler import PuzzleSampler, get_sampler
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Letter orders of the simple computer players in play_random_puzzle.py
+LETTER_ORDERS = {
+    'alphabetical': "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    'morse': "ETAINOSHRDLUCMFWYGPBVKQJXZ",
+    'oxford': "EARIOTNSLCUDPMHGBFYWKVXZJQ",
+}
+
+# Frequency orders and tables of smart_decision.py
+SMART_VOWEL_ORDER = "EAOIU"
+SMART_CONSONANT_ORDER = "TNSHRDLCMWFGYPBVKJXQZ"
+SMART_VOWEL_FREQUENCIES = {'A': 0.082, 'E': 0.127, 'I': 0.070, 'O': 0.075, 'U': 0.028}
+
+SMART_POLICIES = ('smart', 'conservative', 'aggressive')
+POLICIES = tuple(LETTER_ORDERS) + SMART_POLICIES
+
+# Actions a policy can take
+_REPEAT, _BUY, _SPIN = 0, 1, 2
+
+
+def _letter_index(letters: str) -> 'np.ndarray':
+    return np.array([ALPHABET.index(ch) for ch in letters], dtype=np.int64)
+
+
+class BatchSimulator:
+    """Plays batches of games between the vectorized policies."""
+
+    def __init__(self, sampler: PuzzleSampler = None, puzzle_filters: Dict[str, Any] = None,
+                 seed: int = None):
+        """
+        Args:
+            sampler: Puzzles to play (the valid split by default)
+            puzzle_filters: Only play puzzles matching these ``PuzzleSampler`` filters
+            seed: Seed for the puzzle draws and the wheel
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("BatchSimulator needs NumPy. Run: pip install numpy")
+        self.sampler = sampler or get_sampler("valid")
+        self.pool = np.array(self.sampler.indices(**(puzzle_filters or {})), dtype=np.int64)
+        if not len(self.pool):
+            raise ValueError("No puzzles match the puzzle filters")
+        self.rng = np.random.default_rng(seed)
+        self.wheel_values = np.array(WHEEL_VALUES, dtype=np.int64)
+
+        # Per-puzzle letter counts and board sizes, for the whole split
+        records = self.sampler.records
+        self.letter_counts = np.zeros((len(records), 26), dtype=np.int64)
+        self.board_sizes = np.zeros(len(records), dtype=np.int64)
+        for i, (puzzle, _, _, _) in enumerate(records):
+            for ch in puzzle:
+                if 'A' <= ch <= 'Z':
+                    self.letter_counts[i, ord(ch) - 65] += 1
+            self.board_sizes[i] = len(puzzle.replace(' ', ''))
+
+        self._is_vowel = np.array([ch in VOWELS for ch in ALPHABET])
+        self._bits = np.int64(1) << np.arange(26, dtype=np.int64)
+        self._smart_vowels = _letter_index(SMART_VOWEL_ORDER)
+        self._smart_consonants = _letter_index(SMART_CONSONANT_ORDER)
+        self._vowel_freq = np.zeros(26)
+        for ch, freq in SMART_VOWEL_FREQUENCIES.items():
+            self._vowel_freq[ALPHABET.index(ch)] = freq
+
+        positive = [v for v in WHEEL_VALUES if v > 0]
+        self._average_positive_value = sum(positive) / len(positive)
+        self._success_probability = len(positive) / len(WHEEL_VALUES)
+        self._risk_penalty = (WHEEL_VALUES.count(-1) / len(WHEEL_VALUES) * 500 +
+                              WHEEL_VALUES.count(0) / len(WHEEL_VALUES) * 200)
+
+    def run(self, player_types: List[str], games: int, max_turns: int = 200) -> Dict[str, 'np.ndarray']:
+        """
+        Play ``games`` games of one matchup to completion.
+
+        Follows ``GameSimulator.simulate_game``: a correct letter keeps the
+        turn, the game ends when the board is full (highest winnings wins) or
+        after ``max_turns`` turns (highest positive winnings, else -1).
+
+        Returns:
+            Arrays with one entry per game: ``puzzle`` (index into the
+            sampler's records), ``winner``, ``final_winnings`` (games x 3),
+            ``turns_taken``, ``letters_guessed``, ``vowels_bought`` and
+            ``bankruptcies``
+        """
+        for player_type in player_types:
+            if player_type not in POLICIES:
+                raise ValueError(f"No batch policy for {player_type!r}; choose from {', '.join(POLICIES)}")
+
+        puzzle = self.pool[self.rng.integers(len(self.pool), size=games)]
+        state = {
+            'counts': self.letter_counts[puzzle],
+            'board_size': self.board_sizes[puzzle],
+            'guessed': np.zeros(games, dtype=np.int64),
+            'winnings': np.zeros((games, 3), dtype=np.int64),
+            'turn': np.zeros(games, dtype=np.int64),
+            'turns_taken': np.zeros(games, dtype=np.int64),
+            'letters_guessed': np.zeros(games, dtype=np.int64),
+            'vowels_bought': np.zeros(games, dtype=np.int64),
+            'bankruptcies': np.zeros(games, dtype=np.int64),
+        }
+        present = (state['counts'] > 0) @ self._bits
+        state['total_letters'] = state['counts'].sum(axis=1)
+
+        while True:
+            remaining = present & ~state['guessed']
+            active = np.nonzero((remaining != 0) & (state['turn'] < max_turns))[0]
+            if not len(active):
+                break
+            self._step(state, active, player_types)
+
+        winnings = state['winnings']
+        complete = (present & ~state['guessed']) == 0
+        best = winnings.max(axis=1)
+        winner = np.where(complete | (best > 0), winnings.argmax(axis=1), -1)
+        return {
+            'puzzle': puzzle,
+            'winner': winner,
+            'final_winnings': winnings,
+            'turns_taken': state['turns_taken'],
+            'letters_guessed': state['letters_guessed'],
+            'vowels_bought': state['vowels_bought'],
+            'bankruptcies': state['bankruptcies'],
+        }
+
+    def _step(self, state: Dict[str, 'np.ndarray'], active: 'np.ndarray', player_types: List[str]):
+        """Every game in ``active`` takes one action."""
+        seat = state['turn'][active] % 3
+        action = np.empty(len(active), dtype=np.int64)
+        letter = np.empty(len(active), dtype=np.int64)
+        for s, player_type in enumerate(player_types):
+            mine = seat == s
+            if mine.any():
+                action[mine], letter[mine] = self._policy(player_type, state, active[mine], s)
+
+        rows = active
+        winnings = state['winnings']
+        state['turns_taken'][rows] += 1
+
+        buy = action == _BUY
+        winnings[rows[buy], seat[buy]] -= VOWEL_COST
+
+        spin = action == _SPIN
+        dollar = np.zeros(len(rows), dtype=np.int64)
+        dollar[spin] = self.wheel_values[self.rng.integers(len(self.wheel_values), size=int(spin.sum()))]
+        bankrupt = spin & (dollar == -1)
+        winnings[rows[bankrupt], seat[bankrupt]] = 0
+        state['bankruptcies'][rows[bankrupt]] += 1
+        lost = spin & (dollar <= 0)
+
+        # A letter already on the board (or nothing left to call) passes the turn
+        guessing = (action != _REPEAT) & ~lost
+        bit = np.where(letter >= 0, np.int64(1) << np.maximum(letter, 0), 0)
+        repeat = ~guessing | (letter < 0) | ((state['guessed'][rows] & bit) != 0)
+        calls = ~repeat
+        state['guessed'][rows[calls]] |= bit[calls]
+        is_vowel = self._is_vowel[np.maximum(letter, 0)]
+        state['vowels_bought'][rows[calls & is_vowel]] += 1
+        state['letters_guessed'][rows[calls & ~is_vowel]] += 1
+
+        hits = state['counts'][rows, np.maximum(letter, 0)]
+        scored = calls & (hits > 0)
+        winnings[rows[scored], seat[scored]] += dollar[scored] * hits[scored]
+        state['turn'][rows[~scored]] += 1
+
+    def _policy(self, player_type: str, state: Dict[str, 'np.ndarray'], rows: 'np.ndarray', seat: int):
+        """``(action, letter)`` for each game in ``rows``; letter -1 means nothing left to call."""
+        guessed = (state['guessed'][rows, None] & self._bits) != 0
+        winnings = state['winnings'][rows, seat]
+        if player_type in LETTER_ORDERS:
+            return self._ordered_policy(_letter_index(LETTER_ORDERS[player_type]), guessed, winnings)
+        return self._smart_policy(player_type, state, rows, guessed, winnings)
+
+    def _first_unguessed(self, order: 'np.ndarray', guessed: 'np.ndarray', allowed=None) -> 'np.ndarray':
+        open_letters = ~guessed[:, order]
+        if allowed is not None:
+            open_letters &= allowed
+        first = open_letters.argmax(axis=1)
+        return np.where(open_letters.any(axis=1), order[first], -1)
+
+    def _ordered_policy(self, order: 'np.ndarray', guessed: 'np.ndarray', winnings: 'np.ndarray'):
+        # The first letter in order that is a consonant or a vowel the player can afford
+        can_afford = (winnings >= VOWEL_COST)[:, None]
+        allowed = ~self._is_vowel[order][None, :] | can_afford
+        letter = self._first_unguessed(order, guessed, allowed)
+        action = np.where(letter < 0, _REPEAT, np.where(self._is_vowel[np.maximum(letter, 0)], _BUY, _SPIN))
+        return action, letter
+
+    def smart_decisions(self, counts: 'np.ndarray', guessed: 'np.ndarray', winnings: 'np.ndarray',
+                        board_size: 'np.ndarray', player_type: str = 'smart') -> 'np.ndarray':
+        """
+        Vectorized ``should_spin_or_buy_vowel`` (with the conservative and
+        aggressive adjustments): True where the player buys a vowel.
+
+        Args:
+            counts: Letter counts of each puzzle (games x 26)
+            guessed: Called letters (games x 26, bool)
+            winnings: The deciding player's winnings
+            board_size: Non-space characters on each board
+        """
+        hidden = np.where(guessed, 0, counts)
+        total_letters = counts.sum(axis=1)
+        blank_count = hidden.sum(axis=1)
+        revealed_count = total_letters - blank_count
+        vowels_revealed = (counts - hidden)[:, self._is_vowel].sum(axis=1)
+        consonants_revealed = revealed_count - vowels_revealed
+        completion = np.divide(revealed_count, total_letters, out=np.zeros(len(counts)), where=total_letters > 0)
+
+        estimated_total_vowels = np.maximum(1, (total_letters * 0.4).astype(np.int64))
+        estimated_total_consonants = total_letters - estimated_total_vowels
+        remaining_vowels = np.maximum(0, estimated_total_vowels - vowels_revealed)
+        remaining_consonants = np.maximum(0, estimated_total_consonants - consonants_revealed)
+        vowel_density = np.divide(remaining_vowels, blank_count, out=np.zeros(len(counts)), where=blank_count > 0)
+
+        best_vowel_freq = np.where(guessed, 0.0, self._vowel_freq).max(axis=1)
+        expected_letters = vowel_density * blank_count * best_vowel_freq * 2
+
+        spin_expected = self._average_positive_value * self._success_probability * np.minimum(3, remaining_consonants)
+        spin_score = spin_expected * 0.3 - self._risk_penalty * 0.2
+        buy_vowel_score = expected_letters * 100 * 0.3
+        buy_vowel_score = buy_vowel_score + np.where(completion < 0.3, 100, 0)
+        spin_score = spin_score + np.where(completion > 0.6, 100, 0)
+        buy_vowel_score = buy_vowel_score + np.where(vowel_density > 0.4, 150, 0)
+        spin_score = spin_score + np.where(vowel_density < 0.2, 100, 0)
+        spin_score = spin_score + np.where(winnings > 1000, 50, 0)
+        buy_vowel_score = buy_vowel_score + np.where(winnings < 500, 75, 0)
+
+        # Too poor to buy, or close enough to solve (which these players treat as a spin)
+        buy = (winnings >= 250) & (completion <= 0.8) & (buy_vowel_score > spin_score)
+
+        if player_type == 'conservative':
+            vowels_guessed = guessed[:, self._is_vowel].sum(axis=1)
+            spin = (winnings >= 250) & (completion <= 0.8) & ~buy
+            buy |= spin & (blank_count > 3) & (vowels_guessed < 3)
+        elif player_type == 'aggressive':
+            buy &= ~(blank_count / np.maximum(1, board_size) < 0.5)
+        return buy
+
+    def _smart_policy(self, player_type: str, state: Dict[str, 'np.ndarray'], rows: 'np.ndarray',
+                      guessed: 'np.ndarray', winnings: 'np.ndarray'):
+        buy = self.smart_decisions(state['counts'][rows], guessed, winnings, state['board_size'][rows], player_type)
+        vowel = self._first_unguessed(self._smart_vowels, guessed)
+        consonant = self._first_unguessed(self._smart_consonants, guessed)
+        # With every vowel or consonant called, the smart players fall back to 'E' or 'T'
+        letter = np.where(buy, np.where(vowel < 0, ALPHABET.index('E'), vowel),
+                          np.where(consonant < 0, ALPHABET.index('T'), consonant))
+        return np.where(buy, _BUY, _SPIN), letter
+
+    def summarize(self, player_types: List[str], results: Dict[str, 'np.ndarray']) -> Dict[str, Any]:
+        """Totals in the shape of a ``run_tournament`` combination entry."""
+        games = len(results['winner'])
+        winner = results['winner']
+        return {
+            'games_played': games,
+            'wins_by_player': [int((winner == i).sum()) for i in range(3)],
+            'total_winnings': results['final_winnings'].sum(axis=0).tolist(),
+            'avg_winnings': results['final_winnings'].mean(axis=0).tolist() if games else [0, 0, 0],
+            'avg_turns': float(results['turns_taken'].mean()) if games else 0,
+            'successful_solves': int((winner >= 0).sum()),
+            'bankruptcies': int(results['bankruptcies'].sum()),
+            'player_types': list(player_types),
+        }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Play many games of one matchup in lockstep.")
+    parser.add_argument('players', nargs=3, choices=POLICIES, help="policy for each seat")
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--max-turns', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    simulator = BatchSimulator(seed=args.seed)
+    start = time.perf_counter()
+    results = simulator.run(args.players, args.games, args.max_turns)
+    elapsed = time.perf_counter() - start
+    summary = simulator.summarize(args.players, results)
+
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:,.0f} games/sec)")
+    print(f"Average turns: {summary['avg_turns']:.1f}  Bankruptcies: {summary['bankruptcies']}")
+    for i, player in enumerate(args.players):
+        print(f"  Player {i} ({player:12}): {summary['wins_by_player'][i]:6d} wins "
+              f"({summary['wins_by_player'][i] / args.games * 100:5.1f}%) | Avg: ${summary['avg_winnings'][i]:6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Rating Ladders for Tournament Games
+Turns a stream of per-game records (as written by ``GameRecordSink``) into
+one rating per player type, so AI variants can be ranked against each other
+without playing every three-way matchup.
+
+Each game is read as a finishing order: the winner first, the other two by
+winnings (equal winnings tie). Two ladders are available:
+- ``EloLadder``: classic Elo over the three pairings of a game
+- ``GaussianLadder``: a TrueSkill-style mean and uncertainty per player,
+  updated with Weng and Lin's closed-form Bradley-Terry rule (no factor graph
+  or extra dependency needed)
+
+Both cost O(1) per game. Usage:
+    python ratings.py results.jsonl --system trueskill
+"""
+
+import argparse
+import csv
+import json
+import math
+from typing import Any, Dict, Iterable, Iterator, List
+
+RATING_SYSTEMS = ('elo', 'trueskill')
+
+
+def finishing_ranks(record: Dict[str, Any]) -> List[int]:
+    """Rank of each seat in a game record (0 is best, equal winnings share a rank)."""
+    winner = int(record['winner'])
+    winnings = [int(record[f'player_{i}_winnings']) for i in range(3)]
+    ranks = []
+    for i in range(3):
+        if i == winner:
+            ranks.append(0)
+        else:
+            ahead = sum(1 for j in range(3) if j != i and (j == winner or winnings[j] > winnings[i]))
+            ranks.append(ahead)
+    return ranks
+
+
+class EloLadder:
+    """Elo ratings; a three-player game counts as its three head-to-head results."""
+
+    def __init__(self, k: float = 16.0, initial: float = 1500.0):
+        self.k = k
+        self.initial = initial
+        self.ratings: Dict[str, float] = {}
+        self.games: Dict[str, int] = {}
+
+    def record_game(self, record: Dict[str, Any]):
+        """Update the ladder from one game record."""
+        self.update([record[f'player_{i}_type'] for i in range(3)], finishing_ranks(record))
+
+    def update(self, player_types: List[str], ranks: List[int]):
+        """Update from one game's seats and finishing ranks (lower is better)."""
+        before = [self.ratings.get(player, self.initial) for player in player_types]
+        deltas = [0.0] * len(player_types)
+        for i in range(len(player_types)):
+            for j in range(i + 1, len(player_types)):
+                if player_types[i] == player_types[j]:
+                    continue  # A type playing itself tells us nothing
+                expected = 1 / (1 + 10 ** ((before[j] - before[i]) / 400))
+                score = 1.0 if ranks[i] < ranks[j] else 0.5 if ranks[i] == ranks[j] else 0.0
+                deltas[i] += self.k * (score - expected)
+                deltas[j] -= self.k * (score - expected)
+        for player, delta in zip(player_types, deltas):
+            self.ratings[player] = self.ratings.get(player, self.initial) + delta
+        for player in set(player_types):
+            self.games[player] = self.games.get(player, 0) + 1
+
+    def table(self) -> List[Dict[str, Any]]:
+        """Players, best first."""
+        rows = [{'player': player, 'rating': rating, 'games': self.games[player]}
+                for player, rating in self.ratings.items()]
+        return sorted(rows, key=lambda row: -row['rating'])
+
+    def state(self) -> Dict[str, Any]:
+        return {'system': 'elo', 'k': self.k, 'initial': self.initial,
+                'ratings': self.ratings, 'games': self.games}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'EloLadder':
+        ladder = cls(state['k'], state['initial'])
+        ladder.ratings = dict(state['ratings'])
+        ladder.games = dict(state['games'])
+        return ladder
+
+
+class GaussianLadder:
+    """
+    TrueSkill-style ratings: each player is a skill estimate ``mu`` with
+    uncertainty ``sigma``, ranked by the conservative ``mu - 3 * sigma``.
+    """
+
+    def __init__(self, mu: float = 25.0, sigma: float = 25.0 / 3, beta: float = 25.0 / 6,
+                 kappa: float = 0.0001):
+        self.mu = mu
+        self.sigma = sigma
+        self.beta = beta
+        self.kappa = kappa
+        self.ratings: Dict[str, List[float]] = {}
+        self.games: Dict[str, int] = {}
+
+    def record_game(self, record: Dict[str, Any]):
+        """Update the ladder from one game record."""
+        self.update([record[f'player_{i}_type'] for i in range(3)], finishing_ranks(record))
+
+    def update(self, player_types: List[str], ranks: List[int]):
+        """Update from one game's seats and finishing ranks (lower is better)."""
+        before = [self.ratings.get(player, [self.mu, self.sigma]) for player in player_types]
+        mean_shift: Dict[str, float] = {}
+        variance_shrink: Dict[str, float] = {}
+        for i, (mu_i, sigma_i) in enumerate(before):
+            omega = delta = 0.0
+            for q, (mu_q, sigma_q) in enumerate(before):
+                if q == i or player_types[q] == player_types[i]:
+                    continue
+                c = math.sqrt(sigma_i ** 2 + sigma_q ** 2 + 2 * self.beta ** 2)
+                p = 1 / (1 + math.exp((mu_q - mu_i) / c))
+                score = 1.0 if ranks[i] < ranks[q] else 0.5 if ranks[i] == ranks[q] else 0.0
+                omega += sigma_i ** 2 / c * (score - p)
+                delta += (sigma_i / c) * sigma_i ** 2 / c ** 2 * p * (1 - p)
+            player = player_types[i]
+            mean_shift[player] = mean_shift.get(player, 0.0) + omega
+            variance_shrink[player] = variance_shrink.get(player, 0.0) + delta
+        for player, omega in mean_shift.items():
+            mu, sigma = self.ratings.get(player, [self.mu, self.sigma])
+            sigma = sigma * math.sqrt(max(1 - variance_shrink[player], self.kappa))
+            self.ratings[player] = [mu + omega, sigma]
+            self.games[player] = self.games.get(player, 0) + 1
+
+    def table(self) -> List[Dict[str, Any]]:
+        """Players, best first by ``mu - 3 * sigma``."""
+        rows = [{'player': player, 'rating': mu - 3 * sigma, 'mu': mu, 'sigma': sigma,
+                 'games': self.games[player]}
+                for player, (mu, sigma) in self.ratings.items()]
+        return sorted(rows, key=lambda row: -row['rating'])
+
+    def state(self) -> Dict[str, Any]:
+        return {'system': 'trueskill', 'mu': self.mu, 'sigma': self.sigma, 'beta': self.beta,
+                'kappa': self.kappa, 'ratings': self.ratings, 'games': self.games}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'GaussianLadder':
+        ladder = cls(state['mu'], state['sigma'], state['beta'], state['kappa'])
+        ladder.ratings = {player: list(rating) for player, rating in state['ratings'].items()}
+        ladder.games = dict(state['games'])
+        return ladder
+
+
+def new_ladder(system: str = 'elo'):
+    """An empty ladder for ``'elo'`` or ``'trueskill'``."""
+    if system == 'elo':
+        return EloLadder()
+    if system == 'trueskill':
+        return GaussianLadder()
+    raise ValueError(f"Unknown rating system {system!r}; choose from {', '.join(RATING_SYSTEMS)}")
+
+
+def ladder_from_state(state: Dict[str, Any]):
+    """Rebuild a ladder saved with ``state()``."""
+    return (EloLadder if state['system'] == 'elo' else GaussianLadder).from_state(state)
+
+
+def format_table(ladder) -> List[str]:
+    """Report lines for a ladder."""
+    lines = []
+    for place, row in enumerate(ladder.table(), 1):
+        line = f"{place:3}. {row['player']:40} | Rating: {row['rating']:7.1f}"
+        if 'sigma' in row:
+            line += f" (mu {row['mu']:5.1f}, sigma {row['sigma']:4.2f})"
+        lines.append(line + f" | Games: {row['games']}")
+    return lines
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the records of a JSONL or CSV results file."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if str(path).lower().endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def rate(records: Iterable[Dict[str, Any]], system: str = 'elo'):
+    """A ladder fed with every record, in order."""
+    ladder = new_ladder(system)
+    for record in records:
+        ladder.record_game(record)
+    return ladder
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Rate player types from streamed tournament records.")
+    parser.add_argument('results', nargs='+', help="JSONL or CSV files written with --results")
+    parser.add_argument('--system', choices=RATING_SYSTEMS, default='elo')
+    args = parser.parse_args(argv)
+
+    ladder = new_ladder(args.system)
+    for path in args.results:
+        for record in read_records(path):
+            ladder.record_game(record)
+    print("\n".join(format_table(ladder)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Streaming Results for Tournament Simulations
+Per-game records go straight to an append-only JSONL or CSV file and the
+summary numbers are kept by online accumulators, so a tournament's memory
+does not grow with the number of games and a crashed run keeps what it wrote.
+"""
+
+import csv
+import json
+import math
+import os
+from typing import Any, Dict, List
+
+# Columns of a per-game record, in CSV order
+RECORD_FIELDS = [
+    'combination', 'game_num', 'seed', 'rotation', 'player_0_type', 'player_1_type', 'player_2_type',
+    'winner', 'player_0_winnings', 'player_1_winnings', 'player_2_winnings',
+    'turns_taken', 'letters_guessed', 'vowels_bought', 'solve_attempts', 'bankruptcies',
+    'category', 'puzzle',
+]
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of numbers (Welford's algorithm)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: 'RunningStats'):
+        """Fold in another accumulator (Chan et al.'s pairwise update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def state(self) -> List[float]:
+        """``[count, mean, m2]``, enough to rebuild the accumulator exactly."""
+        return [self.count, self.mean, self.m2]
+
+    @classmethod
+    def from_state(cls, state: List[float]) -> 'RunningStats':
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = int(state[0]), float(state[1]), float(state[2])
+        return stats
+
+    def __eq__(self, other):
+        if not isinstance(other, RunningStats):
+            return NotImplemented
+        return (self.count, self.mean, self.m2) == (other.count, other.mean, other.m2)
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean:.4g}, stdev={self.stdev:.4g})"
+
+
+def game_record(combination: List[str], game_num: int, seed: int, game_result: Dict[str, Any],
+                rotation: int = 0) -> Dict[str, Any]:
+    """
+    Flatten a ``simulate_game`` result into one sink record. Player columns
+    follow the seats as played, which differ from ``combination`` when the
+    seats were rotated.
+    """
+    seating = game_result.get('player_types') or combination
+    record = {
+        'combination': '-vs-'.join(combination),
+        'game_num': game_num,
+        'seed': seed,
+        'rotation': rotation,
+        'winner': game_result['winner'],
+        'turns_taken': game_result['turns_taken'],
+        'letters_guessed': game_result['letters_guessed'],
+        'vowels_bought': game_result['vowels_bought'],
+        'solve_attempts': game_result['solve_attempts'],
+        'bankruptcies': game_result['bankruptcies'],
+        'category': game_result['category'],
+        'puzzle': game_result['puzzle'],
+    }
+    for i in range(3):
+        record[f'player_{i}_type'] = seating[i]
+        record[f'player_{i}_winnings'] = game_result['final_winnings'][i]
+    return record
+
+
+class GameRecordSink:
+    """
+    Append-only writer for per-game records.
+
+    The format follows the file extension (``.csv``, anything else is JSONL).
+    Records are buffered and written ``flush_every`` at a time; ``flush`` also
+    pushes them to the OS so they survive the process dying.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1000):
+        self.path = path
+        self.format = 'csv' if str(path).lower().endswith('.csv') else 'jsonl'
+        self.flush_every = flush_every
+        self.records_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        needs_header = self.format == 'csv' and (not os.path.exists(path) or os.path.getsize(path) == 0)
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._csv = csv.DictWriter(self._file, fieldnames=RECORD_FIELDS) if self.format == 'csv' else None
+        if needs_header:
+            self._csv.writeheader()
+
+    def write(self, record: Dict[str, Any]):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            if self._csv is not None:
+                self._csv.writerows(self._buffer)
+            else:
+                self._file.write(''.join(json.dumps(record) + '\n' for record in self._buffer))
+            self.records_written += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def tell(self) -> int:
+        """Size of the file once everything written so far is flushed."""
+        self.flush()
+        return self._file.tell()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -12,30 +12,64 @@ This script:
 import sys
 import os
 import csv
+import io
+import json
 import random
+import re
+import tempfile
 import time
-from collections import defaultdict, Counter
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from collections import defaultdict, Counter, deque
 from typing import Dict, List, Tuple, Any
 import statistics
 
 # Add the PlayGame directory to the path so we can import modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'PlayGame'))
 
-from play_random_puzzle import get_random_puzzle, is_vowel, is_consonant, print_board
+from play_random_puzzle import is_consonant, print_board
 from smart_player import computer_turn_smart, computer_turn_smart_conservative, computer_turn_smart_aggressive
 from solve_timing_ai import (
     computer_turn_solve_timing_conservative, 
     computer_turn_solve_timing_aggressive, 
-    computer_turn_solve_timing_balanced
+    computer_turn_solve_timing_balanced,
+    solve_timing_variant
 )
+from puzzle_sampler import PuzzleSampler, get_sampler
+from results_sink import GameRecordSink, RunningStats, game_record
+from ratings import RATING_SYSTEMS, format_table, ladder_from_state, new_ladder
+from decision_timing import LatencyRecorder, recording, timed
+from game_replay import ReplayLog, ReplayRecorder
+from game_engine import WHEEL_VALUES, GameState, Wheel, apply_action, draw_spins, use_wheel
+from work_queue import Coordinator, parse_address, run_worker
+
+
+class _NullWriter(io.TextIOBase):
+    """Swallows the players' console output during quiet simulations."""
+
+    def write(self, text):
+        return len(text)
 
 
 class GameSimulator:
     """Simulates Wheel of Fortune games for AI evaluation."""
     
-    def __init__(self):
-        self.wheel_values = [0, -1, 500, 550, 600, 650, 700, 750, 800, 850, 900, -1,
-                            500, 550, 600, 650, 700, 750, 800, 850, 900, 500, 550, 600]
+    def __init__(self, rng: random.Random = None, sampler: PuzzleSampler = None,
+                 puzzle_filters: Dict[str, Any] = None):
+        """
+        Args:
+            rng: Source of randomness for puzzles and spins; pass a seeded
+                ``random.Random`` for reproducible games
+            sampler: Puzzles to play (the valid split by default)
+            puzzle_filters: Only play puzzles matching these ``PuzzleSampler``
+                filters, e.g. ``{'round': 'BR'}``
+        """
+        self.rng = rng or random.Random()
+        self.sampler = sampler or get_sampler("valid")
+        self.puzzle_filters = dict(puzzle_filters or {})
+        self.wheel_values = list(WHEEL_VALUES)
+        self.wheel = Wheel(self.wheel_values, rng=self.rng)
         
         # Available AI types and their functions
         self.ai_functions = {
@@ -47,37 +81,65 @@ class GameSimulator:
             'solve_aggressive': computer_turn_solve_timing_aggressive,
         }
     
+    def player_function(self, player_type: str):
+        """
+        Turn function for a player type, including parameterized SolveTimingAIs
+        such as ``solve_timing(risk=0.2,solve=0.8)``; unknown types play as smart.
+        """
+        if player_type not in self.ai_functions:
+            variant = solve_timing_variant(player_type)
+            if variant is not None:
+                self.ai_functions[player_type] = variant
+        return self.ai_functions.get(player_type, computer_turn_smart)
+    
     def spin_wheel(self) -> int:
         """Simulate spinning the wheel."""
-        return random.choice(self.wheel_values)
+        return self.wheel.spin()
     
-    def simulate_game(self, player_types: List[str], max_turns: int = 200, verbose: bool = False) -> Dict[str, Any]:
+    def simulate_game(self, player_types: List[str], max_turns: int = 200, verbose: bool = False,
+                      puzzle: Tuple[str, str, str, str] = None, spins: List[int] = None,
+                      replay: bool = False) -> Dict[str, Any]:
         """
         Simulate a single game between AI players.
         
+        Runs headless: spins come from this simulator's wheel, there are no
+        pauses, and the players' own output is dropped unless ``verbose``.
+        
         Args:
             player_types: List of AI type names for each player
             max_turns: Maximum turns before declaring a draw
             verbose: Whether to print game progress
+            puzzle: ``(puzzle, clue, date, category)`` to play instead of a random one
+            spins: Pre-drawn wheel spins to use, in order, before spinning at random
+            replay: Also return the game's replay (see ``game_replay.py``) as ``'replay'``
         
         Returns:
             Dictionary with game results and statistics
         """
+        wheel = self.wheel if spins is None else Wheel(self.wheel_values, rng=self.rng, spins=spins)
+        with use_wheel(wheel):
+            if verbose:
+                return self._play(player_types, max_turns, verbose, puzzle, wheel if replay else None)
+            with redirect_stdout(_NullWriter()):
+                return self._play(player_types, max_turns, verbose, puzzle, wheel if replay else None)
+    
+    def _play(self, player_types: List[str], max_turns: int, verbose: bool,
+              puzzle_record: Tuple[str, str, str, str] = None, replay_wheel: Wheel = None) -> Dict[str, Any]:
+        """Game loop for ``simulate_game``; records a replay when given the game's wheel."""
         # Get random puzzle
-        puzzle, clue, date, game_type = get_random_puzzle()
+        puzzle, clue, date, game_type = puzzle_record or self.sampler.sample(self.rng, **self.puzzle_filters)
         if verbose:
             print(f"Puzzle: {puzzle}")
             print(f"Category: {game_type}")
             print(f"Clue: {clue}")
         
         # Initialize game state
-        showing = puzzle
-        import re
-        showing = re.sub(r"[A-Z]", "_", showing)
-        
-        previous_guesses = []
-        turn = 0
-        winnings = [0, 0, 0]
+        state = GameState(puzzle, clue, date, game_type)
+        recorder = None
+        if replay_wheel is not None:
+            recorder = ReplayRecorder(state, player_types, split=self.sampler.split,
+                                      puzzle_id=self.sampler.position((puzzle, clue, date, game_type)))
+            replay_wheel.listeners.append(recorder)
         game_stats = {
             'turns_taken': 0,
             'letters_guessed': 0,
@@ -92,100 +154,73 @@ class GameSimulator:
         }
         
         # Game loop
-        while showing != puzzle and turn < max_turns:
-            player_index = turn % 3
+        while not state.board_complete and state.turn < max_turns:
+            player_index = state.player
             player_type = player_types[player_index]
             
             if verbose:
-                print(f"\nTurn {turn + 1}: Player {player_index} ({player_type})")
-                print(f"Current state: {showing}")
-                print(f"Winnings: {winnings}")
+                print(f"\nTurn {state.turn + 1}: Player {player_index} ({player_type})")
+                print(f"Current state: {state.showing}")
+                print(f"Winnings: {state.winnings}")
             
             # Get AI decision
+            if recorder:
+                recorder.begin_turn(state)
             try:
-                if player_type in self.ai_functions:
-                    ai_func = self.ai_functions[player_type]
-                    # Check if this is a solve timing AI (takes 6 args) or traditional AI (takes 4 args)
-                    if player_type.startswith('solve_'):
-                        guess, dollar = ai_func(showing, winnings, previous_guesses, turn, puzzle, game_type)
+                ai_func = self.player_function(player_type)  # Fallback to smart AI
+                # Solve timing AIs also get the puzzle and category
+                with timed('player:' + player_type):
+                    if player_type.startswith('solve_') and player_type in self.ai_functions:
+                        guess, dollar = ai_func(state.showing, state.winnings, state.previous_guesses, state.turn,
+                                                puzzle, game_type)
                     else:
-                        guess, dollar = ai_func(showing, winnings, previous_guesses, turn)
-                else:
-                    # Fallback to smart AI
-                    guess, dollar = computer_turn_smart(showing, winnings, previous_guesses, turn)
+                        guess, dollar = ai_func(state.showing, state.winnings, state.previous_guesses, state.turn)
                 
                 game_stats['turns_taken'] += 1
-                
-                # Handle solve attempts
-                if guess.startswith('SOLVE:'):
-                    solve_guess = guess[6:]
+                new_state, events = apply_action(state, guess, dollar)
+            except Exception as e:
+                if verbose:
+                    print(f"Error with {player_type}: {e}")
+                if recorder:
+                    recorder.end_turn(state, None, 0, state)
+                state.turn += 1
+                continue
+            if recorder:
+                recorder.end_turn(state, guess, dollar, new_state)
+            state = new_state
+            
+            for event in events:
+                kind = event['type']
+                if kind == 'solve_attempt':
                     game_stats['solve_attempts'] += 1
-                    
                     if verbose:
-                        print(f"Player {player_index} attempts to solve: '{solve_guess}'")
-                    
-                    if solve_guess == puzzle:
-                        game_stats['winner'] = player_index
-                        game_stats['final_winnings'] = winnings.copy()
-                        if verbose:
-                            print(f"CORRECT! Player {player_index} wins!")
-                        break
-                    else:
-                        if verbose:
-                            print("Wrong solution, next player")
-                        turn += 1
-                        continue
-                
-                # Handle letter guesses
-                if guess in previous_guesses and guess != "_":
+                        print(f"Player {player_index} attempts to solve: '{event['guess']}'")
+                        print(f"CORRECT! Player {player_index} wins!" if event['correct'] else "Wrong solution, next player")
+                elif kind == 'repeat_guess':
                     if verbose:
                         print("Already guessed, next player")
-                    turn += 1
-                    continue
-                
-                previous_guesses.append(guess)
-                
-                if guess == "_":  # Lost turn or bankrupt
-                    if dollar == -1:
-                        game_stats['bankruptcies'] += 1
-                        winnings[player_index] = 0
-                    turn += 1
-                    continue
-                
-                # Count letter types
-                if is_vowel(guess):
-                    game_stats['vowels_bought'] += 1
-                else:
-                    game_stats['letters_guessed'] += 1
-                
-                # Update puzzle state
-                correct_places = []
-                for pos, char in enumerate(puzzle):
-                    if char == guess:
-                        correct_places.append(pos)
-                
-                if len(correct_places) > 0:
-                    # Correct guess - add winnings and update showing
-                    winnings[player_index] += dollar * len(correct_places)
-                    for correct_letter in correct_places:
-                        showing = showing[:correct_letter] + guess + showing[correct_letter + 1:]
-                    
-                    if verbose:
-                        print(f"Correct! Found {len(correct_places)} instances")
-                else:
-                    # Wrong guess
+                elif kind == 'bankrupt':
+                    game_stats['bankruptcies'] += 1
+                elif kind in ('reveal', 'miss'):
+                    # Count letter types
+                    if event['vowel']:
+                        game_stats['vowels_bought'] += 1
+                    else:
+                        game_stats['letters_guessed'] += 1
                     if verbose:
-                        print("Not in puzzle, next player")
-                    turn += 1
-                
-            except Exception as e:
-                if verbose:
-                    print(f"Error with {player_type}: {e}")
-                turn += 1
+                        if kind == 'reveal':
+                            print(f"Correct! Found {event['count']} instances")
+                        else:
+                            print("Not in puzzle, next player")
+            
+            if state.is_over:
+                game_stats['winner'] = state.winner
+                break
         
         # Game ended - determine winner if not already set
+        winnings = state.winnings
         if game_stats['winner'] is None:
-            if showing == puzzle:
+            if state.board_complete:
                 # Puzzle completed by letters - highest score wins
                 max_winnings = max(winnings)
                 game_stats['winner'] = winnings.index(max_winnings)
@@ -198,6 +233,9 @@ class GameSimulator:
                     game_stats['winner'] = -1  # Draw
         
         game_stats['final_winnings'] = winnings.copy()
+        if recorder:
+            replay_wheel.listeners.remove(recorder)
+            game_stats['replay'] = recorder.finish(game_stats['winner'])
         
         return game_stats
     
@@ -205,92 +243,260 @@ class GameSimulator:
         self, 
         player_combinations: List[List[str]], 
         games_per_combination: int = 1000,
-        verbose: bool = False
+        verbose: bool = False,
+        workers: int = 1,
+        seed: int = None,
+        results_file: str = None,
+        checkpoint_file: str = None,
+        resume: bool = False,
+        paired: bool = False,
+        win_rate_ci: float = None,
+        winnings_ci: float = None,
+        alpha: float = 0.05,
+        min_games: int = 100,
+        exhaustive: bool = False,
+        ratings=None,
+        latency: LatencyRecorder = None,
+        replay_file: str = None,
+        coordinator: Coordinator = None
     ) -> Dict[str, Any]:
         """
         Run a tournament between different AI combinations.
         
+        Every game is played from its own seed, derived from ``seed``, the
+        combination and the game number, so the results are the same however
+        many workers share the games. Averages and spreads come from running
+        accumulators, so memory stays flat however many games are played.
+        
+        With a ``checkpoint_file``, the finished games and their accumulators
+        are saved after every shard; ``resume`` picks up from there and gives
+        the same results as a run that was never interrupted. A checkpoint
+        only resumes with the results and replay files it was saved with, and
+        those must still hold at least what the checkpoint counted.
+        
+        With ``paired``, game ``n`` of every matchup is played on the same
+        deal (puzzle and pre-drawn spins), once per seat rotation, so
+        strategies are compared on identical luck; ``games_per_combination``
+        then counts deals, each played three times.
+        
+        Given ``win_rate_ci`` and/or ``winnings_ci``, each combination stops
+        early once every player's win rate and average winnings are known to
+        within those half-widths at confidence ``1 - alpha``, so lopsided
+        matchups finish quickly and close ones run up to
+        ``games_per_combination``. The check runs after each shard, once
+        ``min_games`` are in, and normal intervals are used; repeated looks
+        make the achieved confidence somewhat lower than nominal, so keep
+        ``min_games`` well above a single shard.
+        
+        With ``exhaustive``, game ``n`` is played on the ``n``-th puzzle of
+        the simulator's split (after its ``puzzle_filters``), so every puzzle
+        is played exactly once per matchup and ``games_per_combination`` is
+        ignored.
+        
+        A ``ratings`` ladder (see ``ratings.py``) is fed every game as it is
+        merged, in game order, and is returned as ``results['ratings']``.
+        
+        A ``latency`` recorder collects the time of every player turn and
+        decision phase, from every worker, and is returned as
+        ``results['latency']``.
+        
+        With a started ``coordinator`` (see ``work_queue.py``), the shards are
+        handed to ``--worker`` processes connected to it, on this host or any
+        other, instead of a local pool; ``workers`` is then ignored. Workers
+        load the puzzles of this simulator's split themselves, so every host
+        needs the same data/puzzles files.
+        
         Args:
             player_combinations: List of player type combinations to test
             games_per_combination: Number of games to run for each combination
             verbose: Whether to print progress
+            workers: Number of processes to spread the games over (1 plays them here)
+            seed: Tournament seed; drawn from this simulator's RNG if not given
+            results_file: Append one record per game to this JSONL (or ``.csv``) file as games finish
+            checkpoint_file: Where to save progress as the tournament runs
+            resume: Continue from ``checkpoint_file`` if it exists
+            paired: Replay every matchup and seat rotation on common deals
+            win_rate_ci: Stop a combination once win-rate intervals are this narrow (e.g. 0.05 for +/-5 points)
+            winnings_ci: Stop a combination once winnings intervals are this narrow, in dollars
+            alpha: Significance level of those intervals
+            min_games: Games (deals when paired) to play before stopping early
+            exhaustive: Sweep every puzzle of the split once instead of sampling
+            ratings: ``EloLadder`` or ``GaussianLadder`` to update with every game
+            latency: ``LatencyRecorder`` for per-decision timings
+            replay_file: Append every game's replay (see ``game_replay.py``) to this file
+            coordinator: Hand the games out to remote workers through this coordinator
         
         Returns:
             Tournament results and statistics
         """
-        results = {
-            'combinations': {},
-            'overall_stats': defaultdict(lambda: defaultdict(int)),
-            'ai_performance': defaultdict(lambda: {
-                'games_played': 0,
-                'wins': 0,
-                'total_winnings': 0,
-                'solve_attempts': 0,
-                'successful_solves': 0
-            })
-        }
+        combo_keys = ['-vs-'.join(combination) for combination in player_combinations]
+        if exhaustive:
+            games_per_combination = len(self.sampler.indices(**self.puzzle_filters))
+        checkpoint = None
+        if resume and checkpoint_file and os.path.exists(checkpoint_file):
+            checkpoint = _load_checkpoint(checkpoint_file, combo_keys, games_per_combination, paired, seed)
+            if checkpoint.get('results_file') != _file_key(results_file):
+                raise ValueError(f"Checkpoint {checkpoint_file} was saved with a different results file")
+            if checkpoint.get('replay_file') != _file_key(replay_file):
+                raise ValueError(f"Checkpoint {checkpoint_file} was saved with a different replay file")
+            if checkpoint.get('stopping') != [win_rate_ci, winnings_ci, alpha, min_games]:
+                raise ValueError(f"Checkpoint {checkpoint_file} was saved with different stopping rules")
+            seed = checkpoint['seed']
+            if verbose:
+                print(f"Resuming from {checkpoint_file}: {sum(checkpoint['games_done'].values())} games already played")
+        if seed is None:
+            seed = self.rng.getrandbits(32)
+        
+        if checkpoint is not None:
+            results = _results_from_json(checkpoint['results'])
+            games_done = checkpoint['games_done']
+            stopped = set(checkpoint.get('stopped', []))
+            if ratings is not None and checkpoint.get('ratings') is not None:
+                ratings = ladder_from_state(checkpoint['ratings'])
+            if latency is not None and checkpoint.get('latency') is not None:
+                latency.merge(LatencyRecorder.from_json(checkpoint['latency']))
+            # Drop records written after the checkpoint; those games are replayed
+            _rewind(results_file, checkpoint.get('results_file_size'), "Results file")
+            _rewind(replay_file, checkpoint.get('replay_file_size'), "Replay file")
+        else:
+            results = _new_results()
+            for combo_key in combo_keys:
+                results['combinations'][combo_key] = _new_combo_stats()
+            games_done = {combo_key: 0 for combo_key in combo_keys}
+            stopped = set()
+        
+        early_stopping = win_rate_ci is not None or winnings_ci is not None
+        z = statistics.NormalDist().inv_cdf(1 - alpha / 2)
+        
+        def pending_shards():
+            for combination, combo_key in zip(player_combinations, combo_keys):
+                for first in range(games_done[combo_key], games_per_combination, SHARD_GAMES):
+                    if combo_key in stopped:
+                        break
+                    yield (combination, first, min(first + SHARD_GAMES, games_per_combination), seed, paired,
+                           exhaustive, latency is not None)
+        
+        shards = pending_shards()
         
         total_games = len(player_combinations) * games_per_combination
-        games_completed = 0
-        
-        for combination in player_combinations:
-            combo_key = '-vs-'.join(combination)
-            results['combinations'][combo_key] = {
-                'games_played': 0,
-                'wins_by_player': [0, 0, 0],
-                'total_winnings': [0, 0, 0],
-                'avg_winnings': [0, 0, 0],
-                'solve_attempts': 0,
-                'successful_solves': 0,
-                'avg_turns': 0,
-                'bankruptcies': 0
-            }
-            
-            combo_stats = results['combinations'][combo_key]
-            
-            for game_num in range(games_per_combination):
-                game_result = self.simulate_game(combination, verbose=False)
-                games_completed += 1
-                
-                if verbose and games_completed % 100 == 0:
-                    print(f"Completed {games_completed}/{total_games} games ({games_completed/total_games*100:.1f}%)")
-                
-                # Update combination stats
-                combo_stats['games_played'] += 1
-                combo_stats['solve_attempts'] += game_result['solve_attempts']
-                combo_stats['bankruptcies'] += game_result['bankruptcies']
-                combo_stats['avg_turns'] += game_result['turns_taken']
-                
-                if game_result['winner'] >= 0:
-                    combo_stats['wins_by_player'][game_result['winner']] += 1
-                    combo_stats['successful_solves'] += 1
-                
-                for i in range(3):
-                    combo_stats['total_winnings'][i] += game_result['final_winnings'][i]
-                
-                # Update individual AI stats
-                for i, ai_type in enumerate(combination):
-                    ai_stats = results['ai_performance'][ai_type]
-                    ai_stats['games_played'] += 1
-                    ai_stats['total_winnings'] += game_result['final_winnings'][i]
-                    
-                    if game_result['winner'] == i:
-                        ai_stats['wins'] += 1
-                    
-                    # Note: solve attempts are tracked per game, not per AI
-                    if i == 0:  # Only count once per game
-                        ai_stats['solve_attempts'] += game_result['solve_attempts']
-                        if game_result['winner'] >= 0:
-                            ai_stats['successful_solves'] += 1
-            
-            # Calculate averages for this combination
-            if combo_stats['games_played'] > 0:
-                combo_stats['avg_turns'] /= combo_stats['games_played']
-                for i in range(3):
-                    combo_stats['avg_winnings'][i] = combo_stats['total_winnings'][i] / combo_stats['games_played']
+        games_completed = sum(games_done.values())
+        sink = GameRecordSink(results_file) if results_file else None
+        keep_records = sink is not None or ratings is not None
+        replay_log = ReplayLog(replay_file) if replay_file else None
+        keep_replays = replay_log is not None
+        
+        def collect(shard):
+            nonlocal games_completed
+            combo_key = shard['combination']
+            if combo_key in stopped:
+                return  # Was already in flight when its combination stopped
+            _merge_results(results, shard)
+            if latency is not None:
+                latency.merge(LatencyRecorder.from_json(shard['latency']))
+            for entry in shard['replays']:
+                replay_log.write(entry)
+            for record in shard['records']:
+                if sink is not None:
+                    sink.write(record)
+                if ratings is not None:
+                    ratings.record_game(record)
+            games_done[combo_key] = shard['last']
+            if (early_stopping and games_done[combo_key] >= min_games
+                    and _precise_enough(results['combinations'][combo_key], win_rate_ci, winnings_ci, z)):
+                stopped.add(combo_key)
+                if verbose:
+                    print(f"{combo_key}: intervals reached the target after {games_done[combo_key]} games")
+            if checkpoint_file:
+                _save_checkpoint(checkpoint_file, {
+                    'seed': seed,
+                    'combinations': combo_keys,
+                    'games_per_combination': games_per_combination,
+                    'shard_games': SHARD_GAMES,
+                    'paired': paired,
+                    'games_done': games_done,
+                    'stopped': sorted(stopped),
+                    'stopping': [win_rate_ci, winnings_ci, alpha, min_games],
+                    'results_file': _file_key(results_file),
+                    'results_file_size': sink.tell() if sink is not None else None,
+                    'replay_file': _file_key(replay_file),
+                    'replay_file_size': replay_log.tell() if replay_log is not None else None,
+                    'ratings': ratings.state() if ratings is not None else None,
+                    'latency': latency.to_json() if latency is not None else None,
+                    'results': _results_to_json(results),
+                })
+            previous = games_completed
+            games_completed += shard['games']
+            if verbose and (workers > 1 or games_completed // 100 > previous // 100):
+                print(f"Completed {games_completed}/{total_games} games ({games_completed/total_games*100:.1f}%)")
+        
+        try:
+            if coordinator is not None:
+                config = (self.sampler.split, self.puzzle_filters)
+                options = {'keep_records': keep_records, 'keep_replays': keep_replays}
+                for shard in coordinator.map_ordered((config, shard_args, options) for shard_args in shards):
+                    collect(shard)
+            elif workers <= 1:
+                for shard_args in shards:
+                    collect(_play_shard(self, *shard_args, keep_records=keep_records, keep_replays=keep_replays))
+            else:
+                # Shards are merged in order, with only a few in flight, so memory stays bounded
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.sampler, self.puzzle_filters)) as pool:
+                    pending = deque()
+                    for shard_args in shards:
+                        pending.append(pool.submit(_play_worker_shard, *shard_args, keep_records=keep_records,
+                                                   keep_replays=keep_replays))
+                        if len(pending) >= workers * 2:
+                            collect(pending.popleft().result())
+                    while pending:
+                        collect(pending.popleft().result())
+        finally:
+            if sink is not None:
+                sink.close()
+            if replay_log is not None:
+                replay_log.close()
+        
+        # Calculate averages for each combination
+        for combo_key, combo_stats in results['combinations'].items():
+            combo_stats['stopped_early'] = combo_key in stopped
+            combo_stats['avg_turns'] = combo_stats['turn_stats'].mean
+            combo_stats['turns_stdev'] = combo_stats['turn_stats'].stdev
+            combo_stats['avg_winnings'] = [stats.mean for stats in combo_stats['winnings_stats']]
+            combo_stats['winnings_stdev'] = [stats.stdev for stats in combo_stats['winnings_stats']]
+        if ratings is not None:
+            results['ratings'] = ratings
+        if latency is not None:
+            results['latency'] = latency
         
         return results
     
+    def play_seeded_game(self, player_types: List[str], seed: int,
+                         puzzle: Tuple[str, str, str, str] = None, replay: bool = False) -> Dict[str, Any]:
+        """Play one quiet game whose puzzle (unless given) and spins all come from ``seed``."""
+        self.rng.seed(seed)
+        result = self.simulate_game(player_types, verbose=False, puzzle=puzzle, replay=replay)
+        if replay:
+            result['replay']['seed'] = seed
+        return result
+    
+    def deal(self, seed: int, puzzle: Tuple[str, str, str, str] = None) -> Tuple[Tuple[str, str, str, str], List[int], int]:
+        """
+        The draws for one paired game: the puzzle (unless given), the
+        pre-drawn spins and a seed for any spins past those.
+        """
+        rng = random.Random(seed)
+        sampled = self.sampler.sample(rng, **self.puzzle_filters)
+        puzzle = puzzle or sampled
+        spins = draw_spins(rng, PAIRED_SPINS, self.wheel_values)
+        return puzzle, spins, rng.getrandbits(64)
+    
+    def play_deal(self, player_types: List[str], deal: Tuple[Tuple[str, str, str, str], List[int], int],
+                  replay: bool = False) -> Dict[str, Any]:
+        """Play one quiet game on the puzzle and spins of a ``deal``."""
+        puzzle, spins, overflow_seed = deal
+        self.rng.seed(overflow_seed)
+        return self.simulate_game(player_types, verbose=False, puzzle=puzzle, spins=spins, replay=replay)
+    
     def generate_report(self, results: Dict[str, Any], output_file: str = None) -> str:
         """Generate a comprehensive report from tournament results."""
         
@@ -311,7 +517,21 @@ class GameSimulator:
                 avg_winnings = stats['total_winnings'] / stats['games_played']
                 solve_rate = stats['successful_solves'] / stats['games_played'] * 100 if stats['games_played'] > 0 else 0
                 
-                report_lines.append(f"{ai_type:20} | Win Rate: {win_rate:5.1f}% | Avg Winnings: ${avg_winnings:6.0f} | Solve Rate: {solve_rate:5.1f}%")
+                winnings_sd = stats['winnings_stats'].stdev if 'winnings_stats' in stats else 0
+                
+                report_lines.append(f"{ai_type:20} | Win Rate: {win_rate:5.1f}% | Avg Winnings: ${avg_winnings:6.0f} (sd ${winnings_sd:5.0f}) | Solve Rate: {solve_rate:5.1f}%")
+        
+        if results.get('ratings') is not None:
+            report_lines.append("")
+            report_lines.append("RATINGS:")
+            report_lines.append("-" * 40)
+            report_lines.extend(format_table(results['ratings']))
+        
+        if results.get('latency') is not None:
+            report_lines.append("")
+            report_lines.append("DECISION LATENCY:")
+            report_lines.append("-" * 40)
+            report_lines.extend(results['latency'].format_table())
         
         report_lines.append("")
         report_lines.append("COMBINATION RESULTS:")
@@ -320,8 +540,9 @@ class GameSimulator:
         # Combination results
         for combo, stats in results['combinations'].items():
             report_lines.append(f"\n{combo}:")
-            report_lines.append(f"  Games Played: {stats['games_played']}")
-            report_lines.append(f"  Average Turns: {stats['avg_turns']:.1f}")
+            report_lines.append(f"  Games Played: {stats['games_played']}"
+                                + (" (stopped early: intervals on target)" if stats.get('stopped_early') else ""))
+            report_lines.append(f"  Average Turns: {stats['avg_turns']:.1f} (sd {stats.get('turns_stdev', 0):.1f})")
             report_lines.append(f"  Solve Attempts: {stats['solve_attempts']}")
             report_lines.append(f"  Successful Solves: {stats['successful_solves']}")
             report_lines.append(f"  Bankruptcies: {stats['bankruptcies']}")
@@ -330,7 +551,11 @@ class GameSimulator:
             for i, player in enumerate(players):
                 win_rate = stats['wins_by_player'][i] / stats['games_played'] * 100
                 avg_winnings = stats['avg_winnings'][i]
-                report_lines.append(f"    Player {i} ({player:15}): {stats['wins_by_player'][i]:4d} wins ({win_rate:5.1f}%) | Avg: ${avg_winnings:6.0f}")
+                line = f"    Player {i} ({player:15}): {stats['wins_by_player'][i]:4d} wins ({win_rate:5.1f}%) | Avg: ${avg_winnings:6.0f}"
+                if 'deal_margin_stats' in stats:
+                    margin = stats['deal_margin_stats'][i]
+                    line += f" | Margin: ${margin.mean:+6.0f} +/- {_ci_half_width(margin):5.0f}"
+                report_lines.append(line)
         
         report = "\n".join(report_lines)
         
@@ -384,14 +609,406 @@ class GameSimulator:
         print(f"Detailed CSV saved to {filename}")
 
 
-def main():
+def game_seed(tournament_seed: int, player_types: List[str], game_num: int) -> int:
+    """
+    Seed for one tournament game; depends only on the tournament, matchup and
+    game number. Without ``player_types`` it is the seed of the deal shared by
+    every matchup in paired mode.
+    """
+    matchup = '-vs-'.join(player_types) if player_types else 'paired'
+    key = f"{tournament_seed}:{matchup}:{game_num}"
+    return random.Random(key).getrandbits(64)
+
+
+def parse_matchup(text: str) -> List[str]:
+    """Three comma-separated player types (commas inside parentheses belong to the type)."""
+    players = [player.strip() for player in re.split(r',(?![^()]*\))', text)]
+    if len(players) != 3:
+        raise ValueError(f"A matchup needs three player types, got {text!r}")
+    return players
+
+
+def _ci_half_width(stats: RunningStats, z: float = 1.96) -> float:
+    """Half-width of the normal confidence interval for ``stats.mean`` (95% by default)."""
+    return z * stats.stdev / stats.count ** 0.5 if stats.count > 1 else float('inf')
+
+
+def _precise_enough(combo_stats: Dict[str, Any], win_rate_ci: float, winnings_ci: float, z: float) -> bool:
+    """Whether every player's per-deal win rate and winnings intervals meet the targets."""
+    for i in range(3):
+        if win_rate_ci is not None and _ci_half_width(combo_stats['deal_win_stats'][i], z) > win_rate_ci:
+            return False
+        if winnings_ci is not None and _ci_half_width(combo_stats['deal_winnings_stats'][i], z) > winnings_ci:
+            return False
+    return True
+
+
+def rotate_seats(player_types: List[str], rotation: int) -> List[str]:
+    """Seating for a seat rotation: player ``(seat + rotation) % 3`` sits in ``seat``."""
+    return player_types[rotation:] + player_types[:rotation]
+
+
+def _unrotate(game_result: Dict[str, Any], rotation: int) -> Dict[str, Any]:
+    """Re-index a rotated game's winner and winnings by the matchup's player order."""
+    result = dict(game_result)
+    players = len(game_result['final_winnings'])
+    result['final_winnings'] = [game_result['final_winnings'][(i - rotation) % players] for i in range(players)]
+    if game_result['winner'] >= 0:
+        result['winner'] = (game_result['winner'] + rotation) % players
+    return result
+
+
+# Spins pre-drawn for each paired deal; a game that needs more continues
+# from the deal's own seed, so it is still the same for every matchup
+PAIRED_SPINS = 512
+
+# Games per unit of work handed to a worker. Fixed, so the order in which
+# shards are merged (and so every floating point sum) is the same for any
+# number of workers.
+SHARD_GAMES = 50
+
+
+def _new_results() -> Dict[str, Any]:
+    return {
+        'combinations': {},
+        'overall_stats': defaultdict(lambda: defaultdict(int)),
+        'ai_performance': defaultdict(_new_ai_stats)
+    }
+
+
+def _new_ai_stats() -> Dict[str, Any]:
+    return {
+        'games_played': 0,
+        'wins': 0,
+        'total_winnings': 0,
+        'solve_attempts': 0,
+        'successful_solves': 0,
+        'winnings_stats': RunningStats()
+    }
+
+
+def _new_combo_stats() -> Dict[str, Any]:
+    return {
+        'games_played': 0,
+        'wins_by_player': [0, 0, 0],
+        'total_winnings': [0, 0, 0],
+        'avg_winnings': [0, 0, 0],
+        'winnings_stdev': [0, 0, 0],
+        'winnings_stats': [RunningStats(), RunningStats(), RunningStats()],
+        'solve_attempts': 0,
+        'successful_solves': 0,
+        'avg_turns': 0,
+        'turns_stdev': 0,
+        'turn_stats': RunningStats(),
+        'bankruptcies': 0,
+        # One value per deal (a game, or a game's seat rotations in paired
+        # mode), averaged over its games: winnings, share of games won, and
+        # winnings less the mean of the other two players
+        'deal_winnings_stats': [RunningStats(), RunningStats(), RunningStats()],
+        'deal_win_stats': [RunningStats(), RunningStats(), RunningStats()],
+        'deal_margin_stats': [RunningStats(), RunningStats(), RunningStats()]
+    }
+
+
+def _record_game(results: Dict[str, Any], combination: List[str], game_result: Dict[str, Any]):
+    """Add one game to the running tournament totals."""
+    combo_stats = results['combinations'].setdefault('-vs-'.join(combination), _new_combo_stats())
+    
+    # Update combination stats
+    combo_stats['games_played'] += 1
+    combo_stats['solve_attempts'] += game_result['solve_attempts']
+    combo_stats['bankruptcies'] += game_result['bankruptcies']
+    combo_stats['turn_stats'].add(game_result['turns_taken'])
+    
+    if game_result['winner'] >= 0:
+        combo_stats['wins_by_player'][game_result['winner']] += 1
+        combo_stats['successful_solves'] += 1
+    
+    for i in range(3):
+        combo_stats['total_winnings'][i] += game_result['final_winnings'][i]
+        combo_stats['winnings_stats'][i].add(game_result['final_winnings'][i])
+    
+    # Update individual AI stats
+    for i, ai_type in enumerate(combination):
+        ai_stats = results['ai_performance'][ai_type]
+        ai_stats['games_played'] += 1
+        ai_stats['total_winnings'] += game_result['final_winnings'][i]
+        ai_stats['winnings_stats'].add(game_result['final_winnings'][i])
+        
+        if game_result['winner'] == i:
+            ai_stats['wins'] += 1
+        
+        # Note: solve attempts are tracked per game, not per AI
+        if i == 0:  # Only count once per game
+            ai_stats['solve_attempts'] += game_result['solve_attempts']
+            if game_result['winner'] >= 0:
+                ai_stats['successful_solves'] += 1
+
+
+def _record_deal(results: Dict[str, Any], combination: List[str], game_results: List[Dict[str, Any]]):
+    """Add the per-deal averages of a deal's games (already in matchup order)."""
+    combo_stats = results['combinations']['-vs-'.join(combination)]
+    games = len(game_results)
+    winnings = [sum(result['final_winnings'][i] for result in game_results) / games for i in range(3)]
+    for i in range(3):
+        others = (sum(winnings) - winnings[i]) / 2
+        combo_stats['deal_winnings_stats'][i].add(winnings[i])
+        combo_stats['deal_win_stats'][i].add(sum(result['winner'] == i for result in game_results) / games)
+        combo_stats['deal_margin_stats'][i].add(winnings[i] - others)
+
+
+def _merge_value(total, value):
+    if isinstance(value, RunningStats):
+        total.merge(value)
+        return total
+    if isinstance(value, list):
+        return [_merge_value(a, b) for a, b in zip(total, value)]
+    return total + value
+
+
+def _merge_results(results: Dict[str, Any], shard: Dict[str, Any]):
+    """Fold a shard's totals (before averaging) into ``results``."""
+    for combo_key, shard_stats in shard['combinations'].items():
+        combo_stats = results['combinations'].setdefault(combo_key, _new_combo_stats())
+        for key in ('games_played', 'wins_by_player', 'total_winnings', 'winnings_stats',
+                    'solve_attempts', 'successful_solves', 'turn_stats', 'bankruptcies',
+                    'deal_winnings_stats', 'deal_win_stats', 'deal_margin_stats'):
+            combo_stats[key] = _merge_value(combo_stats[key], shard_stats[key])
+    for ai_type, shard_stats in shard['ai_performance'].items():
+        ai_stats = results['ai_performance'][ai_type]
+        for key, value in shard_stats.items():
+            ai_stats[key] = _merge_value(ai_stats[key], value)
+
+
+def _play_shard(simulator: 'GameSimulator', combination: List[str], first: int, last: int,
+                tournament_seed: int, paired: bool = False, exhaustive: bool = False,
+                timing: bool = False, keep_records: bool = False, keep_replays: bool = False) -> Dict[str, Any]:
+    """Play games ``first``..``last - 1`` of a matchup and return their totals (and records, replays and timings)."""
+    if timing:
+        with recording(LatencyRecorder()) as recorder:
+            shard = _play_shard(simulator, combination, first, last, tournament_seed, paired, exhaustive,
+                                keep_records=keep_records, keep_replays=keep_replays)
+        shard['latency'] = recorder.to_json()
+        return shard
+    results = _new_results()
+    results['combinations']['-vs-'.join(combination)] = _new_combo_stats()
+    records = []
+    replays = []
+    for game_num in range(first, last):
+        puzzle = simulator.sampler.at(game_num, **simulator.puzzle_filters) if exhaustive else None
+        if paired:
+            seed = game_seed(tournament_seed, None, game_num)
+            deal = simulator.deal(seed, puzzle)
+            played = [(rotation, simulator.play_deal(rotate_seats(combination, rotation), deal, keep_replays))
+                      for rotation in range(3)]
+        else:
+            seed = game_seed(tournament_seed, combination, game_num)
+            played = [(0, simulator.play_seeded_game(combination, seed, puzzle, keep_replays))]
+        deal_results = []
+        for rotation, game_result in played:
+            if keep_replays:
+                replays.append(dict(game_result.pop('replay'), seed=seed, combination='-vs-'.join(combination),
+                                    game_num=game_num, rotation=rotation))
+            deal_results.append(_unrotate(game_result, rotation))
+            _record_game(results, combination, deal_results[-1])
+            if keep_records:
+                records.append(game_record(combination, game_num, seed, game_result, rotation))
+        _record_deal(results, combination, deal_results)
+    return {
+        'games': last - first,
+        'combination': '-vs-'.join(combination),
+        'last': last,
+        'combinations': results['combinations'],
+        'ai_performance': dict(results['ai_performance']),
+        'records': records,
+        'replays': replays,
+    }
+
+
+def _results_to_json(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Tournament totals as plain JSON (accumulators as ``[count, mean, m2]``)."""
+    def encode(value):
+        if isinstance(value, RunningStats):
+            return {'running_stats': value.state()}
+        if isinstance(value, list):
+            return [encode(item) for item in value]
+        return value
+    return {
+        section: {key: {name: encode(value) for name, value in stats.items()}
+                  for key, stats in results[section].items()}
+        for section in ('combinations', 'ai_performance')
+    }
+
+
+def _results_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    def decode(value):
+        if isinstance(value, dict) and 'running_stats' in value:
+            return RunningStats.from_state(value['running_stats'])
+        if isinstance(value, list):
+            return [decode(item) for item in value]
+        return value
+    results = _new_results()
+    for key, stats in data['combinations'].items():
+        results['combinations'][key] = {name: decode(value) for name, value in stats.items()}
+    for key, stats in data['ai_performance'].items():
+        results['ai_performance'][key] = {name: decode(value) for name, value in stats.items()}
+    return results
+
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """Write the checkpoint next to its final name and rename, so a crash never leaves half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _load_checkpoint(path: str, combo_keys: List[str], games_per_combination: int, paired: bool,
+                     seed: int = None) -> Dict[str, Any]:
+    """Read a checkpoint, refusing one saved for a different tournament."""
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if (checkpoint['combinations'] != combo_keys
+            or checkpoint['games_per_combination'] != games_per_combination
+            or checkpoint['shard_games'] != SHARD_GAMES
+            or checkpoint.get('paired', False) != paired
+            or (seed is not None and checkpoint['seed'] != seed)):
+        raise ValueError(f"Checkpoint {path} was saved for a different tournament")
+    return checkpoint
+
+
+def _file_key(path: str) -> str:
+    """How a results or replay file is recorded in a checkpoint."""
+    return os.path.abspath(path) if path else None
+
+
+def _rewind(path: str, size: int, label: str):
+    """Cut ``path`` back to its checkpointed ``size``, dropping what was written after the checkpoint."""
+    if not path or size is None:
+        return
+    current = os.path.getsize(path) if os.path.exists(path) else 0
+    if size > current:
+        raise ValueError(f"{label} {path} is shorter than its checkpoint ({current} < {size} bytes)")
+    if current > size:
+        os.truncate(path, size)
+
+
+def _quick_path(path: str) -> str:
+    """The quick run's version of an output file, e.g. ``games.quick.jsonl`` for ``games.jsonl``."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.quick{ext}"
+
+
+def _full_run_seed(seed: int) -> int:
+    """The full run's seed, so its games do not repeat the quick run's."""
+    return None if seed is None else random.Random(f"{seed}:full").getrandbits(32)
+
+
+# One simulator per worker process, reused across its shards
+_WORKER_SIMULATOR = None
+
+
+def _init_worker(sampler: PuzzleSampler, puzzle_filters: Dict[str, Any]):
+    """Give a worker process a simulator playing the same puzzles as the parent's."""
+    global _WORKER_SIMULATOR
+    _WORKER_SIMULATOR = GameSimulator(sampler=sampler, puzzle_filters=puzzle_filters)
+
+
+def _play_worker_shard(*shard_args, **options) -> Dict[str, Any]:
+    """Worker process entry point for ``_play_shard``."""
+    return _play_shard(_WORKER_SIMULATOR, *shard_args, **options)
+
+
+# Simulators of a queue worker, one per (split, puzzle filters) it is sent
+_QUEUE_SIMULATORS: Dict[str, 'GameSimulator'] = {}
+
+
+def _play_queued_shard(task: Tuple[Tuple[str, Dict[str, Any]], tuple, Dict[str, Any]]) -> Dict[str, Any]:
+    """Queue worker entry point for ``_play_shard``."""
+    (split, puzzle_filters), shard_args, options = task
+    key = json.dumps([split, puzzle_filters], sort_keys=True)
+    if key not in _QUEUE_SIMULATORS:
+        _QUEUE_SIMULATORS[key] = GameSimulator(sampler=get_sampler(split), puzzle_filters=puzzle_filters)
+    return _play_shard(_QUEUE_SIMULATORS[key], *shard_args, **options)
+
+
+def serve_shards(address: Tuple[str, int], authkey: bytes = None, max_tasks: int = None) -> int:
+    """Play shards handed out by a coordinator until it shuts down; returns the shards played."""
+    return run_worker(address, authkey, _play_queued_shard, max_tasks=max_tasks)
+
+
+def main(argv: List[str] = None):
     """Run the solve timing experiments."""
+    parser = argparse.ArgumentParser(description="Run solve timing AI tournaments.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes to spread the games over (default: 1)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="tournament seed, for reproducible results")
+    parser.add_argument('--results', default=None,
+                        help="stream per-game records to this .jsonl or .csv file "
+                             "(the quick run writes e.g. games.quick.jsonl)")
+    parser.add_argument('--checkpoint', default=None,
+                        help="save progress to this file as the tournaments run")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip games already recorded in the --checkpoint file")
+    parser.add_argument('--paired', action='store_true',
+                        help="play every matchup and seat rotation on the same puzzles and spins")
+    parser.add_argument('--win-rate-ci', type=float, default=None,
+                        help="stop a matchup early once win-rate intervals are within +/- this (e.g. 0.05)")
+    parser.add_argument('--winnings-ci', type=float, default=None,
+                        help="stop a matchup early once winnings intervals are within +/- this many dollars")
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help="significance level for the early-stop intervals (default: 0.05)")
+    parser.add_argument('--split', default='valid',
+                        help="puzzle split to play: valid, train or test (default: valid)")
+    parser.add_argument('--round', action='append', default=None,
+                        help="only play puzzles of this round type (R1, T1, BR ...); repeatable")
+    parser.add_argument('--exhaustive', action='store_true',
+                        help="play every puzzle of the split once per matchup instead of sampling")
+    parser.add_argument('--ratings', choices=RATING_SYSTEMS, default=None,
+                        help="rate every player type from the games played (elo or trueskill)")
+    parser.add_argument('--matchup', action='append', default=None,
+                        help="three comma-separated player types to play instead of the standard "
+                             "matchups, e.g. 'solve_timing(risk=0.2,solve=0.8),smart,conservative'; repeatable")
+    parser.add_argument('--replays', default=None,
+                        help="append every game's replay to this file (see game_replay.py; "
+                             "the quick run writes e.g. replays.quick.jsonl)")
+    parser.add_argument('--latency', default=None,
+                        help="time every AI decision and write the histograms to this JSON file")
+    parser.add_argument('--coordinator', default=None, metavar='HOST:PORT',
+                        help="hand the games out to --worker processes connecting to this address "
+                             "instead of a local pool; needs --authkey unless it is a loopback address")
+    parser.add_argument('--worker', default=None, metavar='HOST:PORT',
+                        help="play games for the coordinator at this address until it finishes")
+    parser.add_argument('--authkey', default=None,
+                        help="shared secret between coordinator and workers "
+                             "(default: $WOF_QUEUE_AUTHKEY; required for non-loopback addresses)")
+    args = parser.parse_args(argv)
+    
+    authkey = (args.authkey or os.environ.get('WOF_QUEUE_AUTHKEY', '')).encode() or None
+    if args.worker:
+        print(f"Playing games for the coordinator at {args.worker}...")
+        played = serve_shards(parse_address(args.worker), authkey)
+        print(f"Coordinator finished; played {played} shards.")
+        return
+    coordinator = None
+    if args.coordinator:
+        coordinator = Coordinator(parse_address(args.coordinator), authkey)
+        coordinator.start()
+        print(f"Coordinating workers at {coordinator.address[0]}:{coordinator.address[1]}")
     
     print("Starting Solve Timing AI Experiments...")
     print("This will run comprehensive simulations to evaluate AI performance.")
     print()
     
-    simulator = GameSimulator()
+    puzzle_filters = {'round': args.round} if args.round else None
+    simulator = GameSimulator(sampler=get_sampler(args.split), puzzle_filters=puzzle_filters)
     
     # Define test combinations
     # Test solve timing AIs against traditional AIs
@@ -416,20 +1033,44 @@ def main():
         ['solve_timing', 'conservative', 'aggressive'],
         ['solve_aggressive', 'smart', 'smart'],
     ]
+    if args.matchup:
+        test_combinations = [parse_matchup(matchup) for matchup in args.matchup]
     
     # Run smaller test first
     print("Running quick test (100 games per combination)...")
-    quick_results = simulator.run_tournament(test_combinations, games_per_combination=100, verbose=True)
+    quick_results = simulator.run_tournament(test_combinations, games_per_combination=100, verbose=True,
+                                           workers=args.workers, seed=args.seed,
+                                           results_file=args.results and _quick_path(args.results),
+                                           replay_file=args.replays and _quick_path(args.replays),
+                                           checkpoint_file=args.checkpoint and args.checkpoint + '.quick',
+                                           resume=args.resume, paired=args.paired,
+                                           win_rate_ci=args.win_rate_ci, winnings_ci=args.winnings_ci,
+                                           alpha=args.alpha, exhaustive=args.exhaustive,
+                                           ratings=args.ratings and new_ladder(args.ratings),
+                                           latency=LatencyRecorder() if args.latency else None,
+                                           coordinator=coordinator)
     
     print("\nQuick Test Results:")
     print(simulator.generate_report(quick_results))
+    if args.latency:
+        quick_results['latency'].dump(args.latency)
+        print(f"Decision timings saved to {args.latency}")
     
     # Ask user if they want to run full simulation
     response = input("\nRun full simulation (1000 games per combination)? This may take several minutes. (y/n): ")
     
     if response.lower().startswith('y'):
         print("\nRunning full tournament (1000 games per combination)...")
-        full_results = simulator.run_tournament(test_combinations, games_per_combination=1000, verbose=True)
+        full_results = simulator.run_tournament(test_combinations, games_per_combination=1000, verbose=True,
+                                          workers=args.workers, seed=_full_run_seed(args.seed),
+                                          results_file=args.results, replay_file=args.replays,
+                                          checkpoint_file=args.checkpoint, resume=args.resume,
+                                          paired=args.paired, win_rate_ci=args.win_rate_ci,
+                                          winnings_ci=args.winnings_ci, alpha=args.alpha,
+                                          exhaustive=args.exhaustive,
+                                          ratings=args.ratings and new_ladder(args.ratings),
+                                          latency=LatencyRecorder() if args.latency else None,
+                                          coordinator=coordinator)
         
         # Generate outputs
         timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -439,6 +1080,8 @@ def main():
         print(f"\nFull Tournament Results:")
         report = simulator.generate_report(full_results, report_file)
         print(report)
+        if args.latency:
+            full_results['latency'].dump(args.latency)
         
         simulator.save_detailed_csv(full_results, csv_file)
         
@@ -449,6 +1092,8 @@ def main():
     else:
         print("Skipping full simulation.")
     
+    if coordinator is not None:
+        coordinator.shutdown()
     print("\nExperiment complete!")
 
 
@@ -0,0 +1,178 @@
+"""
+Solve Timing Sweep - Tuning SolveTimingAI's Parameters
+Evaluates many SolveTimingAI settings (risk_tolerance, solve_aggressiveness
+and should_solve_now's base_solve_threshold) in one seeded, parallel
+tournament, then ranks them and writes heat map data.
+
+Every setting plays the same opponents on the same paired deals, so the
+settings are compared on identical puzzles and spins.
+
+Usage:
+    python solve_timing_sweep.py --risk 0,0.25,0.5,0.75,1 --solve 0,0.25,0.5,0.75,1 --games 200 --workers 4
+    python solve_timing_sweep.py --samples 40 --threshold-range 0.5,0.9 --seed 7
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+# Add the PlayGame directory to the path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'PlayGame'))
+
+from puzzle_sampler import get_sampler
+from solve_timing_ai import solve_timing_player_type
+from solve_timing_experiments import GameSimulator, _ci_half_width
+
+# Table columns, in CSV order
+SWEEP_FIELDS = ['rank', 'player_type', 'risk_tolerance', 'solve_aggressiveness', 'base_solve_threshold',
+                'games_played', 'win_rate', 'avg_winnings', 'margin', 'margin_ci']
+
+
+def grid_settings(risks: List[float], solves: List[float], thresholds: List[float] = None) -> List[Dict[str, float]]:
+    """Every combination of the given parameter values."""
+    return [{'risk_tolerance': risk, 'solve_aggressiveness': solve, 'base_solve_threshold': threshold}
+            for threshold in (thresholds or [None]) for risk in risks for solve in solves]
+
+
+def random_settings(samples: int, rng: random.Random, threshold_range=None) -> List[Dict[str, float]]:
+    """``samples`` settings drawn uniformly (two decimals) from the parameter ranges."""
+    settings = []
+    for _ in range(samples):
+        setting = {'risk_tolerance': round(rng.random(), 2), 'solve_aggressiveness': round(rng.random(), 2),
+                   'base_solve_threshold': None}
+        if threshold_range:
+            setting['base_solve_threshold'] = round(rng.uniform(*threshold_range), 2)
+        settings.append(setting)
+    return settings
+
+
+def run_sweep(settings: List[Dict[str, float]], opponents: List[str] = None, games: int = 200,
+              workers: int = 1, seed: int = 0, simulator: GameSimulator = None, paired: bool = True,
+              verbose: bool = False) -> List[Dict[str, Any]]:
+    """
+    Play every setting against ``opponents`` and rank them.
+
+    All settings run as one tournament, so ``workers`` processes share the
+    whole sweep. Settings are ranked by win rate, then by winnings margin
+    over the opponents.
+
+    Returns:
+        One row per setting (see ``SWEEP_FIELDS``), best first
+    """
+    opponents = opponents or ['smart', 'conservative']
+    simulator = simulator or GameSimulator()
+    player_types = [solve_timing_player_type(**setting) for setting in settings]
+    combinations = [[player_type] + opponents for player_type in player_types]
+    results = simulator.run_tournament(combinations, games_per_combination=games, verbose=verbose,
+                                       workers=workers, seed=seed, paired=paired)
+
+    rows = []
+    for setting, player_type, combination in zip(settings, player_types, combinations):
+        stats = results['combinations']['-vs-'.join(combination)]
+        margin = stats['deal_margin_stats'][0]
+        rows.append(dict(setting, player_type=player_type,
+                         games_played=stats['games_played'],
+                         win_rate=stats['wins_by_player'][0] / stats['games_played'] if stats['games_played'] else 0,
+                         avg_winnings=stats['avg_winnings'][0],
+                         margin=margin.mean,
+                         margin_ci=_ci_half_width(margin)))
+    rows.sort(key=lambda row: (-row['win_rate'], -row['margin']))
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = rank
+    return rows
+
+
+def heatmap_data(rows: List[Dict[str, Any]], metric: str = 'win_rate') -> Dict[str, Any]:
+    """
+    ``metric`` as a risk x solve matrix for each base_solve_threshold
+    (``None`` where a cell was not played), plus every row as a point.
+    """
+    risks = sorted({row['risk_tolerance'] for row in rows})
+    solves = sorted({row['solve_aggressiveness'] for row in rows})
+    thresholds = sorted({row['base_solve_threshold'] for row in rows}, key=lambda t: (t is not None, t))
+    layers = []
+    for threshold in thresholds:
+        cells = {(row['risk_tolerance'], row['solve_aggressiveness']): row[metric]
+                 for row in rows if row['base_solve_threshold'] == threshold}
+        layers.append({'base_solve_threshold': threshold,
+                       'values': [[cells.get((risk, solve)) for solve in solves] for risk in risks]})
+    return {
+        'metric': metric,
+        'rows': 'risk_tolerance',
+        'columns': 'solve_aggressiveness',
+        'risk_tolerance': risks,
+        'solve_aggressiveness': solves,
+        'layers': layers,
+        'points': [{key: row[key] for key in SWEEP_FIELDS} for row in rows],
+    }
+
+
+def format_table(rows: List[Dict[str, Any]], top: int = None) -> str:
+    lines = [f"{'Rank':>4} | {'Risk':>4} | {'Solve':>5} | {'Thresh':>6} | {'Games':>5} | {'Win Rate':>8} | "
+             f"{'Avg Win':>7} | Margin"]
+    for row in rows[:top]:
+        threshold = '-' if row['base_solve_threshold'] is None else f"{row['base_solve_threshold']:.2f}"
+        lines.append(f"{row['rank']:4d} | {row['risk_tolerance']:4.2f} | {row['solve_aggressiveness']:5.2f} | "
+                     f"{threshold:>6} | {row['games_played']:5d} | {row['win_rate'] * 100:7.1f}% | "
+                     f"${row['avg_winnings']:6.0f} | ${row['margin']:+6.0f} +/- {row['margin_ci']:5.0f}")
+    return "\n".join(lines)
+
+
+def save_table(rows: List[Dict[str, Any]], filename: str):
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _floats(text: str) -> List[float]:
+    return [float(value) for value in text.split(',') if value.strip()]
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Sweep SolveTimingAI parameters.")
+    parser.add_argument('--risk', type=_floats, default=[0.0, 0.25, 0.5, 0.75, 1.0],
+                        help="risk_tolerance values for the grid (comma-separated)")
+    parser.add_argument('--solve', type=_floats, default=[0.0, 0.25, 0.5, 0.75, 1.0],
+                        help="solve_aggressiveness values for the grid (comma-separated)")
+    parser.add_argument('--threshold', type=_floats, default=None,
+                        help="base_solve_threshold values for the grid (default: the personality thresholds)")
+    parser.add_argument('--samples', type=int, default=None,
+                        help="evaluate this many random settings instead of the grid")
+    parser.add_argument('--threshold-range', type=_floats, default=None,
+                        help="low,high range of base_solve_threshold for random settings")
+    parser.add_argument('--opponents', default='smart,conservative',
+                        help="the two other player types (default: smart,conservative)")
+    parser.add_argument('--games', type=int, default=200, help="deals per setting, each played in all seats")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--split', default='valid')
+    parser.add_argument('--output', default='solve_timing_sweep.csv', help="ranked table (CSV)")
+    parser.add_argument('--heatmap', default='solve_timing_sweep_heatmap.json', help="heat map data (JSON)")
+    args = parser.parse_args(argv)
+
+    if args.samples:
+        settings = random_settings(args.samples, random.Random(args.seed), args.threshold_range)
+    else:
+        settings = grid_settings(args.risk, args.solve, args.threshold)
+    opponents = [player.strip() for player in args.opponents.split(',')]
+    if len(opponents) != 2:
+        parser.error("--opponents needs two player types")
+
+    print(f"Sweeping {len(settings)} settings x {args.games} deals against {' and '.join(opponents)}...")
+    rows = run_sweep(settings, opponents, args.games, args.workers, args.seed,
+                     GameSimulator(sampler=get_sampler(args.split)), verbose=True)
+    print(format_table(rows))
+
+    save_table(rows, args.output)
+    with open(args.heatmap, 'w') as f:
+        json.dump(heatmap_data(rows), f, indent=2)
+    print(f"\nRanked table saved to {args.output}, heat map data to {args.heatmap}")
+
+
+if __name__ == "__main__":
+    main()
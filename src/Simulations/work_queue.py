@@ -0,0 +1,193 @@
+"""
+Work Queue for Tournaments Across Machines
+A coordinator hands out numbered tasks over a TCP queue served by
+``multiprocessing.managers``, and workers on any host that can reach it take
+tasks, run them and send the results back.
+
+The coordinator keeps a bounded number of tasks in flight and yields the
+results in task order, whatever order they come back in, so a tournament run
+this way merges its shards exactly as a local one does. Tasks that take
+longer than ``task_timeout`` are handed out again (the first result to come
+back wins), so a worker dying mid-task does not stall the run. Payloads and
+results cross the queue already pickled, so the queue server never needs to
+import the modules they come from.
+
+Since both ends unpickle what the other sends, the authkey is all that stands
+between the port and arbitrary code execution. The built-in key is public, so
+it is only accepted on loopback addresses; anything else needs a real secret.
+
+    coordinator = Coordinator(('10.0.0.5', 50555), b'secret')
+    coordinator.start()
+    for result in coordinator.map_ordered(payloads):
+        ...
+    coordinator.shutdown()
+
+    # On each worker host
+    run_worker(('coordinator-host', 50555), b'secret', handler)
+"""
+
+import ipaddress
+import pickle
+import queue
+import time
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+DEFAULT_PORT = 50555
+DEFAULT_AUTHKEY = b'wheel-of-fortune'  # Public, so only accepted on loopback
+
+Address = Tuple[str, int]
+
+# The queues live in the manager's server process
+_TASKS = None
+_RESULTS = None
+
+
+def _task_queue():
+    global _TASKS
+    if _TASKS is None:
+        _TASKS = queue.Queue()
+    return _TASKS
+
+
+def _result_queue():
+    global _RESULTS
+    if _RESULTS is None:
+        _RESULTS = queue.Queue()
+    return _RESULTS
+
+
+def is_loopback(host: str) -> bool:
+    """Whether ``host`` only reaches this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # Another host name, or '' for every interface
+
+
+def check_authkey(address: Address, authkey: bytes = None) -> bytes:
+    """
+    The authkey to use at ``address``: the built-in one if none is given, which
+    is refused for anything but a loopback address.
+    """
+    if authkey and authkey != DEFAULT_AUTHKEY:
+        return authkey
+    if not is_loopback(address[0]):
+        raise ValueError(f"{address[0]!r} is not a loopback address; the queue unpickles what it receives, "
+                         "so set a secret authkey (--authkey or $WOF_QUEUE_AUTHKEY) to use it across hosts")
+    return DEFAULT_AUTHKEY
+
+
+class QueueManager(BaseManager):
+    """Serves (or connects to) the task and result queues."""
+
+
+QueueManager.register('tasks', callable=_task_queue)
+QueueManager.register('results', callable=_result_queue)
+
+
+def parse_address(text: str) -> Address:
+    """``host:port`` (or just ``host``) as an address tuple."""
+    host, _, port = text.rpartition(':') if ':' in text else (text, '', '')
+    return host or '127.0.0.1', int(port) if port else DEFAULT_PORT
+
+
+class Coordinator:
+    """Hands out tasks and gathers their results, in order."""
+
+    def __init__(self, address: Address = ('127.0.0.1', DEFAULT_PORT), authkey: bytes = None,
+                 window: int = 64, task_timeout: float = 600.0):
+        """
+        Args:
+            address: Where to listen (port 0 picks a free one; see ``address`` after ``start``)
+            authkey: Shared secret workers must present; required unless ``address`` is loopback
+            window: Most tasks handed out but not yet yielded
+            task_timeout: Seconds before an unanswered task is handed out again
+        """
+        self.manager = QueueManager(address=address, authkey=check_authkey(address, authkey))
+        self.window = window
+        self.task_timeout = task_timeout
+        self.address = address
+        self._next_task = 0
+
+    def start(self):
+        self.manager.start()
+        self.address = self.manager.address
+        self.tasks = self.manager.tasks()
+        self.results = self.manager.results()
+
+    def map_ordered(self, payloads: Iterable[Any]) -> Iterator[Any]:
+        """Send every payload to the workers and yield their results in payload order."""
+        payloads = iter(payloads)
+        first = self._next_task
+        pending = {}  # task number -> (payload, time handed out)
+        finished = {}
+        next_to_yield = first
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) + len(finished) < self.window:
+                payload = next(payloads, None)
+                if payload is None:
+                    exhausted = True
+                    break
+                number = self._next_task
+                self._next_task += 1
+                self.tasks.put((number, pickle.dumps(payload)))
+                pending[number] = (payload, time.monotonic())
+            if not pending and not finished:
+                return
+
+            try:
+                number, ok, result = self.results.get(timeout=1.0)
+            except queue.Empty:
+                now = time.monotonic()
+                for number, (payload, handed_out) in list(pending.items()):
+                    if now - handed_out > self.task_timeout:
+                        self.tasks.put((number, pickle.dumps(payload)))
+                        pending[number] = (payload, now)
+                continue
+            if number not in pending:
+                continue  # A repeat of a task that was handed out twice
+            del pending[number]
+            if not ok:
+                raise RuntimeError(f"Task {number} failed on a worker: {result}")
+            finished[number] = pickle.loads(result)
+            while next_to_yield in finished:
+                yield finished.pop(next_to_yield)
+                next_to_yield += 1
+
+    def shutdown(self):
+        """Stop serving; connected workers see the queue go away and exit."""
+        self.manager.shutdown()
+
+
+def run_worker(address: Address, authkey: bytes, handler: Callable[[Any], Any], poll: float = 1.0,
+               max_tasks: int = None) -> int:
+    """
+    Take tasks from a coordinator and send back ``handler(payload)`` until the
+    coordinator goes away (or ``max_tasks`` are done). Returns the tasks done.
+    Without an ``authkey`` only a loopback ``address`` is accepted.
+    """
+    manager = QueueManager(address=address, authkey=check_authkey(address, authkey))
+    manager.connect()
+    tasks, results = manager.tasks(), manager.results()
+    done = 0
+    while max_tasks is None or done < max_tasks:
+        try:
+            number, payload = tasks.get(timeout=poll)
+        except queue.Empty:
+            continue
+        except (EOFError, OSError):
+            break
+        try:
+            reply = (number, True, pickle.dumps(handler(pickle.loads(payload))))
+        except Exception as e:
+            reply = (number, False, f"{type(e).__name__}: {e}")
+        try:
+            results.put(reply)
+        except (EOFError, OSError):
+            break
+        done += 1
+    return done
@@ -0,0 +1,122 @@
+# src/game_sessions.py
+"""
+Game Sessions for the Backend
+Server-side state of games in progress, so AI clients send each turn's event
+(the letter called and where it showed) instead of the whole board.
+
+A session holds the board, the letters called, the category and the game's
+``CandidateSet``, which is narrowed by each event rather than looked up again
+from the whole corpus on every move.
+
+Sessions live in memory. Each one expires ``ttl`` seconds after it was last
+used, and the least recently used go first once ``max_sessions`` are open.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from .solution_index import SolutionIndex, board_pattern, get_solution_index
+
+DEFAULT_TTL = 30 * 60
+DEFAULT_MAX_SESSIONS = 10000
+
+
+class GameSession:
+    """One game's board, called letters, category and candidate puzzles."""
+
+    def __init__(self, revealed_letters: Iterable[str], used_letters: Iterable[str] = (),
+                 puzzle_category: str = '', index: SolutionIndex = None):
+        self.revealed_letters: List[str] = list(revealed_letters)
+        self.used_letters: List[str] = [letter.upper() for letter in used_letters]
+        self.puzzle_category = puzzle_category
+        self.index = index or get_solution_index()
+        self.candidates = self.index.candidates(self.revealed_letters, self.used_letters)
+        self.events = 0
+        self.lock = threading.Lock()
+
+    def apply(self, letter: str, positions: Iterable[int] = ()):
+        """
+        Record a called letter and the board positions it showed at (none for a miss).
+
+        Raises:
+            ValueError: If the letter or a position doesn't fit the board
+        """
+        letter = (letter or '').upper()
+        if len(letter) != 1 or not letter.isalpha():
+            raise ValueError(f"Not a letter: {letter!r}")
+        positions = list(positions)
+        for pos in positions:
+            if not isinstance(pos, int) or not 0 <= pos < len(self.revealed_letters):
+                raise ValueError(f"No board position {pos!r}")
+            if self.revealed_letters[pos] not in ('_', letter):
+                raise ValueError(f"Position {pos} already shows {self.revealed_letters[pos]}")
+        for pos in positions:
+            self.revealed_letters[pos] = letter
+        if letter not in self.used_letters:
+            self.used_letters.append(letter)
+        self.candidates.observe(letter, board_pattern(self.revealed_letters))
+        self.events += 1
+
+    def solve(self, top_n: int = 5) -> Dict:
+        """The most probable solution of the board (see ``SolutionIndex.solve``)."""
+        return self.index.solve(self.revealed_letters, self.used_letters, self.puzzle_category, top_n,
+                                candidates=self.candidates)
+
+    def to_json(self) -> Dict:
+        return {
+            'revealed_letters': self.revealed_letters,
+            'used_letters': self.used_letters,
+            'puzzle_category': self.puzzle_category,
+            'candidate_count': len(self.candidates),
+            'events': self.events,
+        }
+
+
+class SessionStore:
+    """Open sessions by id, expiring the idle ones."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_sessions: int = DEFAULT_MAX_SESSIONS, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        # Least recently used first, each with the time it was last used
+        self._sessions: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: float, room: int = 0):
+        """Drop expired sessions, and the least recently used until ``room`` more fit."""
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.ttl and len(self._sessions) + room <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    def create(self, session: GameSession) -> str:
+        session_id = secrets.token_urlsafe(12)
+        with self._lock:
+            now = self.clock()
+            self._evict(now, room=1)
+            self._sessions[session_id] = (session, now)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        """The session, if it is still open; using it keeps it open for another ``ttl``."""
+        with self._lock:
+            now = self.clock()
+            self._evict(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions[session_id] = (entry[0], now)
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
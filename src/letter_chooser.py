@@ -3,6 +3,9 @@ from collections import Counter
 import re
 from pathlib import Path
 
+from .PlayGame.corpus_index import PatternIndex
+from .PlayGame.corpus_snapshot import load_snapshot
+
 FREE_LETTERS = set("RSTLNE")
 VOWELS = set("AEIOU")
 CONSONANTS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ") - VOWELS
@@ -26,28 +29,12 @@ def _load_candidates(puzzles_file="data/bonus_puzzles.txt"):
     p = Path(puzzles_file)
     if not p.exists():
         return []
+    snapshot = load_snapshot()
+    rows = snapshot.source_rows(p)
+    if rows is not None:
+        return [snapshot.puzzle(i).upper() for i in rows]
     return [line.strip().upper() for line in p.read_text().splitlines() if line.strip()]
 
-def _pattern_to_regex_str(pattern_str):
-    """
-    Convert pattern string (with spaces and letters/_ characters) into a regex
-    that matches the full phrase (space positions preserved).
-    We'll convert spaces to literal spaces and underscores to '.' (single char).
-    Example: 'C _ T  _ A _' -> '^C. T .A.$' but simpler approach below.
-    """
-    parts = []
-    for ch in pattern_str:
-        if ch == " ":
-            parts.append(r"\s")
-        elif ch == "_":
-            parts.append(".")
-        else:
-            parts.append(re.escape(ch))
-    regex = "^" + "".join(parts) + "$"
-    # replace \s with actual space to ensure we match single space between words
-    regex = regex.replace(r"\s", " ")
-    return regex
-
 class LetterChooserAI:
     """
     Heuristic letter chooser for the Wheel of Fortune bonus round.
@@ -60,23 +47,32 @@ class LetterChooserAI:
 
     def __init__(self, puzzles_file="data/bonus_puzzles.txt"):
         self.puzzles_file = puzzles_file
+        self._index = None
+
+    def _file_index(self):
+        """Load the puzzles file once and keep its pattern index around."""
+        if self._index is None:
+            self._index = PatternIndex(_load_candidates(self.puzzles_file))
+        return self._index
 
-    def choose_letters(self, pattern, candidates=None):
+    def choose_letters(self, pattern, candidates=None, guessed=None):
         """
         Choose 3 consonants + 1 vowel using frequency within remaining candidates.
 
         pattern: list or string pattern (letters, underscores, and spaces)
         candidates: optional list of candidate phrases to restrict to; if None, load from file.
+        guessed: optional letters already called (e.g. RSTLNE); candidates
+                 hiding one of them under a blank are dropped
         """
         pattern_str = _normalize_pattern(pattern)
         if candidates is None:
-            candidates = _load_candidates(self.puzzles_file)
-
-        # Build regex to filter candidates that match the visible letters and word lengths
-        regex = re.compile(_pattern_to_regex_str(pattern_str))
+            index = self._file_index()
+            candidates = index.phrases
+        else:
+            index = PatternIndex(candidates)
 
-        # Filter candidate pool
-        filtered = [c for c in candidates if regex.match(c)]
+        # Filter candidates that match the visible letters and word lengths
+        filtered = index.match(pattern_str, guessed or ())
         if not filtered:
             # fallback to unfiltered corpus
             filtered = candidates[:]
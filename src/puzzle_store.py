@@ -0,0 +1,174 @@
+# src/puzzle_store.py
+"""
+Puzzle Store for the Backend
+Every puzzle the web game can show, held in memory with an inverted index on
+category, round type, length (letters only) and word count.
+
+Each value of each field keeps the ids of its puzzles, so a single-field
+filter is a dictionary lookup. Combined filters are intersected once, from the
+smallest list, and cached. After that, a filtered random draw or count is
+O(1), and a page of a listing costs a binary search plus the page itself.
+
+Listings page by cursor: the cursor is the id of the last puzzle on the
+previous page, so pages stay put while other clients page through the store.
+"""
+
+import bisect
+import html
+import random
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .PlayGame.corpus_index import PUZZLE_FILES
+from .PlayGame.corpus_snapshot import load_snapshot
+from .solution_index import normalize_category
+
+# Fields puzzles can be filtered on
+FILTER_FIELDS = ("category", "round", "length", "words")
+
+# The board shows letters and these; longer phrases don't fit it
+PHRASE_PATTERN = re.compile(r"^[A-Z\s&'-]+$")
+MAX_PHRASE_LENGTH = 50
+
+# Filter combinations kept intersected; clients choose the filters, so this is bounded
+MAX_CACHED_FILTERS = 1024
+
+
+def round_type(game_type: str) -> str:
+    """Round type without the corpus's annotation marks, e.g. 'R3*' -> 'R3' ('' if unreadable)."""
+    match = re.match(r"[A-Z]+\d*", game_type.strip().upper())
+    return match.group(0) if match else ""
+
+
+def _filter_key(field: str, value) -> object:
+    if field == "category":
+        return normalize_category(value)
+    if field == "round":
+        return round_type(value)
+    return int(value)
+
+
+class PuzzleStore:
+    """
+    Puzzles as ``{'id', 'phrase', 'category', 'round', 'length', 'words'}``
+    dicts, ids being positions in ``puzzles``.
+
+    Filters accept a single value or a collection, e.g.
+    ``random(round=["R1", "R2"], length=range(10, 21))``.
+    """
+
+    def __init__(self, puzzles: Iterable[Dict[str, str]]):
+        self.puzzles: List[Dict] = []
+        self.postings: Dict[str, Dict[object, List[int]]] = {field: {} for field in FILTER_FIELDS}
+        self._spellings: Dict[str, Counter] = {}
+        seen = set()
+        for puzzle in puzzles:
+            phrase = re.sub(r"\s+", " ", puzzle["phrase"]).strip().upper()
+            category = puzzle.get("category", "").strip().upper()
+            if (phrase, category) in seen:
+                continue
+            seen.add((phrase, category))
+            record = {
+                "id": len(self.puzzles),
+                "phrase": phrase,
+                "category": category,
+                "round": round_type(puzzle.get("round", "")),
+                "length": sum(ch.isalpha() for ch in phrase),
+                "words": sum(any(ch.isalpha() for ch in word) for word in phrase.split()),
+            }
+            self.puzzles.append(record)
+            for field in FILTER_FIELDS:
+                self.postings[field].setdefault(_filter_key(field, record[field]), []).append(record["id"])
+            self._spellings.setdefault(normalize_category(category), Counter())[category] += 1
+        self._matches: Dict[tuple, List[int]] = {}
+
+    @classmethod
+    def from_corpus(cls, puzzles_dir: Path = None, puzzle_files: List[str] = None) -> 'PuzzleStore':
+        """Every puzzle of the corpus files the board can show."""
+        snapshot = load_snapshot(puzzles_dir)
+
+        def rows():
+            for name in puzzle_files or PUZZLE_FILES:
+                source = snapshot.source_rows(snapshot.puzzles_dir / name)
+                for i in source or ():
+                    if snapshot.field_count(i) < 2:
+                        continue
+                    phrase = html.unescape(snapshot.puzzle(i)).strip().upper()
+                    if PHRASE_PATTERN.match(phrase) and len(phrase) <= MAX_PHRASE_LENGTH:
+                        yield {"phrase": phrase, "category": html.unescape(snapshot.category(i)),
+                               "round": snapshot.round(i)}
+
+        return cls(rows())
+
+    def __len__(self) -> int:
+        return len(self.puzzles)
+
+    def _key(self, filters: dict) -> tuple:
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown puzzle filter(s): {', '.join(sorted(unknown))}")
+        key = []
+        for field in FILTER_FIELDS:
+            value = filters.get(field)
+            if value is None:
+                key.append(None)
+            elif isinstance(value, (str, int)):
+                key.append(frozenset([_filter_key(field, value)]))
+            else:
+                key.append(frozenset(_filter_key(field, v) for v in value))
+        return tuple(key)
+
+    def ids(self, **filters) -> List[int]:
+        """Ids of the puzzles passing ``filters``, ascending."""
+        key = self._key(filters)
+        matches = self._matches.get(key)
+        if matches is None:
+            lists = []
+            for field, wanted in zip(FILTER_FIELDS, key):
+                if wanted is not None:
+                    postings = self.postings[field]
+                    lists.append(sorted(i for value in wanted for i in postings.get(value, ())))
+            if not lists:
+                matches = list(range(len(self.puzzles)))
+            else:
+                lists.sort(key=len)
+                matches = lists[0]
+                for other in lists[1:]:
+                    other = set(other)
+                    matches = [i for i in matches if i in other]
+            if len(self._matches) >= MAX_CACHED_FILTERS:
+                self._matches.clear()
+            self._matches[key] = matches
+        return matches
+
+    def count(self, **filters) -> int:
+        return len(self.ids(**filters))
+
+    def random(self, rng: random.Random = None, **filters) -> Optional[Dict]:
+        """A random puzzle passing ``filters``, or None if there are none."""
+        matches = self.ids(**filters)
+        if not matches:
+            return None
+        return self.puzzles[matches[(rng or random).randrange(len(matches))]]
+
+    def page(self, cursor: Optional[int] = None, limit: int = 50, **filters) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Up to ``limit`` puzzles passing ``filters`` after the ``cursor`` id,
+        and the cursor of the next page (None on the last one).
+        """
+        matches = self.ids(**filters)
+        start = 0 if cursor is None else bisect.bisect_right(matches, cursor)
+        page = [self.puzzles[i] for i in matches[start:start + limit]]
+        next_cursor = page[-1]["id"] if page and start + limit < len(matches) else None
+        return page, next_cursor
+
+    def values(self, field: str) -> Dict[object, int]:
+        """Puzzle count for each value of ``field``."""
+        if field not in FILTER_FIELDS:
+            raise TypeError(f"Cannot list values of {field!r}")
+        if field == "category":
+            # Each category under the spelling most of its puzzles use
+            return {spellings.most_common(1)[0][0]: sum(spellings.values()) for spellings in self._spellings.values()}
+        return {value: len(ids) for value, ids in self.postings[field].items()}
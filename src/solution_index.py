@@ -0,0 +1,187 @@
+# src/solution_index.py
+"""
+Solution Index for the Backend Solver
+A warm, process-wide index that turns a board (the revealed letters, the
+letters already called and the category) into its most probable solution.
+
+Two sources are tried in turn:
+
+1. Whole puzzles from the corpus that fit the board, found through the
+   shape-bucketed ``PatternIndex``. Each scores the number of times it appears
+   in the corpus, times ``CATEGORY_WEIGHT`` if it has appeared under the
+   board's category.
+2. Failing that, word by word from the corpus vocabulary (plus the system
+   dictionary, if there is one): every unfinished word becomes the matching
+   word seen most often, again favouring words seen under the category.
+
+Build it once when the server starts (``get_solution_index()``); a solve is
+then a handful of bitset ANDs and one pass over the surviving candidates. It
+has the ``entries`` and ``index`` of a ``CorpusIndex``, so a game can keep a
+``CandidateSet`` over it and narrow that as letters are called instead.
+"""
+
+import html
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .PlayGame.corpus_index import CandidateSet, DictionaryIndex, PatternIndex
+from .PlayGame.corpus_snapshot import load_snapshot
+
+# How much more likely a puzzle or word is under a category it has appeared in
+CATEGORY_WEIGHT = 5.0
+
+# Pseudo-count of a dictionary word that never appeared in a puzzle
+DICTIONARY_COUNT = 0.1
+
+SYSTEM_DICTIONARY = Path("/usr/share/dict/words")
+
+_SOLUTION_INDEX: Optional['SolutionIndex'] = None
+
+
+def normalize_category(category: str) -> str:
+    """Category as a lookup key: 'Things', 'THING' and 'thing ' are one category."""
+    key = re.sub(r'\s+', ' ', html.unescape(category or '')).strip().upper()
+    if key.endswith('S') and not key.endswith('SS'):
+        key = key[:-1]
+    return key
+
+
+def board_pattern(revealed) -> str:
+    """A board (string or list of cells) as an index pattern of letters, blanks and single spaces."""
+    text = ''.join(revealed) if isinstance(revealed, (list, tuple)) else str(revealed)
+    text = re.sub(r'[^A-Z_ ]', '', text.upper())
+    return re.sub(r' +', ' ', text).strip()
+
+
+class SolutionIndex:
+    """
+    Corpus puzzles and vocabulary, with their counts overall and per category.
+    """
+
+    def __init__(self, puzzles_dir: Path = None, dictionary: Path = SYSTEM_DICTIONARY):
+        snapshot = load_snapshot(puzzles_dir)
+        puzzles: Dict[str, str] = {}
+        self.puzzle_counts: Counter = Counter()
+        self.puzzle_categories: Dict[str, set] = defaultdict(set)
+        self.word_counts: Counter = Counter()
+        self.category_word_counts: Dict[str, Counter] = defaultdict(Counter)
+        for i in range(len(snapshot)):
+            puzzle_norm = snapshot.puzzle_norm(i)
+            if not puzzle_norm:
+                continue
+            category = normalize_category(snapshot.category(i))
+            puzzles.setdefault(puzzle_norm, snapshot.puzzle(i).strip().upper())
+            self.puzzle_counts[puzzle_norm] += 1
+            self.puzzle_categories[puzzle_norm].add(category)
+            for word in puzzle_norm.split(' '):
+                self.word_counts[word] += 1
+                self.category_word_counts[category][word] += 1
+
+        self.entries: List[Tuple[str, str]] = [(puzzle, puzzle_norm) for puzzle_norm, puzzle in puzzles.items()]
+        self.index = PatternIndex(puzzle_norm for _, puzzle_norm in self.entries)
+
+        # Most frequent words first, so a scan of the matches meets likely words early
+        vocabulary = sorted(self.word_counts, key=lambda word: (-self.word_counts[word], word))
+        if dictionary and Path(dictionary).exists():
+            seen = set(vocabulary)
+            with open(dictionary, encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    word = line.strip().upper()
+                    if word.isalpha() and word.isascii() and word not in seen:
+                        seen.add(word)
+                        vocabulary.append(word)
+        self.words = DictionaryIndex(vocabulary)
+        self.words.prebuild()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def candidates(self, revealed, guessed: Iterable[str] = ()) -> CandidateSet:
+        """A ``CandidateSet`` of the corpus puzzles that fit a board, to narrow as the game goes on."""
+        pattern = board_pattern(revealed)
+        return CandidateSet(pattern, self._excluded(pattern, guessed), corpus=self)
+
+    @staticmethod
+    def _excluded(pattern: str, guessed: Iterable[str]) -> set:
+        """Letters that can't be under a blank: those called, and those showing (they show everywhere)."""
+        excluded = {letter.upper() for letter in guessed if len(letter) == 1 and letter.isalpha()}
+        excluded.update(ch for ch in pattern if ch.isalpha())
+        return excluded
+
+    def solve(self, revealed, guessed: Iterable[str] = (), category: str = '', top_n: int = 5,
+              candidates: CandidateSet = None) -> Dict:
+        """
+        The most probable solution of a board.
+
+        Args:
+            revealed: The board, with ``_`` for hidden letters (a string or a list of cells)
+            guessed: Letters already called; none of them can be hiding under a blank
+            category: The puzzle's category, if known
+            top_n: How many alternatives to return
+            candidates: The game's ``CandidateSet``; used instead of a fresh lookup if it tracks this board
+
+        Returns:
+            ``{'solution', 'probability', 'source', 'candidates'}``: ``source`` is
+            ``'corpus'``, ``'dictionary'`` or ``None`` when nothing fits, and
+            ``candidates`` lists ``(solution, probability)`` best first.
+        """
+        pattern = board_pattern(revealed)
+        if not pattern:
+            return {'solution': '', 'probability': 0.0, 'source': None, 'candidates': []}
+        excluded = self._excluded(pattern, guessed)
+        category = normalize_category(category)
+
+        if candidates is not None and candidates.tracks(pattern):
+            matches = candidates.entries()
+        else:
+            matches = [self.entries[i] for i in self.index.query(pattern, excluded)]
+        if matches:
+            scored = []
+            for puzzle, puzzle_norm in matches:
+                score = self.puzzle_counts[puzzle_norm]
+                if category in self.puzzle_categories[puzzle_norm]:
+                    score *= CATEGORY_WEIGHT
+                scored.append((puzzle, score))
+            total = sum(score for _, score in scored)
+            scored.sort(key=lambda item: -item[1])
+            candidates = [(puzzle, score / total) for puzzle, score in scored[:top_n]]
+            return {'solution': candidates[0][0], 'probability': candidates[0][1], 'source': 'corpus',
+                    'candidates': candidates}
+
+        words = []
+        probability = 1.0
+        for word in pattern.split(' '):
+            if '_' not in word:
+                words.append(word)
+                continue
+            best, share = self._best_word(word, excluded, category)
+            if best is None:
+                return {'solution': '', 'probability': 0.0, 'source': None, 'candidates': []}
+            words.append(best)
+            probability *= share
+        solution = ' '.join(words)
+        return {'solution': solution, 'probability': probability, 'source': 'dictionary',
+                'candidates': [(solution, probability)]}
+
+    def _best_word(self, pattern: str, excluded: Iterable[str], category: str) -> Tuple[Optional[str], float]:
+        """The likeliest word fitting ``pattern``, and its share of all the fitting words' weight."""
+        category_counts = self.category_word_counts.get(category)
+        best, best_score, total = None, 0.0, 0.0
+        for word in self.words.match(pattern, excluded):
+            score = self.word_counts.get(word, DICTIONARY_COUNT)
+            if category_counts and word in category_counts:
+                score += (CATEGORY_WEIGHT - 1) * category_counts[word]
+            total += score
+            if score > best_score:
+                best, best_score = word, score
+        return best, (best_score / total if total else 0.0)
+
+
+def get_solution_index() -> SolutionIndex:
+    """Return the process-wide solution index, building it on first use."""
+    global _SOLUTION_INDEX
+    if _SOLUTION_INDEX is None:
+        _SOLUTION_INDEX = SolutionIndex()
+    return _SOLUTION_INDEX
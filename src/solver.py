@@ -4,6 +4,9 @@ from pathlib import Path
 from collections import Counter
 from math import log
 
+from .PlayGame.corpus_index import PatternIndex
+from .PlayGame.corpus_snapshot import load_snapshot
+
 def _normalize_pattern(pattern):
     if isinstance(pattern, list):
         return "".join(pattern).upper()
@@ -16,21 +19,12 @@ def _load_candidates(puzzles_file="data/bonus_puzzles.txt"):
     p = Path(puzzles_file)
     if not p.exists():
         return []
+    snapshot = load_snapshot()
+    rows = snapshot.source_rows(p)
+    if rows is not None:
+        return [snapshot.puzzle(i).upper() for i in rows]
     return [line.strip().upper() for line in p.read_text().splitlines() if line.strip()]
 
-def _pattern_to_regex(pattern_str):
-    parts = []
-    for ch in pattern_str:
-        if ch == " ":
-            parts.append(r"\s")
-        elif ch == "_":
-            parts.append(".")
-        else:
-            parts.append(re.escape(ch))
-    regex = "^" + "".join(parts) + "$"
-    regex = regex.replace(r"\s", " ")
-    return re.compile(regex)
-
 def _letter_frequency(corpus):
     # corpus: list of phrases -> flatten letters and count
     cnt = Counter()
@@ -48,6 +42,7 @@ class PuzzleSolverAI:
     def __init__(self, puzzles_file="data/bonus_puzzles.txt"):
         self.puzzles_file = puzzles_file
         self.corpus = _load_candidates(self.puzzles_file)
+        self.index = PatternIndex(self.corpus)
         self.letter_freq = _letter_frequency(self.corpus)
         # small smoothing constant
         self.total_letters = sum(self.letter_freq.values()) or 1
@@ -95,19 +90,22 @@ class PuzzleSolverAI:
 
         return score
 
-    def solve(self, pattern, candidates=None, top_n=5):
+    def solve(self, pattern, candidates=None, top_n=5, guessed=None):
         """
         Return top_n candidate guesses (sorted by score).
         pattern: list or string with underscores for unknowns
         candidates: optional list to search
+        guessed: optional letters already called; candidates hiding one of
+                 them under a blank are dropped
         """
         pattern_str = _normalize_pattern(pattern)
         if candidates is None:
             candidates = self.corpus
+            index = self.index
+        else:
+            index = PatternIndex(candidates)
 
-        regex = _pattern_to_regex(pattern_str)
-
-        matched = [c for c in candidates if regex.match(c)]
+        matched = index.match(pattern_str, guessed or ())
         if not matched:
             # fallback: allow candidates with same number of words and lengths
             pw_lengths = [len(w) for w in pattern_str.split(" ")]
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Make the repo root importable so `src` and `backend` resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import asgi
+import backend
+from src.game_sessions import GameSession, SessionStore
+from src.puzzle_store import PuzzleStore
+from src.solution_index import board_pattern, get_solution_index, normalize_category
+
+
+def test_solver_finds_a_corpus_puzzle_from_a_partial_board():
+    index = get_solution_index()
+    used_letters = list('WHEFR')
+    result = index.solve(list('WHEE_ _F F_R___E'), used_letters, 'Phrase')
+    assert result['source'] == 'corpus'
+    assert result['solution'] == 'WHEEL OF FORTUNE'
+    assert 0 < result['probability'] <= 1
+    # L was called and missed, so it can't be under a blank
+    assert index.solve('WHEE_ _F F_R___E', used_letters + ['L'])['solution'] != 'WHEEL OF FORTUNE'
+
+
+def test_solver_falls_back_to_words_for_unseen_puzzles():
+    result = get_solution_index().solve('ZZZZ _OUSE', ['Z', 'O', 'U', 'S', 'E'])
+    assert result['source'] == 'dictionary'
+    assert result['solution'].startswith('ZZZZ ') and result['solution'].endswith('OUSE')
+
+
+def test_board_and_category_normalization():
+    assert board_pattern(['A', '_', ' ', ' ', 'B', "'"]) == 'A_ B'
+    assert normalize_category('Things') == normalize_category('THING ') == 'THING'
+    assert normalize_category('Before &amp; After') == 'BEFORE & AFTER'
+
+
+def test_solve_endpoint_reports_solution_and_timing():
+    client = backend.app.test_client()
+    response = client.post('/api/ai/solve', json={'revealed_letters': list('WHEE_ _F F_R___E'),
+                                                  'used_letters': list('WHEFR'), 'puzzle_category': 'Phrase'})
+    assert response.json['solution'] == 'WHEEL OF FORTUNE'
+    assert 'cpu;dur=' in response.headers['Server-Timing']
+    stats = client.get('/api/stats/latency').json['timings']
+    assert stats['route:/api/ai/solve']['wall_ms']['count'] >= 1
+    bad = client.post('/api/ai/solve', json={'revealed_letters': list('WHEE_ _F F_R___E'), 'top_n': '3'})
+    assert bad.status_code == 400 and bad.json == {'error': 'top_n must be an integer'}
+
+
+def test_ai_player_solves_instead_of_returning_a_placeholder():
+    player = backend.AIPlayer('morse')
+    assert player._attempt_solve(list('WHEE_ _F F_R___E'), 'Phrase', list('WHEFR')) == 'WHEEL OF FORTUNE'
+
+
+def test_puzzle_store_filters_dedupes_and_pages():
+    store = PuzzleStore([
+        {'phrase': 'GOOD LUCK', 'category': 'Phrase', 'round': 'R1*'},
+        {'phrase': 'GOOD LUCK', 'category': 'Phrase', 'round': 'R2'},
+        {'phrase': 'HONEY BEE', 'category': 'Thing', 'round': 'R1'},
+        {'phrase': 'SIT TIGHT', 'category': 'Phrase', 'round': 'T1'},
+    ])
+    assert len(store) == 3
+    assert store.ids(round='R1') == [0, 1]
+    assert store.ids(category='phrases', length=range(8, 9)) == [0, 2]
+    assert store.random(category='THING', words=2)['phrase'] == 'HONEY BEE'
+    assert store.random(category='PERSON') is None
+    first, cursor = store.page(limit=2)
+    rest, last = store.page(cursor, limit=2)
+    assert [p['id'] for p in first + rest] == [0, 1, 2] and last is None
+
+
+def test_puzzle_api_serves_the_whole_corpus_with_filters():
+    client = backend.app.test_client()
+    assert client.get('/api/puzzles/count').json['count'] > 500
+    puzzle = client.get('/api/puzzles/random?category=Phrase&length=10-12').json
+    assert puzzle['category'] == 'PHRASE' and 10 <= puzzle['length'] <= 12
+    page = client.get('/api/puzzles?round=BR&limit=3').json
+    following = client.get(f"/api/puzzles?round=BR&limit=3&cursor={page['next_cursor']}").json
+    assert all(p['round'] == 'BR' for p in page['puzzles'] + following['puzzles'])
+    assert following['puzzles'][0]['id'] > page['puzzles'][-1]['id']
+    assert client.get('/api/puzzles?length=ten').status_code == 400
+    assert client.get('/api/puzzles/count?length=60').json['count'] == 0
+    assert client.get('/api/puzzles/random?length=60').status_code == 404
+    assert client.get('/api/puzzles?length=20-10').status_code == 400
+
+
+def test_sessions_expire_when_idle_and_evict_the_least_recently_used():
+    now = [0.0]
+    store = SessionStore(ttl=10, max_sessions=2, clock=lambda: now[0])
+    first = store.create(GameSession('__ ___'))
+    second = store.create(GameSession('__ ___'))
+    now[0] = 5
+    assert store.get(first) is not None
+    store.create(GameSession('__ ___'))  # Full: the idle second session goes
+    assert store.get(second) is None and store.get(first) is not None
+    now[0] = 16
+    assert store.get(first) is None and len(store) == 0
+
+
+def test_session_moves_follow_events_without_resending_the_board():
+    client = backend.app.test_client()
+    created = client.post('/api/sessions', json={'revealed_letters': list('_____ __ _______'),
+                                                 'puzzle_category': 'Phrase'})
+    assert created.status_code == 201
+    session = f"/api/sessions/{created.json['session_id']}"
+    client.post(f'{session}/events', json={'letter': 'E', 'positions': [2, 3, 15]})
+    client.post(f'{session}/events', json={'letter': 'Z', 'positions': []})
+    move = client.post(f'{session}/move', json={'strategy': 'morse', 'event': {'letter': 'T', 'positions': [12]}})
+    assert move.json == {'action': 'guess_consonant', 'letter': 'N'}  # E and T are taken, A needs $250
+    state = client.get(session).json
+    assert state['used_letters'] == ['E', 'Z', 'T'] and state['candidate_count'] >= 1
+    assert backend.SESSIONS.get(created.json['session_id']).solve()['solution'] == 'WHEEL OF FORTUNE'
+    assert client.post(f'{session}/events', json={'letter': 'Q', 'positions': [2]}).status_code == 400
+    assert client.delete(session).status_code == 200
+    assert client.post(f'{session}/move', json={}).status_code == 404
+
+
+def test_batch_moves_match_one_move_at_a_time(monkeypatch):
+    states = [
+        {'strategy': 'morse', 'used_letters': ['E', 'T'], 'current_money': 0},
+        {'strategy': 'oxford', 'used_letters': ['E', 'T'], 'current_money': 300},
+        {'strategy': 'alphabetical', 'used_letters': [], 'current_money': 100},
+        {'strategy': 'unknown', 'used_letters': list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'),
+         'revealed_letters': list('WHEE_ _F F_R___E'), 'puzzle_category': 'Phrase'},
+    ]
+    expected = [backend.ai_player(state['strategy']).get_next_guess(
+        state.get('revealed_letters', []), state['used_letters'], state.get('current_money', 0),
+        state.get('puzzle_category', '')) for state in states]
+    client = backend.app.test_client()
+    assert client.post('/api/ai/moves:batch', json={'states': states}).json['moves'] == expected
+    monkeypatch.setattr(backend, 'NUMPY_AVAILABLE', False)
+    assert backend.batch_next_guesses(states) == expected
+    assert client.post('/api/ai/moves:batch', json={'states': 'nope'}).status_code == 400
+
+
+async def asgi_request(method, path, payload=None):
+    """Send one request straight to the ASGI app; returns (status, headers, JSON body)."""
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'http_version': '1.1',
+             'headers': [(b'content-type', b'application/json')]}
+    messages = [{'type': 'http.request', 'body': json.dumps(payload).encode() if payload is not None else b''}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi.app(scope, receive, send)
+    return sent[0]['status'], dict(sent[0]['headers']), json.loads(sent[1]['body'])
+
+
+def test_asgi_app_keeps_slow_commentary_off_the_solver(monkeypatch):
+    class SlowHost:
+        def generate_pat_sajak_commentary(self, action, player_name):
+            time.sleep(1.0)
+            return f"{player_name} gives the wheel a {action['type']}!"
+
+    monkeypatch.setattr(backend, 'commentary_host', lambda: SlowHost())
+    commentary = {'action': {'type': 'spin'}, 'player_name': 'Ann'}
+    solve = {'revealed_letters': list('WHEE_ _F F_R___E'), 'used_letters': list('WHEFR'), 'puzzle_category': 'Phrase'}
+
+    async def scenario():
+        talking = [asyncio.create_task(asgi_request('POST', '/api/commentary', commentary))
+                   for _ in range(asgi.SOLVER_THREADS * 2)]
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        solved = await asgi_request('POST', '/api/ai/solve', solve)
+        return time.perf_counter() - started, solved, await asyncio.gather(*talking)
+
+    waited, (status, headers, result), talked = asyncio.run(scenario())
+    assert status == 200 and result['solution'] == 'WHEEL OF FORTUNE' and b'server-timing' in headers
+    assert waited < 0.5  # Not queued behind the commentary
+    assert all(reply == (200, reply[1], {'commentary': 'Ann gives the wheel a spin!'}) for reply in talked)
+    assert asyncio.run(asgi_request('POST', '/api/commentary', {}))[0] == 400
+
+
+def test_asgi_app_caps_request_bodies_and_refuses_websockets(monkeypatch):
+    monkeypatch.setattr(asgi, 'MAX_BODY_BYTES', 64)
+    status, _, reply = asyncio.run(asgi_request('POST', '/api/ai/solve', {'revealed_letters': ['_'] * 50}))
+    assert status == 413 and 'error' in reply
+
+    sent = []
+    messages = [{'type': 'websocket.connect'}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app({'type': 'websocket', 'path': '/ws'}, receive, send))
+    assert sent == [{'type': 'websocket.close'}]
@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+
+# Make src/Simulations importable (it puts src/PlayGame on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Simulations'))
+
+import numpy as np
+
+from batch_simulator import ALPHABET, BatchSimulator
+from smart_decision import should_spin_or_buy_vowel
+
+
+def test_smart_rule_matches_should_spin_or_buy_vowel():
+    simulator = BatchSimulator(seed=0)
+    rng = random.Random(3)
+    puzzles = [simulator.sampler.records[rng.randrange(len(simulator.sampler))][0] for _ in range(300)]
+    guesses = [rng.sample(ALPHABET, rng.randrange(14)) for _ in puzzles]
+    winnings = np.array([rng.choice([0, 200, 250, 400, 700, 1200, 3000]) for _ in puzzles])
+
+    counts = np.array([[puzzle.count(ch) for ch in ALPHABET] for puzzle in puzzles])
+    guessed = np.array([[ch in called for ch in ALPHABET] for called in guesses])
+    sizes = np.array([len(puzzle.replace(' ', '')) for puzzle in puzzles])
+    buy = simulator.smart_decisions(counts, guessed, winnings, sizes)
+
+    for i, (puzzle, called) in enumerate(zip(puzzles, guesses)):
+        showing = ''.join(ch if not ch.isalpha() or ch in called else '_' for ch in puzzle)
+        decision, _ = should_spin_or_buy_vowel(showing, int(winnings[i]), called)
+        assert buy[i] == (decision == 'buy_vowel'), (showing, winnings[i], called)
+
+
+def test_seeded_batches_are_reproducible_and_finish():
+    players = ['morse', 'oxford', 'smart']
+    first = BatchSimulator(seed=5).run(players, 500)
+    second = BatchSimulator(seed=5).run(players, 500)
+    for name in first:
+        assert np.array_equal(first[name], second[name])
+
+    # These players never solve, so every game fills the board or hits the turn cap
+    assert (first['winner'] >= 0).mean() > 0.9
+    assert (first['final_winnings'] >= 0).all()
+    assert first['letters_guessed'].max() <= 21 and first['vowels_bought'].max() <= 5
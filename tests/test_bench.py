@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Make bench/ importable (it puts the source directories on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bench'))
+
+from run_bench import compare, make_boards
+
+
+def test_boards_are_seeded_and_reveal_more_at_each_stage():
+    boards = make_boards(5, seed=1)
+    assert boards == make_boards(5, seed=1)
+    assert [board['stage'] for board in boards[:3]] == ['early', 'mid', 'late']
+    blanks = [board['showing'].count('_') for board in boards[:3]]
+    assert blanks[0] >= blanks[1] >= blanks[2]
+    assert all(len(board['showing']) == len(board['puzzle']) for board in boards)
+
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    baseline = {'fast': {'ops_per_sec': 1000, 'peak_kib': 10}, 'lean': {'ops_per_sec': 50, 'peak_kib': 400}}
+    assert compare({'fast': {'ops_per_sec': 900, 'peak_kib': 12}}, baseline) == []
+    assert compare({'fast': {'ops_per_sec': 700, 'peak_kib': 10}}, baseline) == ['fast']
+    assert compare({'lean': {'ops_per_sec': 50, 'peak_kib': 800}, 'new': {'ops_per_sec': 1, 'peak_kib': 1}},
+                   baseline) == ['lean']
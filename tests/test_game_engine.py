@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+
+# Make src/PlayGame importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'PlayGame'))
+
+from game_engine import GameState, Wheel, apply_action, spin_wheel, use_wheel
+
+
+def test_reveal_pays_per_letter_and_keeps_the_turn():
+    state = GameState('HELLO WORLD')
+    new_state, events = apply_action(state, 'L', 500)
+    assert new_state.showing == '__LL_ ___L_'
+    assert new_state.winnings == [1500, 0, 0]
+    assert new_state.turn == 0
+    assert events == [{'type': 'reveal', 'player': 0, 'letter': 'L', 'vowel': False,
+                       'count': 3, 'amount': 1500}]
+    # The old state is untouched
+    assert state.showing == '_____ _____' and state.previous_guesses == []
+
+
+def test_misses_repeats_and_bankrupt_pass_the_turn():
+    state = GameState('HELLO WORLD', winnings=[0, 900, 0], turn=1)
+    state, events = apply_action(state, 'Z', 600)
+    assert events[0]['type'] == 'miss' and state.player == 2
+    state, events = apply_action(state, 'Z', 600)
+    assert events[0]['type'] == 'repeat_guess' and state.previous_guesses == ['Z']
+    state.turn = 1
+    state, events = apply_action(state, '_', -1)
+    assert events[0]['type'] == 'bankrupt' and state.winnings == [0, 0, 0]
+
+
+def test_solve_attempts():
+    state = GameState('HELLO WORLD')
+    wrong, events = apply_action(state, 'SOLVE:HELLO WORD', 0)
+    assert not events[0]['correct'] and wrong.player == 1 and not wrong.is_over
+    right, events = apply_action(wrong, 'SOLVE:HELLO WORLD', 0)
+    assert events[0]['correct'] and right.winner == 1 and right.board_complete
+
+
+def test_seeded_wheel_is_reproducible_and_reports_spins():
+    seen = []
+    wheel = Wheel(rng=random.Random(7), listeners=[seen.append])
+    with use_wheel(wheel):
+        spins = [spin_wheel() for _ in range(20)]
+    again = Wheel(rng=random.Random(7))
+    assert spins == [again.spin() for _ in range(20)]
+    assert [event['value'] for event in seen] == spins
+
+
+def test_commentary_front_end_plays_seeded_games_on_the_engine(monkeypatch):
+    import time
+    import play_with_commentary
+
+    def no_sleep(seconds):
+        raise AssertionError("the engine should never sleep")
+
+    monkeypatch.setattr(time, 'sleep', no_sleep)
+    logged = []
+    monkeypatch.setattr(play_with_commentary, 'safe_log_action', lambda *action: logged.append(action))
+    monkeypatch.setattr(play_with_commentary, 'safe_generate_victory_speech',
+                        lambda *speech: logged.append(('victory',) + speech))
+    players = ['morse', 'oxford', 'smart']
+    first = play_with_commentary.play_random_game(players, rng=random.Random(3))
+    first_log, logged[:] = list(logged), []
+    assert play_with_commentary.play_random_game(players, rng=random.Random(3)) == first
+    assert logged == first_log
+    assert any(action[0] == 'correct_guess' for action in first_log)
+    assert first_log[-1][:2] == ('victory', first)
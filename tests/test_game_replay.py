@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Make src/Simulations importable (it puts src/PlayGame on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Simulations'))
+
+import pytest
+
+from solve_timing_experiments import GameSimulator
+from game_replay import read_replays, replay, replay_states
+
+
+def test_replays_rebuild_every_turn_without_the_players():
+    result = GameSimulator().play_seeded_game(['smart', 'solve_conservative', 'aggressive'], 21, replay=True)
+    entry = result['replay']
+    assert entry['seed'] == 21 and entry['puzzle_id'] is not None
+
+    states = list(replay_states(entry))
+    assert len(states) == len(entry['turns']) + 1
+    assert states[0].showing.count('_') >= states[-1].showing.count('_')
+    final = replay(entry)
+    assert final.winnings == result['final_winnings']
+    assert final.showing == states[-1].showing
+    assert replay(entry, turn=3).turn == states[3].turn
+
+    entry['turns'][0][4] ^= 1  # Claim the first turn revealed position 0
+    with pytest.raises(ValueError):
+        replay(entry)
+
+
+def test_tournaments_log_one_replay_per_game(tmp_path):
+    path = tmp_path / 'games.replay.jsonl'
+    results = GameSimulator().run_tournament([['smart', 'conservative', 'aggressive']], games_per_combination=3,
+                                             seed=5, paired=True, replay_file=str(path))
+    entries = list(read_replays(path))
+    assert len(entries) == 9 and {entry['rotation'] for entry in entries} == {0, 1, 2}
+    for entry in entries:
+        assert replay(entry).winnings[entry['winner']] >= 0
+    combo_stats = results['combinations']['smart-vs-conservative-vs-aggressive']
+    assert sum(entry['winner'] >= 0 for entry in entries) == sum(combo_stats['wins_by_player'])
+
+
+def test_resume_refuses_a_different_or_shortened_replay_file(tmp_path):
+    path, checkpoint = tmp_path / 'games.replay.jsonl', tmp_path / 'checkpoint.json'
+    combinations = [['smart', 'conservative', 'aggressive']]
+    GameSimulator().run_tournament(combinations, games_per_combination=2, seed=5, replay_file=str(path),
+                                   checkpoint_file=str(checkpoint))
+    with pytest.raises(ValueError, match='different replay file'):
+        GameSimulator().run_tournament(combinations, games_per_combination=2, replay_file=str(tmp_path / 'other'),
+                                       checkpoint_file=str(checkpoint), resume=True)
+    path.write_text('')
+    with pytest.raises(ValueError, match='shorter than its checkpoint'):
+        GameSimulator().run_tournament(combinations, games_per_combination=2, replay_file=str(path),
+                                       checkpoint_file=str(checkpoint), resume=True)
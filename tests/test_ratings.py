@@ -0,0 +1,44 @@
+import os
+import sys
+
+# Make src/Simulations importable (it puts src/PlayGame on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Simulations'))
+
+from ratings import EloLadder, GaussianLadder, finishing_ranks, ladder_from_state, new_ladder
+from solve_timing_experiments import GameSimulator
+from solve_timing_ai import solve_timing_player_type
+
+
+def _record(players, winner, winnings):
+    record = {'winner': winner}
+    for i in range(3):
+        record[f'player_{i}_type'] = players[i]
+        record[f'player_{i}_winnings'] = winnings[i]
+    return record
+
+
+def test_finishing_ranks_put_the_winner_first_then_winnings():
+    assert finishing_ranks(_record('abc', 2, [500, 900, 100])) == [2, 1, 0]
+    assert finishing_ranks(_record('abc', -1, [500, 500, 0])) == [0, 0, 2]
+
+
+def test_ladders_rank_the_player_that_keeps_winning_first():
+    for ladder in (EloLadder(), GaussianLadder()):
+        for n in range(60):
+            seats = ['strong', 'middle', 'weak']
+            seats = seats[n % 3:] + seats[:n % 3]
+            ladder.record_game(_record(seats, seats.index('strong'),
+                                       [{'strong': 2000, 'middle': 800, 'weak': 0}[p] for p in seats]))
+        assert [row['player'] for row in ladder.table()] == ['strong', 'middle', 'weak']
+        again = ladder_from_state(ladder.state())
+        assert again.table() == ladder.table()
+
+
+def test_tournaments_rate_solve_timing_variants():
+    variant = solve_timing_player_type(0.2, 0.8)
+    results = GameSimulator().run_tournament([[variant, 'smart', 'conservative']], games_per_combination=6,
+                                             seed=4, ratings=new_ladder('elo'))
+    table = results['ratings'].table()
+    assert {row['player'] for row in table} == {variant, 'smart', 'conservative'}
+    assert all(row['games'] == 6 for row in table)
+    assert abs(sum(row['rating'] for row in table) - 3 * 1500) < 1e-6
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Make src/Simulations importable (it puts src/PlayGame on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Simulations'))
+
+from solve_timing_sweep import grid_settings, heatmap_data, run_sweep
+from solve_timing_ai import solve_timing_player_type, solve_timing_variant
+
+
+def test_variant_names_carry_the_solve_threshold():
+    name = solve_timing_player_type(0.2, 0.8, 0.65)
+    assert name == 'solve_timing(risk=0.2,solve=0.8,threshold=0.65)'
+    turn = solve_timing_variant(name)
+    assert callable(turn) and solve_timing_variant('smart') is None
+
+
+def test_sweep_ranks_every_setting_and_fills_the_heatmap():
+    settings = grid_settings([0.2, 0.8], [0.5], [0.6, 0.8])
+    rows = run_sweep(settings, games=2, seed=3)
+    assert [row['rank'] for row in rows] == [1, 2, 3, 4]
+    assert all(row['games_played'] == 6 for row in rows)
+    assert [row['win_rate'] for row in rows] == sorted((row['win_rate'] for row in rows), reverse=True)
+
+    heatmap = heatmap_data(rows)
+    assert [layer['base_solve_threshold'] for layer in heatmap['layers']] == [0.6, 0.8]
+    assert all(len(layer['values']) == 2 and len(layer['values'][0]) == 1 for layer in heatmap['layers'])
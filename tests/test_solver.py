@@ -0,0 +1,28 @@
+import os
+import sys
+
+# Make the repo root importable so `src` resolves as a package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.letter_chooser import LetterChooserAI
+from src.solver import PuzzleSolverAI
+
+CANDIDATES = ['ARCTIC CIRCLE', 'ARCTIC CIRCUS', 'MAGNETIC FIELD', 'HONEY BEE']
+
+
+def test_solve_filters_by_pattern():
+    solver = PuzzleSolverAI(puzzles_file='does-not-exist.txt')
+    assert solver.solve('ARCT_C C_RC__', candidates=CANDIDATES) == ['ARCTIC CIRCLE', 'ARCTIC CIRCUS']
+
+
+def test_solve_drops_candidates_hiding_guessed_letters():
+    solver = PuzzleSolverAI(puzzles_file='does-not-exist.txt')
+    picks = solver.solve('ARCT_C C_RC__', candidates=CANDIDATES, guessed='RTLNEAC')
+    assert picks == ['ARCTIC CIRCUS']
+
+
+def test_choose_letters_uses_guessed_to_prune():
+    chooser = LetterChooserAI(puzzles_file='does-not-exist.txt')
+    picks = chooser.choose_letters('___T_C C_RC__', candidates=CANDIDATES, guessed='RSTLNEC')
+    assert len(picks) == 4
+    assert picks[-1] in 'AEIOU'
@@ -0,0 +1,158 @@
+import os
+import sys
+
+# Make src/Simulations importable (it puts src/PlayGame on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Simulations'))
+
+import json
+import statistics
+
+import pytest
+
+from results_sink import GameRecordSink, RunningStats
+from solve_timing_experiments import GameSimulator, game_seed
+
+COMBINATIONS = [['smart', 'solve_timing', 'conservative']]
+
+
+def _totals(results):
+    return results['combinations'], {ai: dict(stats) for ai, stats in results['ai_performance'].items()}
+
+
+def test_game_seeds_are_stable_and_distinct():
+    assert game_seed(1, COMBINATIONS[0], 0) == game_seed(1, COMBINATIONS[0], 0)
+    assert len({game_seed(1, COMBINATIONS[0], n) for n in range(100)}) == 100
+
+
+def test_results_do_not_depend_on_worker_count(tmp_path, monkeypatch):
+    import solve_timing_experiments
+
+    monkeypatch.setattr(solve_timing_experiments, 'SHARD_GAMES', 2)
+    serial_log, parallel_log = tmp_path / 'serial.jsonl', tmp_path / 'parallel.jsonl'
+    serial = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=4, seed=11,
+                                            results_file=str(serial_log))
+    parallel = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=4, seed=11, workers=2,
+                                              results_file=str(parallel_log))
+    assert _totals(serial) == _totals(parallel)
+    assert parallel_log.read_text() == serial_log.read_text()
+    assert serial['combinations']['smart-vs-solve_timing-vs-conservative']['games_played'] == 4
+
+
+def test_running_stats_match_batch_statistics_after_merging():
+    values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+    left, right = RunningStats(), RunningStats()
+    for value in values[:4]:
+        left.add(value)
+    for value in values[4:]:
+        right.add(value)
+    left.merge(right)
+    assert left.count == len(values)
+    assert abs(left.mean - statistics.mean(values)) < 1e-12
+    assert abs(left.variance - statistics.variance(values)) < 1e-12
+
+
+def test_tournament_streams_one_record_per_game(tmp_path):
+    path = tmp_path / 'games.jsonl'
+    results = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=3, seed=2, results_file=str(path))
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record['game_num'] for record in records] == [0, 1, 2]
+    combo = results['combinations']['smart-vs-solve_timing-vs-conservative']
+    assert abs(sum(record['turns_taken'] for record in records) / 3 - combo['avg_turns']) < 1e-12
+
+
+def test_csv_sink_appends_under_a_single_header(tmp_path):
+    path = tmp_path / 'games.csv'
+    for game_num in range(2):
+        with GameRecordSink(str(path)) as sink:
+            sink.write({'combination': 'a-vs-b-vs-c', 'game_num': game_num})
+    lines = path.read_text().splitlines()
+    assert lines[0].startswith('combination,game_num') and len(lines) == 3
+
+
+def test_resumed_tournament_matches_an_uninterrupted_one(tmp_path, monkeypatch):
+    import solve_timing_experiments
+
+    monkeypatch.setattr(solve_timing_experiments, 'SHARD_GAMES', 2)
+    full_log = tmp_path / 'full.jsonl'
+    expected = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=5, seed=3,
+                                              results_file=str(full_log))
+
+    real_play_shard = solve_timing_experiments._play_shard
+    calls = []
+
+    def crash_on_second_shard(*args, **kwargs):
+        calls.append(args[2])
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return real_play_shard(*args, **kwargs)
+
+    log, checkpoint = tmp_path / 'games.jsonl', tmp_path / 'checkpoint.json'
+    monkeypatch.setattr(solve_timing_experiments, '_play_shard', crash_on_second_shard)
+    try:
+        GameSimulator().run_tournament(COMBINATIONS, games_per_combination=5, seed=3,
+                                       results_file=str(log), checkpoint_file=str(checkpoint))
+    except KeyboardInterrupt:
+        pass
+    monkeypatch.setattr(solve_timing_experiments, '_play_shard', real_play_shard)
+
+    resumed = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=5, results_file=str(log),
+                                             checkpoint_file=str(checkpoint), resume=True)
+    assert _totals(resumed) == _totals(expected)
+    assert log.read_text() == full_log.read_text()
+
+
+def test_paired_mode_replays_every_matchup_and_rotation_on_the_same_deal(tmp_path):
+    path = tmp_path / 'games.jsonl'
+    combinations = COMBINATIONS + [['solve_aggressive', 'smart', 'aggressive']]
+    results = GameSimulator().run_tournament(combinations, games_per_combination=2, seed=4, paired=True,
+                                             results_file=str(path))
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 2 * 3 * len(combinations)
+    for game_num in range(2):
+        deal = [record for record in records if record['game_num'] == game_num]
+        assert len({(record['seed'], record['puzzle']) for record in deal}) == 1
+        assert sorted(record['rotation'] for record in deal) == [0, 0, 1, 1, 2, 2]
+    combo = results['combinations']['smart-vs-solve_timing-vs-conservative']
+    assert combo['games_played'] == 6 and combo['deal_margin_stats'][0].count == 2
+
+
+def test_combinations_stop_once_intervals_reach_the_target(monkeypatch):
+    import solve_timing_experiments
+
+    monkeypatch.setattr(solve_timing_experiments, 'SHARD_GAMES', 2)
+    loose = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=6, seed=8,
+                                           win_rate_ci=1.0, min_games=2)
+    combo = loose['combinations']['smart-vs-solve_timing-vs-conservative']
+    assert combo['games_played'] == 2 and combo['stopped_early']
+
+    strict = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=6, seed=8,
+                                            win_rate_ci=1e-9, min_games=2)
+    combo = strict['combinations']['smart-vs-solve_timing-vs-conservative']
+    assert combo['games_played'] == 6 and not combo['stopped_early']
+
+
+def test_exhaustive_tournament_plays_each_matching_puzzle_once(tmp_path):
+    path = tmp_path / 'games.jsonl'
+    simulator = GameSimulator(puzzle_filters={'round': ['R3', 'R3*'], 'words': 2})
+    expected = sorted(puzzle for puzzle, _, _, _ in simulator.sampler.sweep(**simulator.puzzle_filters))
+    simulator.run_tournament(COMBINATIONS, seed=1, exhaustive=True, results_file=str(path))
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(record['puzzle'] for record in records) == expected
+
+
+def test_resume_refuses_a_different_or_shortened_results_file(tmp_path, monkeypatch):
+    import solve_timing_experiments
+
+    monkeypatch.setattr(solve_timing_experiments, 'SHARD_GAMES', 2)
+    log, checkpoint = tmp_path / 'games.jsonl', tmp_path / 'checkpoint.json'
+    GameSimulator().run_tournament(COMBINATIONS, games_per_combination=2, seed=5,
+                                   results_file=str(log), checkpoint_file=str(checkpoint))
+    with pytest.raises(ValueError, match='different results file'):
+        GameSimulator().run_tournament(COMBINATIONS, games_per_combination=2,
+                                       results_file=str(tmp_path / 'other.jsonl'),
+                                       checkpoint_file=str(checkpoint), resume=True)
+    log.write_text('')
+    with pytest.raises(ValueError, match='shorter than its checkpoint'):
+        GameSimulator().run_tournament(COMBINATIONS, games_per_combination=2, results_file=str(log),
+                                       checkpoint_file=str(checkpoint), resume=True)
+    assert log.read_text() == ''
@@ -0,0 +1,69 @@
+import os
+import sys
+
+# Make src/Simulations importable (it puts src/PlayGame on the path itself)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Simulations'))
+
+import multiprocessing
+
+import pytest
+
+import solve_timing_experiments
+from solve_timing_experiments import GameSimulator, serve_shards
+from work_queue import Coordinator, check_authkey, run_worker
+
+COMBINATIONS = [['smart', 'solve_timing', 'conservative']]
+AUTHKEY = b'test-key'
+
+
+def _start_workers(address, count, target=serve_shards, args=()):
+    workers = [multiprocessing.Process(target=target, args=(address, AUTHKEY) + args, daemon=True)
+               for _ in range(count)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def test_coordinated_tournament_matches_a_local_one(monkeypatch):
+    monkeypatch.setattr(solve_timing_experiments, 'SHARD_GAMES', 2)
+    local = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=6, seed=5, paired=True)
+
+    coordinator = Coordinator(('127.0.0.1', 0), AUTHKEY, window=2)
+    coordinator.start()
+    workers = _start_workers(coordinator.address, 3)
+    try:
+        remote = GameSimulator().run_tournament(COMBINATIONS, games_per_combination=6, seed=5, paired=True,
+                                                coordinator=coordinator)
+    finally:
+        coordinator.shutdown()
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    assert remote['combinations'] == local['combinations']
+    assert remote['ai_performance'] == local['ai_performance']
+
+
+def _fail(payload):
+    raise ValueError(f"cannot play {payload}")
+
+
+def test_worker_failures_reach_the_coordinator():
+    coordinator = Coordinator(('127.0.0.1', 0), AUTHKEY)
+    coordinator.start()
+    workers = _start_workers(coordinator.address, 1, run_worker, (_fail,))
+    try:
+        with pytest.raises(RuntimeError, match="ValueError: cannot play shard"):
+            list(coordinator.map_ordered(['shard']))
+    finally:
+        coordinator.shutdown()
+    workers[0].join(timeout=30)
+
+
+def test_the_built_in_authkey_is_refused_off_loopback():
+    with pytest.raises(ValueError, match='not a loopback address'):
+        Coordinator(('0.0.0.0', 0))
+    with pytest.raises(ValueError, match='not a loopback address'):
+        run_worker(('coordinator-host', 0), None, _fail)
+    assert check_authkey(('localhost', 0)) == check_authkey(('127.0.0.1', 0))
+    assert check_authkey(('0.0.0.0', 0), b'secret') == b'secret'